@@ -0,0 +1,75 @@
+"""
+Benchmark: bulk-completing N tasks from the web dashboard.
+
+"per-item" is what script.js used to do for every checkbox: toggle_task, then
+get_dashboard_data, each a JS -> Python round trip. "batch" is a single
+apply_batch call returning the refreshed dashboard. Every bridge response is
+JSON-encoded the way pywebview marshals it back to JavaScript, so payload cost is included.
+"legacy" additionally rewrites the whole pretty-printed data file per toggle, like the
+original ProductivityManager.save_data.
+
+Usage: python bench_bridge_batch.py [N]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from src.persistence import PersistenceService
+from src.skills.productivity import ProductivityManager
+
+BACKGROUND_TASKS = 2000
+
+def call(fn, *args):
+    # One bridge round trip: Python call + JSON result handed to the webview
+    return json.dumps(fn(*args))
+
+def setup(path, n, persistence):
+    pm = ProductivityManager(path, persistence=persistence)
+    today = datetime.now().strftime("%Y-%m-%d")
+    ids = [pm.add_task(f"Task {i}", today)["id"] for i in range(n)]
+    for i in range(BACKGROUND_TASKS):
+        pm.add_task(f"Other {i}", f"2031-01-{i % 28 + 1:02d}")
+    return pm, ids, today
+
+def per_item(pm, ids, today, legacy_file=None):
+    start = time.perf_counter()
+    for task_id in ids:
+        call(pm.toggle_task, task_id)
+        if legacy_file:
+            with open(legacy_file, "w") as f:
+                json.dump({"tasks": pm.get_all_tasks(), "scratchpad": ""}, f, indent=4)
+        call(pm.get_dashboard_data, today)
+    return time.perf_counter() - start
+
+def batch(pm, ids, today):
+    start = time.perf_counter()
+    results = pm.apply_batch([{"op": "toggle", "id": task_id} for task_id in ids])
+    payload = dict(pm.get_dashboard_data(today), results=results)
+    json.dumps(payload)
+    return time.perf_counter() - start
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    print(f"Completing {n} tasks (+{BACKGROUND_TASKS} other tasks in the store)")
+    print(f"{'path':<10} | {'round trips':>11} | {'wall ms':>9} | {'journal appends':>15}")
+    print("-" * 55)
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ("legacy", "per-item", "batch"):
+            service = PersistenceService(debounce=60, max_delay=60)
+            pm, ids, today = setup(os.path.join(tmp, f"{name}.json"), n, service)
+            before = service.get_metrics()["mutations"]
+            if name == "batch":
+                elapsed, trips = batch(pm, ids, today), 1
+            else:
+                legacy_file = os.path.join(tmp, "legacy_full.json") if name == "legacy" else None
+                elapsed, trips = per_item(pm, ids, today, legacy_file), 2 * n
+            appends = service.get_metrics()["mutations"] - before
+            assert all(t["completed"] for t in pm.get_tasks_for_date(today))
+            pm.close()
+            service.stop()
+            print(f"{name:<10} | {trips:>11} | {elapsed * 1000:9.1f} | {appends:>15}")
+
+if __name__ == "__main__":
+    main()
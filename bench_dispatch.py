@@ -0,0 +1,135 @@
+"""
+Micro-benchmark: replays a corpus of commands through AIEngine.process_input and
+through the original if/elif cascade, and reports latency percentiles. The cascade is
+the baseline engine.py loaded from git (the repository's first commit by default).
+For reference it also times the router's linear dispatcher, which runs the same
+rules as the indexed one but checks every rule's keywords in turn.
+
+Skill side effects are replaced by recorders so nothing is actually launched.
+
+Usage: python bench_dispatch.py [rounds] [baseline git revision]
+"""
+import subprocess
+import sys
+import time
+import types
+from src.engine import AIEngine, SKILL_MODULES
+
+CORPUS = [
+    "Schedule lecture tomorrow at 2pm to 3pm", "Project Beta due tomorrow", "take note: buy milk",
+    "m!play never gonna give you up", "m!add lofi beats", "m!loop", "shutdown", "turn off my computer",
+    "boost the sound", "set brightness to 70", "volume 30", "mute", "unmute the audio",
+    "turn on energy saver", "high performance", "balanced mode", "night light on",
+    "abort shutdown", "lock screen", "put pc to sleep", "dark mode", "light theme",
+    "turn on bluetooth", "switch off wifi", "weather in Tokyo", "news about tech",
+    "search for python tutorials", "what is a monad", "open network settings",
+    "open google chrome", "launch notepad", "close discord", "translate hello to chinese",
+    "enable gaming mode", "set timer for 5 minutes", "hello", "who are you", "bye",
+    "tell me a joke", "what's the plan for today",
+]
+
+class _Recorder:
+    """Stands in for a skill module/object: every attribute is a callable returning a canned reply."""
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            return f"{name} ok"
+        return call
+
+    def get_scratchpad(self):
+        return ""
+
+    def get_history(self):
+        return []
+
+def build_engine():
+    eng = AIEngine(_Recorder())
+    for name in list(SKILL_MODULES) + ["music", "translator", "gaming_mode", "timer"]:
+        eng.skills.provide(name, _Recorder())
+    return eng
+
+def build_baseline_engine(revision):
+    """
+    The baseline AIEngine (one long if/elif cascade in process_input), with the same recorders.
+    """
+    source = subprocess.run(["git", "show", f"{revision}:src/engine.py"], capture_output=True,
+                            text=True, check=True).stdout
+    # Its skill imports resolve to recorders; the NLP classifier is the current, real one
+    stubbed = {f"src.skills.{name}": _Recorder() for name in list(SKILL_MODULES) +
+               ["music_player", "translator", "gaming_mode", "timer"]}
+    saved = {name: sys.modules.get(name) for name in stubbed}
+    sys.modules.update(stubbed)
+    try:
+        module = types.ModuleType("src._baseline_engine")
+        module.__package__ = "src"
+        exec(compile(source, f"{revision}:src/engine.py", "exec"), module.__dict__)
+    finally:
+        for name, original in saved.items():
+            if original is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = original
+    eng = module.AIEngine(_Recorder())
+    for name in ["music", "translator", "gaming_mode", "timer"]:
+        setattr(eng, name, _Recorder())
+    return eng
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+def run(dispatch, rounds):
+    samples = []
+    per_command = {}
+    for _ in range(rounds):
+        for cmd in CORPUS:
+            text = cmd.strip()
+            lower = text.lower()
+            start = time.perf_counter()
+            dispatch(text, lower)
+            elapsed = (time.perf_counter() - start) * 1e6
+            samples.append(elapsed)
+            per_command.setdefault(cmd, []).append(elapsed)
+    return samples, per_command
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    revision = sys.argv[2] if len(sys.argv) > 2 else subprocess.run(
+        ["git", "rev-list", "--max-parents=0", "HEAD"], capture_output=True, text=True, check=True).stdout.split()[0]
+    eng = build_engine()
+    baseline = build_baseline_engine(revision)
+
+    # Sanity check: both dispatchers pick the same rule for every command
+    for cmd in CORPUS:
+        assert eng.router.dispatch(cmd, cmd.lower()) == eng.router.dispatch_linear(cmd, cmd.lower()), cmd
+    differing = [cmd for cmd in CORPUS if eng.process_input(cmd) != baseline.process_input(cmd)]
+
+    dispatchers = [("baseline", lambda text, lower: baseline.process_input(text)),
+                   ("linear", lambda text, lower: eng.router.dispatch_linear(text.strip(), text.strip().lower())),
+                   ("indexed", lambda text, lower: eng.process_input(text))]
+    results = {}
+    for label, dispatch in dispatchers:
+        run(dispatch, 20) # warm-up
+        results[label] = run(dispatch, rounds)
+
+    print(f"{len(CORPUS)} commands x {rounds} rounds, {len(eng.router.rules)} rules, "
+          f"baseline {revision[:10]} (latency in microseconds)")
+    print(f"{'dispatcher':<10} | {'p50':>8} | {'p90':>8} | {'p99':>8} | {'mean':>8}")
+    print("-" * 54)
+    for label, (samples, _) in results.items():
+        mean = sum(samples) / len(samples)
+        print(f"{label:<10} | {percentile(samples, 50):8.1f} | {percentile(samples, 90):8.1f} | {percentile(samples, 99):8.1f} | {mean:8.1f}")
+
+    print()
+    print(f"{'command':<45} | {'baseline p50':>12} | {'indexed p50':>11}")
+    print("-" * 74)
+    for cmd in CORPUS:
+        old = percentile(results["baseline"][1][cmd], 50)
+        new = percentile(results["indexed"][1][cmd], 50)
+        print(f"{cmd[:45]:<45} | {old:12.1f} | {new:11.1f}")
+    if differing:
+        # Commands whose handling was changed on purpose since the baseline (e.g. "search a; b")
+        print(f"\nResponses differ from the baseline for: {', '.join(differing)}")
+
+if __name__ == "__main__":
+    main()
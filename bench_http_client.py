@@ -0,0 +1,77 @@
+"""
+Benchmark: repeated network commands with and without the shared pooled client.
+
+A local HTTP/1.1 server stands in for the remote APIs. Each new connection pays a
+simulated handshake (HANDSHAKE_MS, roughly a TLS setup to a nearby host) before its first
+response; requests on a kept-alive connection only pay the per-request latency.
+"fresh" is what the skills used to do (requests.get, one connection per call), "pooled"
+goes through src.net.HttpClient. Each command makes two requests, like weather.
+
+Usage: python bench_http_client.py [COMMANDS] [HANDSHAKE_MS]
+"""
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import requests
+from src.net import HttpClient
+
+REQUEST_MS = 2.0
+
+class StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True # Headers and body go out in separate writes
+    handshake = 0.03
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StandIn.lock:
+            StandIn.connections += 1
+        time.sleep(StandIn.handshake)
+
+    def do_GET(self):
+        time.sleep(REQUEST_MS / 1000)
+        data = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def run(get, base, commands):
+    latencies = []
+    for i in range(commands):
+        start = time.perf_counter()
+        get(f"{base}/geocode?name=city{i % 5}").json()
+        get(f"{base}/forecast?latitude={i % 5}").json()
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    pick = lambda q: latencies[min(len(latencies) - 1, int(len(latencies) * q))]
+    return pick(0.5), pick(0.95), sum(latencies)
+
+def main():
+    commands = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    StandIn.handshake = (float(sys.argv[2]) if len(sys.argv) > 2 else 30.0) / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{commands} commands x 2 requests, handshake {StandIn.handshake * 1000:.0f} ms, request {REQUEST_MS:.0f} ms")
+    print(f"{'client':<8} | {'connections':>11} | {'p50 ms':>8} | {'p95 ms':>8} | {'total ms':>9}")
+    print("-" * 56)
+    client = HttpClient()
+    for name, get in (("fresh", lambda url: requests.get(url, timeout=10)), ("pooled", client.get)):
+        StandIn.connections = 0
+        p50, p95, total = run(get, base, commands)
+        print(f"{name:<8} | {StandIn.connections:>11} | {p50:8.2f} | {p95:8.2f} | {total:9.1f}")
+    client.close()
+    server.shutdown()
+    server.server_close()
+
+if __name__ == "__main__":
+    main()
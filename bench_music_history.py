@@ -0,0 +1,97 @@
+"""
+Benchmark: recording plays into a history of N entries with the old list-based history
+(scan for the id, insert at the head, rewrite the whole JSON file on every play) versus
+MusicHistory (OrderedDict ring + id index, one journal line per play). Also times the
+queries format_history and get_music_history run: the 10 most recent and the most played.
+
+Plays cycle over a catalogue twice the history size, so half of them are replays of a
+song already in the history (the old list grew a duplicate; MusicHistory moves it up).
+
+Usage: python bench_music_history.py [N] [PLAYS]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from src.persistence import PersistenceService
+from src.skills.music_history import MusicHistory
+
+def legacy_play(history, path, capacity, id, title):
+    # What _add_to_history used to do, with the cap raised to the same capacity
+    if history and history[0]["id"] == id:
+        return history
+    history.insert(0, {"type": "youtube", "id": id, "title": title, "timestamp": datetime.now().isoformat()})
+    history = history[:capacity]
+    with open(path, "w") as f:
+        json.dump(history, f)
+    return history
+
+def legacy_most_played(history, limit):
+    counts = {}
+    for item in history:
+        counts[item["id"]] = counts.get(item["id"], 0) + 1
+    return sorted(counts.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+
+def song(i, n):
+    k = i % (2 * n)
+    return f"vid{k:08d}", f"Song {k}"
+
+def bench_legacy(path, n, plays):
+    history = [{"type": "youtube", "id": song(i, n)[0], "title": song(i, n)[1], "timestamp": ""} for i in range(n)]
+    start = time.perf_counter()
+    for i in range(plays):
+        history = legacy_play(history, path, n, *song(n + i, n))
+    play_time = time.perf_counter() - start
+    return play_time, os.path.getsize(path) * plays, query_times(lambda: history[:10], lambda: legacy_most_played(history, 5))
+
+def bench_history(path, n, plays):
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    history = MusicHistory(path, capacity=n, persistence=persistence)
+    for i in range(n):
+        history.record_play("youtube", *song(i, n))
+    history.flush()
+    journal_before = history.journal.bytes_written
+
+    start = time.perf_counter()
+    for i in range(plays):
+        history.record_play("youtube", *song(n + i, n))
+    play_time = time.perf_counter() - start
+    written = history.journal.bytes_written - journal_before
+    queries = query_times(lambda: history.recent(10), lambda: history.most_played(5))
+    history.close()
+
+    start = time.perf_counter()
+    reopened = MusicHistory(path, capacity=n, persistence=persistence)
+    load_time = time.perf_counter() - start
+    assert len(reopened) == n
+    reopened.close()
+    persistence.stop()
+    return play_time, written, queries, load_time
+
+def query_times(recent, most_played, rounds=50):
+    results = []
+    for fn in (recent, most_played):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        results.append((time.perf_counter() - start) / rounds)
+    return results
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    plays = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with tempfile.TemporaryDirectory() as tmp:
+        l_time, l_bytes, (l_recent, l_most) = bench_legacy(os.path.join(tmp, "legacy.json"), n, plays)
+        h_time, h_bytes, (h_recent, h_most), load_time = bench_history(os.path.join(tmp, "history.json"), n, plays)
+
+    print(f"{plays} plays into a {n}-entry history")
+    print(f"{'path':<14} | {'us / play':>10} | {'MB written':>10} | {'recent(10) us':>13} | {'most played us':>14}")
+    print("-" * 74)
+    print(f"{'list + dump':<14} | {l_time / plays * 1e6:10.1f} | {l_bytes / 1e6:10.2f} | {l_recent * 1e6:13.1f} | {l_most * 1e6:14.1f}")
+    print(f"{'MusicHistory':<14} | {h_time / plays * 1e6:10.1f} | {h_bytes / 1e6:10.2f} | {h_recent * 1e6:13.1f} | {h_most * 1e6:14.1f}")
+    print(f"Reload (snapshot + journal replay): {load_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: SimpleIntentClassifier latency versus number of training phrases.
+
+Compares the original per-call re-vectorizing loop, the inverted-index model
+(pure Python and NumPy), predict_topk and the batched predict_many path
+(amortized per utterance).
+
+Usage: python bench_nlp.py
+"""
+import random
+import time
+from src.simple_nlp import SimpleIntentClassifier
+
+SIZES = [100, 1000, 5000, 10000, 50000]
+PHRASES_PER_INTENT = 10
+VOCAB_SIZE = 3000
+
+def synthetic_intents(n_phrases, seed=5):
+    rng = random.Random(seed)
+    vocab = [f"w{i}" for i in range(VOCAB_SIZE)]
+    intents = {}
+    for i in range(n_phrases):
+        phrase = " ".join(rng.choice(vocab) for _ in range(rng.randint(1, 5)))
+        intents.setdefault(f"intent.{i // PHRASES_PER_INTENT}", []).append(phrase)
+    return intents, vocab
+
+def legacy_predict(classifier, text):
+    input_vec = classifier._get_vector(text)
+    best_intent, max_score = None, 0.0
+    for intent, phrases in classifier.intents.items():
+        for phrase in phrases:
+            score = classifier._cosine_similarity(input_vec, classifier._get_vector(phrase))
+            if score > max_score:
+                max_score, best_intent = score, intent
+    return (None, 0.0) if max_score < 0.3 else (best_intent, max_score)
+
+def build(intents, use_numpy):
+    classifier = SimpleIntentClassifier(use_numpy=use_numpy)
+    classifier.intents = intents
+    start = time.perf_counter()
+    classifier.rebuild()
+    return classifier, (time.perf_counter() - start) * 1000
+
+def per_call_us(fn, queries):
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1e6
+
+def main():
+    print(f"{'phrases':>8} | {'legacy us':>10} | {'python us':>10} | {'numpy us':>9} | {'topk us':>8} | {'batch us':>9} | {'compile ms':>10}")
+    print("-" * 83)
+    for size in SIZES:
+        intents, vocab = synthetic_intents(size)
+        rng = random.Random(size)
+        queries = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 4))) for _ in range(2000)]
+
+        py_model, _ = build(intents, use_numpy=False)
+        np_model, compile_ms = build(intents, use_numpy=True)
+
+        legacy = per_call_us(lambda q: legacy_predict(py_model, q), queries[:max(5, 20000 // size)])
+        python = per_call_us(py_model.predict, queries)
+        vectorized = per_call_us(np_model.predict, queries) if np_model.use_numpy else float("nan")
+        topk = per_call_us(lambda q: np_model.predict_topk(q, 5), queries)
+
+        start = time.perf_counter()
+        batch = np_model.predict_many(queries)
+        batch_us = (time.perf_counter() - start) / len(queries) * 1e6
+
+        assert batch[:50] == [py_model.predict(q) for q in queries[:50]]
+        print(f"{size:>8} | {legacy:10.1f} | {python:10.1f} | {vectorized:9.1f} | {topk:8.1f} | {batch_us:9.1f} | {compile_ms:10.1f}")
+
+if __name__ == "__main__":
+    main()
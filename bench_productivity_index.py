@@ -0,0 +1,72 @@
+"""
+Benchmark: ProductivityManager reads and by-id mutations at 50k tasks, indexed JSON
+backend versus the old list scans. Indexed mutations include their journal append.
+
+Usage: python bench_productivity_index.py [N]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from src.skills.productivity import ProductivityManager
+
+def naive_for_date(tasks, date_str):
+    return [t for t in tasks if t["date"] == date_str]
+
+def naive_toggle(tasks, task_id):
+    for task in tasks:
+        if task["id"] == task_id:
+            task["completed"] = not task["completed"]
+            return task
+
+def naive_upcoming(tasks, today, limit):
+    future = [t for t in tasks if t["date"] > today and not t["completed"]]
+    future.sort(key=lambda x: x["date"])
+    return future[:limit]
+
+def timed_us(fn, args_list):
+    start = time.perf_counter()
+    for args in args_list:
+        fn(*args)
+    return (time.perf_counter() - start) / len(args_list) * 1e6
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(0)
+    base = datetime.now()
+    dates = [(base + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(-180, 365)]
+    today = base.strftime("%Y-%m-%d")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pm = ProductivityManager(os.path.join(tmp, "tasks.json"))
+        start = time.perf_counter()
+        for i in range(n):
+            pm.add_task(f"Task {i}", rng.choice(dates))
+        build_s = time.perf_counter() - start
+        naive = [dict(t) for t in pm.get_all_tasks()]
+        ids = [t["id"] for t in naive]
+
+        lookups = [(rng.choice(dates),) for _ in range(200)]
+        toggles = [(rng.choice(ids),) for _ in range(200)]
+        rows = [
+            ("get_tasks_for_date", timed_us(lambda d: naive_for_date(naive, d), lookups), timed_us(pm.get_tasks_for_date, lookups)),
+            ("toggle_task", timed_us(lambda i: naive_toggle(naive, i), toggles), timed_us(pm.toggle_task, toggles)),
+            ("get_upcoming_tasks(10)", timed_us(lambda: naive_upcoming(naive, today, 10), [()] * 50), timed_us(pm.get_upcoming_tasks, [()] * 50)),
+        ]
+
+        deletes = [(i,) for i in rng.sample(ids, 200)]
+        def naive_delete(task_id):
+            naive[:] = [t for t in naive if t["id"] != task_id]
+        rows.append(("delete_task", timed_us(naive_delete, deletes), timed_us(pm.delete_task, deletes)))
+        pm.close()
+
+    print(f"{n} tasks over {len(dates)} days (built in {build_s:.2f}s), latency in microseconds")
+    print(f"{'operation':<24} | {'list scan':>10} | {'indexed':>9} | {'speedup':>8}")
+    print("-" * 61)
+    for name, before, after in rows:
+        print(f"{name:<24} | {before:10.1f} | {after:9.1f} | {before / after:7.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: inserting N tasks through the journaled and SQLite ProductivityManager
+backends versus the old path that rewrote the whole pretty-printed JSON file on
+every mutation. (SQLite "MB written" is the final database + WAL size.)
+
+The full-rewrite path is O(N^2) overall, so above FULL_REWRITE_LIMIT tasks its cost is
+estimated by timing single rewrites at a few sizes and integrating (marked "est.").
+
+Usage: python bench_productivity_storage.py [N]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from src.skills.productivity import ProductivityManager
+
+FULL_REWRITE_LIMIT = 2000
+
+def make_task(i):
+    return {"id": i, "title": f"Task number {i}", "date": "2030-01-01", "time": None,
+            "end_time": None, "reminder": False, "category": "Other", "completed": False}
+
+def full_rewrite_measured(path, n):
+    data = {"tasks": [], "scratchpad": ""}
+    written = 0
+    start = time.perf_counter()
+    for i in range(n):
+        data["tasks"].append(make_task(i))
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        written += os.path.getsize(path)
+    return time.perf_counter() - start, written
+
+def full_rewrite_estimated(path, n, samples=5):
+    # Cost of one rewrite grows linearly with the task count: sample and integrate
+    points = []
+    for k in [max(1, n * s // samples) for s in range(1, samples + 1)]:
+        data = {"tasks": [make_task(i) for i in range(k)], "scratchpad": ""}
+        start = time.perf_counter()
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        points.append((k, time.perf_counter() - start, os.path.getsize(path)))
+
+    secs_per_task = sum(t / k for k, t, _ in points) / len(points)
+    bytes_per_task = points[-1][2] / points[-1][0]
+    triangle = n * (n + 1) / 2
+    return secs_per_task * triangle, bytes_per_task * triangle
+
+def managed(path, n, backend):
+    pm = ProductivityManager(path, backend=backend)
+    start = time.perf_counter()
+    for i in range(n):
+        pm.add_task(f"Task number {i}", "2030-01-01")
+    elapsed = time.perf_counter() - start
+    pm.close()
+
+    if backend == "json":
+        written = pm.storage.journal.bytes_written
+    else:
+        db_file = pm.storage.db_file
+        written = sum(os.path.getsize(p) for p in [db_file, db_file + "-wal"] if os.path.exists(p))
+
+    start = time.perf_counter()
+    reloaded = ProductivityManager(path, backend=backend)
+    load_time = time.perf_counter() - start
+    assert len(reloaded.get_all_tasks()) == n
+    reloaded.close()
+    return elapsed, written, load_time
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        j_time, j_bytes, load_time = managed(os.path.join(tmp, "journaled.json"), n, "json")
+        s_time, s_bytes, s_load_time = managed(os.path.join(tmp, "tasks.db"), n, "sqlite")
+
+        legacy_path = os.path.join(tmp, "legacy.json")
+        if n <= FULL_REWRITE_LIMIT:
+            l_time, l_bytes = full_rewrite_measured(legacy_path, n)
+            label = "full rewrite"
+        else:
+            l_time, l_bytes = full_rewrite_estimated(legacy_path, n)
+            label = "full rewrite (est.)"
+
+    print(f"Inserting {n} tasks")
+    print(f"{'path':<20} | {'wall s':>10} | {'MB written':>12} | {'us / insert':>11}")
+    print("-" * 62)
+    print(f"{label:<20} | {l_time:10.2f} | {l_bytes / 1e6:12.1f} | {l_time / n * 1e6:11.1f}")
+    print(f"{'journaled':<20} | {j_time:10.2f} | {j_bytes / 1e6:12.1f} | {j_time / n * 1e6:11.1f}")
+    print(f"{'sqlite':<20} | {s_time:10.2f} | {s_bytes / 1e6:12.1f} | {s_time / n * 1e6:11.1f}")
+    print(f"Reload: journaled (snapshot + replay) {load_time:.2f}s, sqlite {s_load_time:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Startup benchmark: measures how long importing the engine and constructing AIEngine
+takes, with the per-module import cost from `python -X importtime`, and compares it
+with loading every skill up front (what startup cost before skills were lazy).
+
+Fails (exit code 1) if a heavy optional dependency is imported before first use.
+
+Usage: python bench_startup.py [top_n]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY_MODULES = ["yt_dlp", "bs4", "requests", "numpy", "comtypes", "pycaw", "AppOpener",
+                 "screen_brightness_control", "plyer", "ddgs", "duckduckgo_search", "urllib3"]
+
+STARTUP = """
+import time
+start = time.perf_counter()
+import src.engine
+src.engine.AIEngine()
+print((time.perf_counter() - start) * 1000)
+"""
+
+EAGER = """
+import json, time
+start = time.perf_counter()
+import src.engine
+eng = src.engine.AIEngine()
+eng.warm_up(background=False)
+print(json.dumps({"ms": (time.perf_counter() - start) * 1000, "skills": eng.get_skill_report()}))
+"""
+
+def run_timed(code, *flags):
+    # Skills write their caches on load (e.g. the Spotify metadata seeded from history): keep them out of the repo
+    with tempfile.TemporaryDirectory(prefix="desktopai-bench-") as data_dir:
+        env = dict(os.environ, DESKTOPAI_DATA_DIR=data_dir)
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, *flags, "-c", code], capture_output=True, text=True, env=env)
+        elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return elapsed, result
+
+def parse_importtime(stderr):
+    """
+    {module: cumulative microseconds} from `-X importtime` output.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative_us)
+    return modules
+
+def main():
+    top_n = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+
+    wall_ms, result = run_timed(STARTUP, "-X", "importtime")
+    lazy_ms = float(result.stdout.strip().splitlines()[-1])
+    modules = parse_importtime(result.stderr)
+    loaded_heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY_MODULES)
+
+    print(f"Lazy startup (import + AIEngine()): {lazy_ms:.0f} ms in-process ({wall_ms:.0f} ms with interpreter), "
+          f"{len(modules)} modules imported")
+    print(f"{'module':<45} | {'cumulative ms':>13}")
+    print("-" * 61)
+    for name, us in sorted(modules.items(), key=lambda item: -item[1])[:top_n]:
+        print(f"{name:<45} | {us / 1000:>13.1f}")
+
+    _, eager = run_timed(EAGER)
+    report = json.loads(eager.stdout.strip().splitlines()[-1])
+    print(f"\nEager load (every skill at startup): {report['ms']:.0f} ms in-process")
+    print(f"{'skill':<16} | {'ms':>7} | status")
+    print("-" * 50)
+    for row in report["skills"]:
+        status = "loaded" if row["loaded"] else f"unavailable ({row['error']})"
+        print(f"{row['name']:<16} | {row['ms']:>7.1f} | {status}")
+
+    if loaded_heavy:
+        print(f"\nFAIL: heavy modules imported at startup: {', '.join(loaded_heavy)}")
+        return 1
+    print("\nOK: no heavy optional dependency imported at startup")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+Benchmark: refreshing the Tk task lists with N tasks.
+
+"rebuild" is the old behaviour (destroy every card, build a new one per task),
+"keyed" re-renders through KeyedList after one task was toggled, and "virtual" is the
+all-tasks view, which only materializes the rows that fit. Each timing includes
+root.update() so Tk geometry management and drawing are counted too.
+
+Needs customtkinter and a display; on a headless machine run it under Xvfb.
+
+Usage: xvfb-run -a python bench_ui_lists.py [N]
+"""
+import sys
+import time
+import customtkinter as ctk
+from src.task_lists import KeyedList, VirtualList, TaskCard, TASK_ROW_HEIGHT
+
+THEME = {
+    "bg_main": "#1e1e2e", "bg_secondary": "#252538", "accent": "#89b4fa", "accent_hover": "#b4befe",
+    "text": "#cdd6f4", "border": "#45475a", "error": "#f38ba8"
+}
+REPEATS = 5
+
+def make_tasks(n):
+    return [{"id": i, "title": f"Task {i}", "date": "2030-01-01", "time": "09:00" if i % 3 == 0 else None,
+             "end_time": None, "reminder": False, "category": "Other", "completed": False} for i in range(n)]
+
+def timed_ms(root, fn):
+    start = time.perf_counter()
+    fn()
+    root.update()
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    root = ctk.CTk()
+    root.geometry("800x1000")
+    noop = lambda task_id: None
+    tasks = make_tasks(n)
+
+    # Old path: destroy all children and build every card again
+    frame = ctk.CTkScrollableFrame(root)
+    frame.pack(fill="both", expand=True)
+    def rebuild():
+        for widget in frame.winfo_children(): widget.destroy()
+        for task in tasks:
+            card = TaskCard(frame, THEME, noop, noop, timed=None, show_date=True)
+            card.update(task)
+            card.show()
+    rebuild_ms = [timed_ms(root, rebuild) for _ in range(REPEATS)]
+    frame.destroy()
+
+    # Keyed reconciliation: initial render, then refreshes after a single toggle
+    frame = ctk.CTkScrollableFrame(root)
+    frame.pack(fill="both", expand=True)
+    view = KeyedList(lambda: TaskCard(frame, THEME, noop, noop, timed=None, show_date=True))
+    first_ms = timed_ms(root, lambda: view.render(tasks))
+    keyed_ms = []
+    for i in range(REPEATS):
+        tasks[i * 7]["completed"] = not tasks[i * 7]["completed"]
+        keyed_ms.append(timed_ms(root, lambda: view.render(tasks)))
+    frame.destroy()
+
+    # Virtualized all-tasks view: full refresh and scrolling
+    frame = ctk.CTkFrame(root)
+    frame.pack(fill="both", expand=True)
+    virtual = VirtualList(lambda: TaskCard(frame, THEME, noop, noop, timed=None, show_date=True),
+                          visible_rows=1000 // TASK_ROW_HEIGHT)
+    virtual_ms = [timed_ms(root, lambda: virtual.set_items(list(tasks))) for _ in range(REPEATS)]
+    scroll_ms = [timed_ms(root, lambda: virtual.scroll_by(virtual.visible_rows)) for _ in range(REPEATS)]
+    root.destroy()
+
+    print(f"Refreshing {n} tasks (median of {REPEATS}, includes Tk layout)")
+    print(f"{'path':<28} | {'ms':>9} | widgets built")
+    print("-" * 56)
+    median = lambda xs: sorted(xs)[len(xs) // 2]
+    print(f"{'rebuild (old)':<28} | {median(rebuild_ms):9.1f} | {n} per refresh")
+    print(f"{'keyed, first render':<28} | {first_ms:9.1f} | {view.stats['created']}")
+    print(f"{'keyed, one task toggled':<28} | {median(keyed_ms):9.1f} | 0 ({view.stats['updated']} updates total)")
+    print(f"{'virtual, full refresh':<28} | {median(virtual_ms):9.1f} | {virtual.stats['created']}")
+    print(f"{'virtual, scroll one page':<28} | {median(scroll_ms):9.1f} | 0")
+
+if __name__ == "__main__":
+    main()
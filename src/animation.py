@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import deque
+
+def ease_out_cubic(t):
+    return 1 - (1 - t) ** 3
+
+
+class _Slide:
+    def __init__(self, start_x, target_x, y, started_at, on_start, on_done):
+        self.start_x = start_x
+        self.target_x = target_x
+        self.y = y
+        self.started_at = started_at
+        self.on_start = on_start
+        self.on_done = on_done
+
+
+class SlideAnimator:
+    """
+    Moves a window horizontally on a dedicated thread.
+
+    slide() only hands the request over and returns; the animation thread computes the
+    position from elapsed monotonic time through an easing curve, so a slow move() or a
+    late wakeup skips frames instead of stretching the animation. A new slide() cancels
+    the one in flight and continues from the window's current position, so reversing
+    direction mid-way never jumps.
+    """
+
+    def __init__(self, window, duration=0.15, fps=120, easing=ease_out_cubic, clock=time.monotonic):
+        """
+        window: object with move(x, y) (pywebview window or a fake)
+        """
+        self.window = window
+        self.duration = duration
+        self.frame_interval = 1.0 / fps
+        self.easing = easing
+        self.clock = clock
+        self.current_x = None
+        self.frame_times = deque(maxlen=512) # Seconds between consecutive moves
+        self.last_duration = None
+        self.cancelled = 0
+        self._slide = None
+        self._finishing = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="slide-animator", daemon=True)
+        self._thread.start()
+
+    def slide(self, start_x, target_x, y, on_start=None, on_done=None):
+        """
+        Animates from start_x to target_x. on_start runs on the animation thread before
+        the first frame, on_done after the last one (not if the slide gets cancelled).
+        If another slide is in flight, start_x and on_start are ignored: the new slide
+        takes over from the current position.
+        """
+        with self._cond:
+            current = self._slide
+            if current is not None:
+                self.cancelled += 1
+                # Take over where the window is (or where the cancelled slide would have started)
+                started = current.started_at is not None and self.current_x is not None
+                start_x = self.current_x if started else current.start_x
+                on_start = current.on_start
+            self._slide = _Slide(start_x, target_x, y, None, on_start, on_done)
+            self._cond.notify()
+
+    def is_animating(self):
+        with self._cond:
+            return self._slide is not None
+
+    def wait(self, timeout=None):
+        """
+        Blocks until no slide is in flight (including its on_done). Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._slide is not None or self._finishing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def get_frame_stats(self):
+        with self._cond:
+            frames = sorted(self.frame_times)
+        if not frames:
+            return {"frames": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0,
+                    "last_duration_ms": None, "cancelled": self.cancelled}
+        return {
+            "frames": len(frames),
+            "avg_ms": sum(frames) / len(frames) * 1000,
+            "p95_ms": frames[min(len(frames) - 1, int(len(frames) * 0.95))] * 1000,
+            "max_ms": frames[-1] * 1000,
+            "last_duration_ms": None if self.last_duration is None else self.last_duration * 1000,
+            "cancelled": self.cancelled,
+        }
+
+    def _run(self):
+        last_move = None
+        while True:
+            with self._cond:
+                while self._slide is None:
+                    last_move = None
+                    self._cond.wait()
+                slide = self._slide
+                on_start, slide.on_start = slide.on_start, None
+
+            if on_start:
+                try:
+                    on_start()
+                except Exception as e:
+                    self._drop(slide, f"Error starting slide: {e}")
+                    continue
+            with self._cond:
+                if slide.started_at is None:
+                    slide.started_at = self.clock()
+
+            try:
+                progress = min(1.0, (self.clock() - slide.started_at) / self.duration) if self.duration > 0 else 1.0
+                x = int(round(slide.start_x + (slide.target_x - slide.start_x) * self.easing(progress)))
+                self.window.move(x, slide.y)
+            except Exception as e:
+                self._drop(slide, f"Error moving window: {e}")
+                continue
+            now = self.clock()
+
+            with self._cond:
+                self.current_x = x
+                if last_move is not None:
+                    self.frame_times.append(now - last_move)
+                last_move = now
+                if self._slide is not slide:
+                    continue # Cancelled while moving: pick up the new slide right away
+                if progress < 1.0:
+                    self._cond.wait(self.frame_interval)
+                    continue
+                self._slide = None
+                self._finishing = True
+                self.last_duration = now - slide.started_at
+
+            try:
+                if slide.on_done:
+                    slide.on_done()
+            except Exception as e:
+                print(f"Error finishing slide: {e}")
+            finally:
+                with self._cond:
+                    self._finishing = False
+                    self._cond.notify_all()
+
+    def _drop(self, slide, message):
+        # A failing callback or frame abandons its slide; the thread stays up for the next one
+        print(message)
+        with self._cond:
+            if self._slide is slide:
+                self._slide = None
+            self._finishing = False
+            self._cond.notify_all()
@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Skills that talk to the network or spawn processes get fewer slots; everything else
+# shares DEFAULT_LIMIT. Keys are intent router rule names (see AIEngine._build_router).
+SKILL_LIMITS = {
+    "music": 1,       # yt-dlp extraction and the shared queue
+    "search": 2,
+    "news": 2,
+    "weather": 2,
+    "translate": 2,
+    "app.open": 2,
+    "app.close": 2,
+}
+SKILL_TIMEOUTS = {
+    "music": 60.0,
+    "search": 20.0,
+    "news": 20.0,
+    "weather": 15.0,
+    "translate": 15.0,
+}
+DEFAULT_LIMIT = 4
+DEFAULT_TIMEOUT = 30.0
+KEEP_FINISHED = 200 # Finished jobs kept for get_job/wait and the queue-time stats
+FINISHED_STATUSES = ("done", "error", "timeout", "cancelled")
+
+
+class Job:
+    def __init__(self, job_id, text, skill):
+        self.id = job_id
+        self.text = text
+        self.skill = skill
+        self.status = "queued" # queued -> running -> done / error / timeout / cancelled
+        self.result = None
+        self.submitted_at = time.monotonic()
+        self.started_at = None
+        self.finished_at = None
+        self.task = None
+        self.future = None
+        self.cancel_requested = False
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "text": self.text,
+            "skill": self.skill,
+            "status": self.status,
+            "result": self.result,
+            "queue_ms": None if self.started_at is None else (self.started_at - self.submitted_at) * 1000,
+            "run_ms": None if self.finished_at is None or self.started_at is None
+                      else (self.finished_at - self.started_at) * 1000,
+        }
+
+
+class CommandPipeline:
+    """
+    Runs commands asynchronously so the webview bridge never waits on a skill.
+
+    submit() returns a job id at once. An asyncio loop on a background thread schedules
+    the job on a thread pool, gated by a per-skill semaphore (SKILL_LIMITS) and bounded
+    by a per-skill timeout (SKILL_TIMEOUTS). When the job finishes, times out, fails or
+    is cancelled, on_result(job_dict) is called, e.g. to push it to the page with
+    window.evaluate_js.
+
+    A timed-out or cancelled skill call cannot be interrupted inside its worker thread;
+    its result is discarded and its skill slot is released.
+
+    Only the last `keep_finished` finished jobs stay in self.jobs; older ones are dropped
+    (get_job returns None for them) and only counted in get_stats.
+    """
+
+    def __init__(self, process, classify=None, on_result=None, max_workers=8,
+                 limits=None, timeouts=None, default_limit=DEFAULT_LIMIT, default_timeout=DEFAULT_TIMEOUT,
+                 keep_finished=KEEP_FINISHED):
+        """
+        process: callable(text) -> response string (AIEngine.process_input)
+        classify: callable(text) -> skill name (AIEngine.classify_input)
+        """
+        self.process = process
+        self.classify = classify or (lambda text: "chat")
+        self.on_result = on_result
+        self.limits = dict(SKILL_LIMITS if limits is None else limits)
+        self.timeouts = dict(SKILL_TIMEOUTS if timeouts is None else timeouts)
+        self.default_limit = default_limit
+        self.default_timeout = default_timeout
+
+        self.jobs = {} # Queued and running jobs, plus the most recent finished ones
+        self._finished = deque() # Ids of finished jobs still in self.jobs, oldest first
+        self.keep_finished = keep_finished
+        self._submitted = 0
+        self._counts = dict.fromkeys(FINISHED_STATUSES, 0)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="skill")
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="command-pipeline", daemon=True)
+        self._thread.start()
+
+    # --- Thread-safe API ---
+    def submit(self, text):
+        """
+        Queues a command and returns its job id immediately.
+        """
+        try:
+            skill = self.classify(text)
+        except Exception:
+            skill = "chat"
+        with self._lock:
+            job = Job(next(self._ids), text, skill)
+            self.jobs[job.id] = job
+            self._submitted += 1
+        job.future = asyncio.run_coroutine_threadsafe(self._run(job), self._loop)
+        return job.id
+
+    def cancel(self, job_id):
+        """
+        Cancels a queued or running job. Returns False if it already finished.
+        """
+        job = self.jobs.get(job_id)
+        if job is None or job.status not in ("queued", "running"):
+            return False
+        self._loop.call_soon_threadsafe(self._cancel, job)
+        return True
+
+    def get_job(self, job_id):
+        job = self.jobs.get(job_id)
+        return job.to_dict() if job else None
+
+    def wait(self, job_id, timeout=None):
+        """
+        Blocks until the job is finished and returns its dict. Raises KeyError for a job
+        that finished long enough ago to have been dropped.
+        """
+        job = self.jobs[job_id]
+        job.future.result(timeout)
+        return job.to_dict()
+
+    def get_stats(self):
+        """
+        Job counts since start; queue times cover the jobs still held (live and recent).
+        """
+        with self._lock:
+            jobs = list(self.jobs.values())
+            stats = {"jobs": self._submitted, "held": len(jobs)}
+            stats.update(self._counts)
+        queued = sorted((j.started_at - j.submitted_at) * 1000 for j in jobs if j.started_at is not None)
+        for status in ("queued", "running"):
+            stats[status] = sum(1 for j in jobs if j.status == status)
+        stats["queue_p50_ms"] = queued[len(queued) // 2] if queued else 0.0
+        stats["queue_max_ms"] = queued[-1] if queued else 0.0
+        return stats
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    # --- Loop side ---
+    def _semaphore(self, skill):
+        sem = self._semaphores.get(skill)
+        if sem is None:
+            sem = self._semaphores[skill] = asyncio.Semaphore(self.limits.get(skill, self.default_limit))
+        return sem
+
+    def _cancel(self, job):
+        # The task may not have taken its first step yet; _run checks the flag then
+        job.cancel_requested = True
+        if job.task is not None:
+            job.task.cancel()
+
+    async def _run(self, job):
+        job.task = asyncio.current_task()
+        try:
+            if job.cancel_requested:
+                raise asyncio.CancelledError()
+            async with self._semaphore(job.skill):
+                job.status = "running"
+                job.started_at = time.monotonic()
+                call = self._loop.run_in_executor(self._executor, self.process, job.text)
+                try:
+                    job.result = await asyncio.wait_for(call, self.timeouts.get(job.skill, self.default_timeout))
+                    job.status = "done"
+                except asyncio.TimeoutError:
+                    job.status = "timeout"
+                    job.result = "Sorry, that took too long."
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    job.status = "error"
+                    job.result = f"Error: {e}"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            job.result = "Cancelled."
+        job.finished_at = time.monotonic()
+        if job.started_at is None:
+            job.started_at = job.finished_at
+        with self._lock:
+            self._counts[job.status] += 1
+            self._finished.append(job.id)
+            while len(self._finished) > self.keep_finished:
+                self.jobs.pop(self._finished.popleft(), None)
+        if self.on_result:
+            # Delivery (e.g. evaluate_js) may block, keep it off the loop thread
+            self._loop.run_in_executor(self._executor, self._deliver, job.to_dict())
+
+    def _deliver(self, payload):
+        try:
+            self.on_result(payload)
+        except Exception as e:
+            print(f"Error delivering command result: {e}")
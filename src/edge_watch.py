@@ -0,0 +1,162 @@
+import threading
+import time
+from ctypes import byref, Structure, c_long
+
+try:
+    from ctypes import windll
+except ImportError:
+    windll = None
+
+
+class POINT(Structure):
+    _fields_ = [("x", c_long), ("y", c_long)]
+
+
+class PointerSource:
+    """
+    Where the cursor position comes from. position() returns (x, y).
+    """
+
+    def position(self):
+        raise NotImplementedError
+
+
+class Win32PointerSource(PointerSource):
+    def __init__(self):
+        self._pt = POINT()
+
+    def position(self):
+        windll.user32.GetCursorPos(byref(self._pt))
+        return self._pt.x, self._pt.y
+
+
+class FakePointerSource(PointerSource):
+    """
+    Scripted cursor for tests: path(now) -> (x, y), evaluated on the watcher's clock.
+    """
+
+    def __init__(self, path, clock):
+        self.path = path
+        self.clock = clock
+        self.reads = 0
+
+    def position(self):
+        self.reads += 1
+        return self.path(self.clock())
+
+
+class EdgeWatcher:
+    """
+    Open/close state machine for the sidebar, driven by the cursor position.
+
+    Hovering on the right screen edge for `open_delay` seconds calls on_open(); leaving
+    the sidebar for `close_delay` seconds while it is open calls on_close().
+
+    Instead of waking every 100 ms forever, step() returns how long to sleep before the
+    next look: while a hover/leave timer runs it wakes right at the deadline, far from the
+    edge it sleeps as long as the cursor would need to reach it (at `cursor_speed` px/s),
+    and an idle cursor backs off geometrically up to `max_interval`.
+    """
+
+    def __init__(self, pointer, geometry, is_open, on_open, on_close, sidebar_width=800,
+                 open_delay=0.3, close_delay=0.4, edge_px=3, min_interval=0.02, poll_interval=0.1,
+                 max_interval=0.5, cursor_speed=4000, clock=time.monotonic):
+        """
+        pointer: PointerSource
+        geometry: object with rightmost() -> (width, height, x, y), e.g. monitors.MonitorTopology
+        is_open: callable returning whether the sidebar is currently shown
+        """
+        self.pointer = pointer
+        self.geometry = geometry
+        self.is_open = is_open
+        self.on_open = on_open
+        self.on_close = on_close
+        self.sidebar_width = sidebar_width
+        self.open_delay = open_delay
+        self.close_delay = close_delay
+        self.edge_px = edge_px
+        self.min_interval = min_interval
+        self.poll_interval = poll_interval
+        self.max_interval = max_interval
+        self.cursor_speed = cursor_speed
+        self.clock = clock
+
+        self.hover_since = None
+        self.leave_since = None
+        self.wakeups = 0
+        self._last_pos = None
+        self._idle_interval = poll_interval
+        self._stop = threading.Event()
+
+    def step(self):
+        """
+        One look at the cursor. Returns seconds until the next one.
+        """
+        self.wakeups += 1
+        now = self.clock()
+        x, y = self.pointer.position()
+        w, h, x_off, y_off = self.geometry.rightmost()
+        right_edge = x_off + w
+        is_open = self.is_open()
+
+        # Open Logic
+        if x >= right_edge - self.edge_px and not is_open:
+            if self.hover_since is None:
+                self.hover_since = now
+            if now - self.hover_since >= self.open_delay:
+                self.hover_since = None
+                self.on_open()
+                is_open = True
+        else:
+            self.hover_since = None
+
+        # Close Logic
+        if is_open and x < right_edge - self.sidebar_width:
+            if self.leave_since is None:
+                self.leave_since = now
+            if now - self.leave_since >= self.close_delay:
+                self.leave_since = None
+                self.on_close()
+                is_open = False
+        else:
+            self.leave_since = None
+
+        return self._next_interval(now, x, right_edge, is_open)
+
+    def _next_interval(self, now, x, right_edge, is_open):
+        # A running timer: come back exactly when it expires
+        if self.hover_since is not None:
+            return max(self.min_interval, self.hover_since + self.open_delay - now)
+        if self.leave_since is not None:
+            return max(self.min_interval, self.leave_since + self.close_delay - now)
+
+        moved = self._last_pos is not None and x != self._last_pos
+        self._last_pos = x
+        if moved:
+            self._idle_interval = self.poll_interval
+        else:
+            self._idle_interval = min(self.max_interval, self._idle_interval * 2)
+
+        if is_open:
+            # Inside the sidebar: the next event is the cursor leaving it
+            distance = x - (right_edge - self.sidebar_width)
+        else:
+            distance = right_edge - self.edge_px - x
+        travel = max(0, distance) / self.cursor_speed
+        return min(self.max_interval, max(self.min_interval, travel, self._idle_interval))
+
+    def run(self, sleep=None):
+        """
+        Blocking loop for a daemon thread; stop() ends it.
+        """
+        sleep = sleep or self._stop.wait
+        while not self._stop.is_set():
+            try:
+                delay = self.step()
+            except Exception as e:
+                print(e)
+                delay = self.max_interval
+            sleep(delay)
+
+    def stop(self):
+        self._stop.set()
@@ -1,28 +1,94 @@
 import re
-from .skills import system_control
-from .skills import app_launcher
-from .skills import volume_control
-from .skills import system_settings
-from .skills import radio_control
-from .skills import theme_control
-from .skills import system_actions
-from .skills import web_skills
-from .skills import weather_skill
-from .skills import music_player
-from .skills import translator
-from .skills import gaming_mode
-from .skills import timer
-from .simple_nlp import SimpleIntentClassifier
+from datetime import datetime, timedelta
+from .intent_router import IntentRouter
+from .skill_registry import SkillRegistry, SkillUnavailable
+
+# --- Precompiled patterns (compiled once at import instead of on every command) ---
+PRODUCTIVITY_PREFIX_RE = re.compile(r'(?:add event|schedule|remind me to|deadline for|add deadline|set deadline)(?:\s+of)?\s+(.+)', re.IGNORECASE)
+PRODUCTIVITY_SUFFIX_RE = re.compile(r'(.+) due (.+)', re.IGNORECASE)
+TOMORROW_RE = re.compile(r'\btomorrow\b', re.IGNORECASE)
+TODAY_RE = re.compile(r'\btoday\b', re.IGNORECASE)
+# Pattern: at XX(:XX)?(am/pm)? (to|until|-) XX(:XX)?(am/pm)?
+TIME_RANGE_RE = re.compile(r'(?:at|from)\s+(\d{1,2}(?::\d{2})?(?:am|pm)?)\s+(?:to|until|-)\s+(\d{1,2}(?::\d{2})?(?:am|pm)?)', re.IGNORECASE)
+SINGLE_TIME_RE = re.compile(r'(?:at|by)\s+(\d{1,2}(?::\d{2})?(?:am|pm)?)', re.IGNORECASE)
+TITLE_PREPOSITION_RE = re.compile(r'^(?:for|on|at|about)\s+', re.IGNORECASE)
+NOTE_RE = re.compile(r'(?:take note|note this|save note)(?::| that)? (.+)', re.IGNORECASE)
+BRIGHTNESS_RE = re.compile(r'brightness\D*(\d+)')
+VOLUME_RE = re.compile(r'volume\D*(\d+)')
+WEATHER_RE = re.compile(r'weather\s+(?:in|for|at)?\s*([a-zA-Z\s]+)')
+NEWS_RE = re.compile(r'news\s+(?:about|on|for)?\s*(.+)')
+SEARCH_PREFIX_RE = re.compile(r'^(search|lookup|find)\s+(for\s+)?')
+OPEN_RE = re.compile(r'(open|launch|start)\s+(.+)')
+CLOSE_RE = re.compile(r'(close|quit|exit|terminate)\s+(.+)')
+TIMER_CANCEL_RE = re.compile(r'\b(?:cancel|stop|delete|remove)\s+(?:(all)\s+)?(?:the\s+|my\s+)?(?:timer|alarm)s?\b\s*(?:called\s+|named\s+)?(.*)', re.IGNORECASE)
+TIMER_LIST_RE = re.compile(r'\b(?:list|show|what|my|active|running)\b.*\b(?:timer|alarm)s\b|\b(?:timer|alarm)s\b\s*$', re.IGNORECASE)
+TRANSLATE_RE = re.compile(r'translate (.+) to (english|chinese|mandarin|chinese simplified|chinese traditional)', re.IGNORECASE)
+
+# Words that indicate the user does NOT want the action immediately
+NEGATION_WORDS = frozenset([
+    "don't", "dont", "do not", "never", "no", "not", "abort", "cancel",
+    "how", "what", "why", "where", "who", "when", "which", # Question words
+    "ask", "about", "want" # Context/Discussion words
+])
+
+# Skills used as plain modules, looked up through the registry by module name
+SKILL_MODULES = ["system_control", "app_launcher", "volume_control", "system_settings", "radio_control",
+                 "theme_control", "system_actions", "web_skills", "weather_skill"]
+
+# The only NLP intents that trigger an action; anything else falls through to the rules below
+NLP_ACTIONS = ("system.shutdown", "system.restart", "system.lock", "volume.up", "volume.down")
+WORD_RE = re.compile(r'\b\w+\b')
+
+SETTINGS_KEYWORDS = ["network", "display", "sound", "battery", "bluetooth", "wifi"]
 
 class AIEngine:
     def __init__(self, productivity_manager=None):
         self.name = "DesktopAI"
-        self.music = music_player.MusicSkill()
         self.productivity = productivity_manager
-        self.translator = translator.TranslatorSkill()
-        self.gaming_mode = gaming_mode.GamingModeSkill(self)
-        self.timer = timer.TimerSkill()
-        self.nlp = SimpleIntentClassifier()
+        # Skills are imported and built on first use; warm_up() preloads them
+        self.skills = self._build_registry()
+        self.router = self._build_router()
+
+    def _build_registry(self):
+        skills = SkillRegistry(__package__)
+        # Registration order is the warm-up order: the classifier runs on every command
+        skills.register("nlp", ".simple_nlp", lambda m: m.SimpleIntentClassifier())
+        for name in SKILL_MODULES:
+            skills.register(name, f".skills.{name}")
+        skills.register("music", ".skills.music_player", lambda m: m.MusicSkill())
+        skills.register("translator", ".skills.translator", lambda m: m.TranslatorSkill())
+        skills.register("gaming_mode", ".skills.gaming_mode", lambda m: m.GamingModeSkill(self))
+        skills.register("timer", ".skills.timer", lambda m: m.TimerSkill())
+        return skills
+
+    @property
+    def nlp(self):
+        return self.skills.get("nlp")
+
+    @property
+    def music(self):
+        return self.skills.get("music")
+
+    @property
+    def translator(self):
+        return self.skills.get("translator")
+
+    @property
+    def gaming_mode(self):
+        return self.skills.get("gaming_mode")
+
+    @property
+    def timer(self):
+        return self.skills.get("timer")
+
+    def warm_up(self, background=True):
+        """
+        Loads every skill ahead of first use; call once the UI is up.
+        """
+        return self.skills.warm_up(background=background)
+
+    def get_skill_report(self):
+        return self.skills.report()
 
     def set_music_mode(self, mode):
         return self.music.set_mode(mode)
@@ -30,312 +96,389 @@ class AIEngine:
     def set_productivity_manager(self, manager):
         self.productivity = manager
 
+    def _build_router(self):
+        # Registration order is the rule priority (first answer wins), mirroring the old cascade.
+        # Keywords are lowercase substrings; a handler may still decline by returning None.
+        router = IntentRouter()
+        router.register("productivity", self._handle_productivity,
+                        ["add event", "schedule", "remind me to", "deadline for", "add deadline", "set deadline", " due "])
+        router.register("note", self._handle_note, ["take note", "note this", "save note"])
+        router.register("music", self._handle_music, ["m!"])
+        router.register("nlp", self._handle_nlp)
+        router.register("brightness", self._handle_brightness, ["brightness"])
+        router.register("volume", self._handle_volume, ["volume"])
+        router.register("mute", self._handle_mute, ["mute"])
+        router.register("power.saver", self._handle_power_saver, ["energy saver", "battery saver"])
+        router.register("power.high", self._handle_power_high, ["high performance", "game mode"])
+        router.register("power.balanced", self._handle_power_balanced, ["balanced mode"])
+        router.register("night_light", self._handle_night_light, ["night light", "nightlight"])
+        router.register("shutdown.abort", self._handle_shutdown_abort, ["shutdown", "restart"])
+        router.register("lock", self._handle_lock, ["lock"])
+        router.register("sleep", self._handle_sleep, ["sleep"])
+        router.register("theme", self._handle_theme, ["dark mode", "dark theme", "light mode", "light theme"])
+        router.register("radio", self._handle_radio, ["bluetooth", "wifi"])
+        router.register("weather", self._handle_weather, ["weather"])
+        router.register("news", self._handle_news, ["news"])
+        router.register("search", self._handle_search, ["search", "lookup", "who is", "what is"])
+        router.register("settings", self._handle_settings, SETTINGS_KEYWORDS)
+        router.register("app.open", self._handle_open, ["open", "launch", "start"])
+        router.register("app.close", self._handle_close, ["close", "quit", "exit", "terminate"])
+        router.register("translate", self._handle_translate, ["translate "])
+        router.register("gaming", self._handle_gaming, ["gaming mode", "game mode"])
+        router.register("timer", self._handle_timer, ["timer", "alarm"])
+        router.register("chat", lambda text, lower: self.chat_response(lower))
+        return router.compile()
+
     def process_input(self, user_input):
         user_input = user_input.strip() # Keep case for some parts, but lower for logic usually
         lower_input = user_input.lower()
+        try:
+            _, response = self.router.dispatch(user_input, lower_input)
+        except SkillUnavailable as e:
+            # e.g. volume control without pycaw: that command fails, the rest keep working
+            return f"Sorry, {e.name.replace('_', ' ')} is not available on this system ({e.error})."
+        return response
+
+    def classify_input(self, user_input):
+        """
+        Which skill a command is most likely headed for (e.g. "weather", "music"),
+        used by the command pipeline to pick concurrency limits and timeouts.
+        """
+        return self.router.classify(user_input.strip().lower()) or "chat"
+
+    # Rule -1: Productivity (Tasks/Notes/Calendar Events)
+    def _handle_productivity(self, user_input, lower_input):
+        if not self.productivity:
+            return None
+        # Match: "Add event...", "Schedule...", "Deadline..." or "Project X due..."
+        # Use user_input (original case) instead of lower_input for the regex text capture
+        prefix_match = PRODUCTIVITY_PREFIX_RE.search(user_input)
+        suffix_match = PRODUCTIVITY_SUFFIX_RE.search(user_input)
+        if not (prefix_match or suffix_match):
+            return None
+
+        raw_text = ""
+        is_deadline = False
         
-        # Rule -1: Productivity (Tasks/Notes/Calendar Events)
-        if self.productivity:
-            # Match: "Add event...", "Schedule...", "Deadline..." or "Project X due..."
-            # Use user_input (original case) instead of lower_input for the regex text capture
-            
-            # Common prefixes
-            prefix_pattern = r'(?:add event|schedule|remind me to|deadline for|add deadline|set deadline)(?:\s+of)?\s+(.+)'
-            suffix_pattern = r'(.+) due (.+)'
-            
-            prefix_match = re.search(prefix_pattern, user_input, re.IGNORECASE)
-            suffix_match = re.search(suffix_pattern, user_input, re.IGNORECASE)
-
-            if prefix_match or suffix_match:
-                raw_text = ""
-                is_deadline = False
-                
-                if prefix_match:
-                    raw_text = prefix_match.group(1)
-                    if "deadline" in prefix_match.group(0).lower(): is_deadline = True
-                elif suffix_match:
-                    # reconstructing so date parser finds the date part
-                    raw_text = suffix_match.group(1) + " " + suffix_match.group(2) 
-                    is_deadline = True
-                
-                # --- Parsing Logic ---
-                from datetime import datetime, timedelta
-                title = raw_text
-                date_val = datetime.now().strftime("%Y-%m-%d")
-                start_time = None
-                end_time = None
-                
-                # 1. Extract Date
-                if re.search(r'\btomorrow\b', raw_text, re.IGNORECASE):
-                    date_val = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-                    title = re.sub(r'\btomorrow\b', '', title, flags=re.IGNORECASE)
-                elif re.search(r'\btoday\b', raw_text, re.IGNORECASE):
-                    date_val = datetime.now().strftime("%Y-%m-%d")
-                    title = re.sub(r'\btoday\b', '', title, flags=re.IGNORECASE)
-                # Next [Day] logic could be added here
-                
-                # 2. Extract Timerange "at 2pm to 3pm" or "from 14:00 to 15:00"
-                # Pattern: at XX(:XX)?(am/pm)? (to|until|-) XX(:XX)?(am/pm)?
-                time_range = re.search(r'(?:at|from)\s+(\d{1,2}(?::\d{2})?(?:am|pm)?)\s+(?:to|until|-)\s+(\d{1,2}(?::\d{2})?(?:am|pm)?)', raw_text, re.IGNORECASE)
-                
-                if time_range:
-                    start_time = time_range.group(1)
-                    end_time = time_range.group(2)
-                    # Clean title
-                    title = title.replace(time_range.group(0), "")
-                else:
-                    # Single time "at 5pm"
-                    single_time = re.search(r'(?:at|by)\s+(\d{1,2}(?::\d{2})?(?:am|pm)?)', raw_text, re.IGNORECASE)
-                    if single_time:
-                        start_time = single_time.group(1)
-                        title = title.replace(single_time.group(0), "")
-
-                # Clean Title Logic
-                # 1. Remove common prepositions at the start ONLY if they make sense to remove
-                title = title.strip()
-                # If command was "Schedule OF [Course]", the 'of' is already consumed by prefix_pattern if present
-                # But just in case:
-                title = re.sub(r'^(?:for|on|at|about)\s+', '', title, flags=re.IGNORECASE)
-                
-                # 2. Remove "on" at the end if it was cut off weirdly, but use word boundary or just strip whitespace
-                title = title.strip()
-                
-                category = "Deadline" if is_deadline else "Event"
-                
-                if start_time:
-                    # It's an event with time
-                    self.productivity.add_task(title, date_val, start_time, end_time, reminder=True, category=category)
-                    return f"Scheduled {category.lower()}: '{title}' on {date_val} at {start_time}" + (f"-{end_time}" if end_time else "")
-                else:
-                    # Just a task
-                    self.productivity.add_task(title, date_val, category=category)
-                    return f"Added {category.lower()}: {title} for {date_val}"
-            
-            # "Take note: meeting at 5" or "Note this: ..."
-            note_match = re.search(r'(?:take note|note this|save note)(?::| that)? (.+)', lower_input, re.IGNORECASE)
-            if note_match:
-                content = note_match.group(1).strip()
-                current = self.productivity.get_scratchpad()
-                new_content = current + "\n" + content if current else content
-                self.productivity.save_scratchpad(new_content)
-                return "Note saved to scratchpad."
-
-        # Rule 0: Music Commands (m!add, m!play, m!loop, m!end)
-        if lower_input.startswith("m!"):
-            cmd_parts = user_input.split(" ", 1)
-            command = cmd_parts[0].lower()
-            arg = cmd_parts[1] if len(cmd_parts) > 1 else ""
-
-            if command == "m!add":
-                if not arg: return "Please provide a track name or link."
-                if arg.startswith("#") and arg[1:].isdigit():
-                    idx = int(arg[1:])
-                    hist = self.music.get_history()
-                    if 1 <= idx <= len(hist):
-                        item = hist[idx-1]
-                        return self.music.add_to_queue(item['title']) # Or use ID if logic permits
-                return self.music.add_to_queue(arg)
-            
-            if command == "m!play":
-                if not arg: return "Please provide a track name or link."
-                # Check for history index e.g., "m!play #1"
-                if arg.startswith("#") and arg[1:].isdigit():
-                    return self.music.play_from_history(int(arg[1:]))
-                return self.music.play_now(arg)
+        if prefix_match:
+            raw_text = prefix_match.group(1)
+            if "deadline" in prefix_match.group(0).lower(): is_deadline = True
+        elif suffix_match:
+            # reconstructing so date parser finds the date part
+            raw_text = suffix_match.group(1) + " " + suffix_match.group(2) 
+            is_deadline = True
+        
+        # --- Parsing Logic ---
+        title = raw_text
+        date_val = datetime.now().strftime("%Y-%m-%d")
+        start_time = None
+        end_time = None
+        
+        # 1. Extract Date
+        if TOMORROW_RE.search(raw_text):
+            date_val = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+            title = TOMORROW_RE.sub('', title)
+        elif TODAY_RE.search(raw_text):
+            date_val = datetime.now().strftime("%Y-%m-%d")
+            title = TODAY_RE.sub('', title)
+        # Next [Day] logic could be added here
+        
+        # 2. Extract Timerange "at 2pm to 3pm" or "from 14:00 to 15:00"
+        time_range = TIME_RANGE_RE.search(raw_text)
+        
+        if time_range:
+            start_time = time_range.group(1)
+            end_time = time_range.group(2)
+            # Clean title
+            title = title.replace(time_range.group(0), "")
+        else:
+            # Single time "at 5pm"
+            single_time = SINGLE_TIME_RE.search(raw_text)
+            if single_time:
+                start_time = single_time.group(1)
+                title = title.replace(single_time.group(0), "")
+
+        # Clean Title Logic
+        # 1. Remove common prepositions at the start ONLY if they make sense to remove
+        title = title.strip()
+        # If command was "Schedule OF [Course]", the 'of' is already consumed by prefix_pattern if present
+        # But just in case:
+        title = TITLE_PREPOSITION_RE.sub('', title)
+        
+        # 2. Remove "on" at the end if it was cut off weirdly, but use word boundary or just strip whitespace
+        title = title.strip()
+        
+        category = "Deadline" if is_deadline else "Event"
+        
+        if start_time:
+            # It's an event with time
+            self.productivity.add_task(title, date_val, start_time, end_time, reminder=True, category=category)
+            return f"Scheduled {category.lower()}: '{title}' on {date_val} at {start_time}" + (f"-{end_time}" if end_time else "")
+        else:
+            # Just a task
+            self.productivity.add_task(title, date_val, category=category)
+            return f"Added {category.lower()}: {title} for {date_val}"
+
+    # "Take note: meeting at 5" or "Note this: ..."
+    def _handle_note(self, user_input, lower_input):
+        if not self.productivity:
+            return None
+        note_match = NOTE_RE.search(lower_input)
+        if note_match:
+            content = note_match.group(1).strip()
+            current = self.productivity.get_scratchpad()
+            new_content = current + "\n" + content if current else content
+            self.productivity.save_scratchpad(new_content)
+            return "Note saved to scratchpad."
+        return None
+
+    # Rule 0: Music Commands (m!add, m!play, m!loop, m!end)
+    def _handle_music(self, user_input, lower_input):
+        if not lower_input.startswith("m!"):
+            return None
+        cmd_parts = user_input.split(" ", 1)
+        command = cmd_parts[0].lower()
+        arg = cmd_parts[1] if len(cmd_parts) > 1 else ""
+
+        if command == "m!add":
+            if not arg: return "Please provide a track name or link."
+            if arg.startswith("#") and arg[1:].isdigit():
+                item = self.music.get_history_item(int(arg[1:]))
+                if item:
+                    return self.music.add_to_queue(item['title']) # Or use ID if logic permits
+            queries = [q.strip() for q in arg.split(";") if q.strip()]
+            if len(queries) > 1:
+                return self.music.add_many_to_queue(queries)
+            return self.music.add_to_queue(arg)
+        
+        if command == "m!play":
+            if not arg: return "Please provide a track name or link."
+            # Check for history index e.g., "m!play #1"
+            if arg.startswith("#") and arg[1:].isdigit():
+                return self.music.play_from_history(int(arg[1:]))
+            return self.music.play_now(arg)
+        
+        if command == "m!history":
+            return self.music.format_history()
+        
+        if command == "m!loop":
+            return self.music.start_loop()
             
-            if command == "m!history":
-                return self.music.format_history()
+        if command == "m!end":
+            return self.music.clear_queue()
             
-            if command == "m!loop":
-                return self.music.start_loop()
-                
-            if command == "m!end":
-                return self.music.clear_queue()
-                
-            return "Unknown music command. Try m!add, m!play, m!loop, or m!end."
-
-        # Rule 0.5: NLP Intent Classification
+        return "Unknown music command. Try m!add, m!play, m!loop, or m!end."
+
+    # Rule 0.5: NLP Intent Classification
+    def _handle_nlp(self, user_input, lower_input):
+        # The rule has no keywords and runs on every input: skip the classifier
+        # unless the input shares a word with one of the actionable intents
+        if self.nlp.words_of(NLP_ACTIONS).isdisjoint(WORD_RE.findall(lower_input)):
+            return None
         nlp_intent, nlp_score = self.nlp.predict(lower_input)
         
         # Check for negation and safe-guards
-        # Words that indicate the user does NOT want the action immediately
-        negation_words = [
-            "don't", "dont", "do not", "never", "no", "not", "abort", "cancel",
-            "how", "what", "why", "where", "who", "when", "which", # Question words
-            "ask", "about", "want" # Context/Discussion words
-        ]
-        is_negated = any(word in lower_input.split() for word in negation_words)
+        is_negated = any(word in NEGATION_WORDS for word in lower_input.split())
 
         # High confidence overrides
         if nlp_score > 0.7 and not is_negated:
             if nlp_intent == "system.shutdown":
-                 return system_actions.shutdown_pc()
+                 return self.skills.get("system_actions").shutdown_pc()
             elif nlp_intent == "system.restart":
-                 return system_actions.restart_pc()
+                 return self.skills.get("system_actions").restart_pc()
             elif nlp_intent == "system.lock":
-                 return system_actions.lock_screen()
+                 return self.skills.get("system_actions").lock_screen()
             elif nlp_intent == "volume.up":
-                 return volume_control.set_volume("+10") # Increment logic handled by int conversion usually or we need to check set_volume impl
+                 return self.skills.get("volume_control").set_volume("+10") # Increment logic handled by int conversion usually or we need to check set_volume impl
             elif nlp_intent == "volume.down":
-                 return volume_control.set_volume("-10")
+                 return self.skills.get("volume_control").set_volume("-10")
             elif nlp_intent == "app.open":
                  # Extract app name from remaining text? 
                  # Often complex w/o Named Entity Recognition (NER), fallback to regex for extraction below
                  pass 
+        return None
 
-        # Rule 1: Brightness Control
-        brightness_match = re.search(r'brightness\D*(\d+)', lower_input)
+    # Rule 1: Brightness Control
+    def _handle_brightness(self, user_input, lower_input):
+        brightness_match = BRIGHTNESS_RE.search(lower_input)
         if brightness_match:
             level = brightness_match.group(1)
-            return system_control.set_brightness(level)
+            return self.skills.get("system_control").set_brightness(level)
+        return None
 
-        # Rule 2: Volume Control
-        # Matches: "set volume to 50", "volume 100", "turn down volume to 20"
-        volume_match = re.search(r'volume\D*(\d+)', user_input)
+    # Rule 2: Volume Control
+    # Matches: "set volume to 50", "volume 100", "turn down volume to 20"
+    def _handle_volume(self, user_input, lower_input):
+        volume_match = VOLUME_RE.search(user_input)
         if volume_match:
             level = volume_match.group(1)
-            return volume_control.set_volume(level)
+            return self.skills.get("volume_control").set_volume(level)
+        return None
 
+    def _handle_mute(self, user_input, lower_input):
         if "mute" in user_input:
             if "unmute" in user_input or "stop" in user_input or "off" in user_input:
-                return volume_control.mute_volume(False)
-            return volume_control.mute_volume(True)
+                return self.skills.get("volume_control").mute_volume(False)
+            return self.skills.get("volume_control").mute_volume(True)
+        return None
 
-        # Rule 3: Power/Energy Modes
+    # Rule 3: Power/Energy Modes
+    def _handle_power_saver(self, user_input, lower_input):
         if "energy saver" in user_input or "battery saver" in user_input:
              if "on" in user_input or "enable" in user_input or "activate" in user_input:
-                 return system_settings.set_power_mode("saver")
+                 return self.skills.get("system_settings").set_power_mode("saver")
              elif "off" in user_input or "disable" in user_input:
-                 return system_settings.set_power_mode("balanced")
-        
+                 return self.skills.get("system_settings").set_power_mode("balanced")
+        return None
+
+    def _handle_power_high(self, user_input, lower_input):
         if "high performance" in user_input or "game mode" in user_input:
-             return system_settings.set_power_mode("high")
-        
+             return self.skills.get("system_settings").set_power_mode("high")
+        return None
+
+    def _handle_power_balanced(self, user_input, lower_input):
         if "balanced mode" in user_input:
-             return system_settings.set_power_mode("balanced")
-
-        # Night light handling: open settings since automated toggle is unreliable
-        if "night light" in lower_input or "nightlight" in lower_input:
-            # detect explicit on/off request
-            if "on" in lower_input or "enable" in lower_input or "activate" in lower_input:
-                return system_settings.toggle_night_light('on')
-            if "off" in lower_input or "disable" in lower_input:
-                return system_settings.toggle_night_light('off')
-            # otherwise just open the Night light settings page
-            return system_settings.toggle_night_light()
-
-        # Rule 4: System Actions (Shutdown, Lock, Sleep, Theme)
+             return self.skills.get("system_settings").set_power_mode("balanced")
+        return None
+
+    # Night light handling: open settings since automated toggle is unreliable
+    def _handle_night_light(self, user_input, lower_input):
+        # detect explicit on/off request
+        if "on" in lower_input or "enable" in lower_input or "activate" in lower_input:
+            return self.skills.get("system_settings").toggle_night_light('on')
+        if "off" in lower_input or "disable" in lower_input:
+            return self.skills.get("system_settings").toggle_night_light('off')
+        # otherwise just open the Night light settings page
+        return self.skills.get("system_settings").toggle_night_light()
+
+    # Rule 4: System Actions (Shutdown, Lock, Sleep, Theme)
+    # Note: Direct 'shutdown' or 'restart' string matching was removed to prevent accidental triggers.
+    # These are now handled by the NLP Intent Classifier (Rule 0.5) with safer confidence thresholds.
+    def _handle_shutdown_abort(self, user_input, lower_input):
         # Handle abort specifically
         if ("shutdown" in user_input or "restart" in user_input) and ("abort" in user_input or "cancel" in user_input):
-            return system_actions.shutdown_pc(abort=True)
+            return self.skills.get("system_actions").shutdown_pc(abort=True)
+        return None
 
-        # Note: Direct 'shutdown' or 'restart' string matching was removed to prevent accidental triggers.
-        # These are now handled by the NLP Intent Classifier (Rule 0.5) with safer confidence thresholds.
-            
+    def _handle_lock(self, user_input, lower_input):
         if "lock" in user_input and ("screen" in user_input or "pc" in user_input or "computer" in user_input):
-             return system_actions.lock_screen()
-             
+             return self.skills.get("system_actions").lock_screen()
+        return None
+
+    def _handle_sleep(self, user_input, lower_input):
         if "sleep" in user_input and ("pc" in user_input or "computer" in user_input or "mode" in user_input):
-             return system_actions.sleep_pc()
+             return self.skills.get("system_actions").sleep_pc()
+        return None
 
+    def _handle_theme(self, user_input, lower_input):
         if "dark mode" in user_input or "dark theme" in user_input:
-             return theme_control.set_theme("dark")
-             
+             return self.skills.get("theme_control").set_theme("dark")
         if "light mode" in user_input or "light theme" in user_input:
-             return theme_control.set_theme("light")
-
-        # Rule 5: System Settings (Bluetooth, Wifi) - DIRECT TOGGLE
-        # Matches: "turn on bluetooth", "turn off wifi"
-        if "energy saver" in user_input or "battery saver" in user_input:
-             if "on" in user_input or "enable" in user_input or "activate" in user_input:
-                 return system_settings.set_power_mode("saver")
-             elif "off" in user_input or "disable" in user_input:
-                 return system_settings.set_power_mode("balanced")
-        
-        if "high performance" in user_input or "game mode" in user_input:
-             return system_settings.set_power_mode("high")
-        
-        if "balanced mode" in user_input:
-             return system_settings.set_power_mode("balanced")
+             return self.skills.get("theme_control").set_theme("light")
+        return None
 
-        # Rule 5: System Settings (Bluetooth, Wifi) - DIRECT TOGGLE
-        # Matches: "turn on bluetooth", "turn off wifi"
+    # Rule 5: System Settings (Bluetooth, Wifi) - DIRECT TOGGLE
+    # Matches: "turn on bluetooth", "turn off wifi"
+    def _handle_radio(self, user_input, lower_input):
         if ("bluetooth" in user_input or "wifi" in user_input) and ("turn" in user_input or "switch" in user_input):
             target = "bluetooth" if "bluetooth" in user_input else "wifi"
             action = "on" if ("on" in user_input or "enable" in user_input) else "off"
-            return radio_control.set_state(target, action)
-
-        # Rule 6: Web Skills (Search, News, Weather) - NEW
-        if "weather" in user_input:
-            # simple extraction: "weather in London"
-            city_match = re.search(r'weather\s+(?:in|for|at)?\s*([a-zA-Z\s]+)', user_input)
-            if city_match:
-                city = city_match.group(1).strip()
-                return weather_skill.get_weather(city)
-            return "Please specify a city. (e.g., 'weather in Tokyo')"
-
-        if "news" in user_input:
-            # "news about tech", "latest news"
-            topic_match = re.search(r'news\s+(?:about|on|for)?\s*(.+)', user_input)
-            query = topic_match.group(1) if topic_match else "latest updates"
-            return web_skills.search_news(query)
+            return self.skills.get("radio_control").set_state(target, action)
+        return None
+
+    # Rule 6: Web Skills (Search, News, Weather)
+    def _handle_weather(self, user_input, lower_input):
+        if "weather" not in user_input:
+            return None
+        # simple extraction: "weather in London"
+        city_match = WEATHER_RE.search(user_input)
+        if city_match:
+            city = city_match.group(1).strip()
+            return self.skills.get("weather_skill").get_weather(city)
+        return "Please specify a city. (e.g., 'weather in Tokyo')"
+
+    def _handle_news(self, user_input, lower_input):
+        if "news" not in user_input:
+            return None
+        # "news about tech", "latest news"
+        topic_match = NEWS_RE.search(user_input)
+        query = topic_match.group(1) if topic_match else "latest updates"
+        return self.skills.get("web_skills").search_news(query)
 
+    def _handle_search(self, user_input, lower_input):
         if "search" in user_input or "lookup" in user_input or "who is" in user_input or "what is" in user_input:
             # "search for python tutorials"
             # remove "search", "search for"
-            query = re.sub(r'^(search|lookup|find)\s+(for\s+)?', '', user_input).strip()
-            return web_skills.search_web(query)
+            query = SEARCH_PREFIX_RE.sub('', user_input).strip()
+            # "search rust; go; zig" looks them all up at once
+            queries = [q.strip() for q in query.split(";") if q.strip()]
+            if len(queries) > 1:
+                return "\n".join(self.skills.get("web_skills").search_many(queries))
+            return self.skills.get("web_skills").search_web(query)
+        return None
 
-        # Rule 7: System Settings (Fallback to opening window)
-        # Matches: "open network settings", "check battery"
-        settings_keywords = ["network", "display", "sound", "battery", "bluetooth", "wifi"]
-        for keyword in settings_keywords:
+    # Rule 7: System Settings (Fallback to opening window)
+    # Matches: "open network settings", "check battery"
+    def _handle_settings(self, user_input, lower_input):
+        for keyword in SETTINGS_KEYWORDS:
             if keyword in user_input and ("open" in user_input or "check" in user_input or "show" in user_input):
-                 return system_settings.open_settings(keyword)
+                 return self.skills.get("system_settings").open_settings(keyword)
+        return None
 
-        # Rule 6: Open Applications
-        # Matches: "open google chrome", "launch notepad"
-        open_match = re.search(r'(open|launch|start)\s+(.+)', lower_input)
+    # Rule 8: Open Applications
+    # Matches: "open google chrome", "launch notepad"
+    def _handle_open(self, user_input, lower_input):
+        open_match = OPEN_RE.search(lower_input)
         if open_match:
             app_name = open_match.group(2)
-            return app_launcher.launch_application(app_name)
+            return self.skills.get("app_launcher").launch_application(app_name)
+        return None
 
-        # Rule 9: Close Application
-        close_match = re.search(r'(close|quit|exit|terminate)\s+(.+)', lower_input)
+    # Rule 9: Close Application
+    def _handle_close(self, user_input, lower_input):
+        close_match = CLOSE_RE.search(lower_input)
         if close_match:
             target = close_match.group(2)
             # Avoid closing self or important things if possible (AppOpener handles match)
             if "desktopai" in target or "sidebar" in target:
                 return "I cannot close myself this way. Use the quit button in settings."
-            return app_launcher.close_application(target)
-            
-        # Rule 10: Translation
-        # logic: "translate [text] to [language]"
-        trans_match = re.search(r'translate (.+) to (english|chinese|mandarin|chinese simplified|chinese traditional)', lower_input, re.IGNORECASE)
+            return self.skills.get("app_launcher").close_application(target)
+        return None
+
+    # Rule 10: Translation
+    # logic: "translate [text] to [language]"
+    def _handle_translate(self, user_input, lower_input):
+        trans_match = TRANSLATE_RE.search(lower_input)
         if trans_match:
             content = trans_match.group(1)
             target_lang = trans_match.group(2)
             return self.translator.translate(content, target_lang)
+        return None
+
+    # Rule 11: Gaming Mode
+    def _handle_gaming(self, user_input, lower_input):
+        if "enable" in lower_input or "start" in lower_input or "on" in lower_input:
+            return self.gaming_mode.enable_gaming_mode()
+        elif "disable" in lower_input or "stop" in lower_input or "off" in lower_input:
+            return "Gaming mode disabled. Settings restored." # Logic usually simpler for off
+        # "confirm close discord" style confirmations are parsed as basic "close X" commands via Rule 9
+        return None
 
-        # Rule 11: Gaming Mode
-        if "gaming mode" in lower_input or "game mode" in lower_input:
-            if "enable" in lower_input or "start" in lower_input or "on" in lower_input:
-                return self.gaming_mode.enable_gaming_mode()
-            elif "disable" in lower_input or "stop" in lower_input or "off" in lower_input:
-                return "Gaming mode disabled. Settings restored." # Logic usually simpler for off
-            elif "confirm" in lower_input and "close" in lower_input:
-                 # Handling user confirmation "confirm close discord"
-                 # This might need a state flow, but for now let's parse basic "close X" commands via Rule 9
-                 pass
-
-        # Rule 12: Timer
-        if "timer" in lower_input or "alarm" in lower_input:
-            if "set" in lower_input or "add" in lower_input or "remind" in lower_input:
-                return self.timer.set_timer(lower_input)
-
-        # Rule 13: General "Chat" (Fallback)
-        return self.chat_response(lower_input)
+    # Rule 12: Timer
+    def _handle_timer(self, user_input, lower_input):
+        # "cancel timer 2", "stop the timer called tea", "cancel all timers"
+        cancel_match = TIMER_CANCEL_RE.search(user_input)
+        if cancel_match:
+            return self.timer.cancel_timer("all" if cancel_match.group(1) else cancel_match.group(2))
+        if "set" in lower_input or "add" in lower_input or "remind" in lower_input:
+            # Original case, so "... called Tea" keeps its name
+            return self.timer.set_timer(user_input)
+        # "list timers", "show my timers", "timers"
+        if TIMER_LIST_RE.search(lower_input):
+            return self.timer.list_timers()
+        return None
 
+    # Rule 13: General "Chat" (Fallback)
     def chat_response(self, text):
         # Placeholder for LLM integration
         # In the future, you can connect this to OpenAI/Ollama/Gemini APIs
@@ -1,15 +1,19 @@
 import webview
 import threading
 import sys
-import time
 import os
-import ctypes
+import json
 import pystray
 from PIL import Image, ImageDraw
-from ctypes import windll, byref, Structure, c_long, c_int, POINTER, sizeof
-from ctypes.wintypes import RECT, DWORD
+from ctypes import windll
 from .engine import AIEngine
 from .skills.productivity import ProductivityManager
+from .skills.reminders import ReminderEngine
+from .persistence import default_service
+from .edge_watch import EdgeWatcher, Win32PointerSource
+from .monitors import get_topology
+from .animation import SlideAnimator
+from .command_pipeline import CommandPipeline
 from datetime import datetime
 
 # --- Tray Icon Helpers ---
@@ -23,35 +27,79 @@ def create_image(width, height, color1, color2):
 class DesktopAIBridge:
     def __init__(self):
         self.productivity = ProductivityManager()
+        self.reminders = ReminderEngine(self.productivity) # Notifies for tasks with reminder set
         self.engine = AIEngine(self.productivity)
         self.window = None
+        self.pipeline = CommandPipeline(self.engine.process_input, self.engine.classify_input,
+                                        on_result=self.push_command_result)
 
     def process_command(self, text):
         return self.engine.process_input(text)
 
+    def submit_command(self, text):
+        """
+        Queues a command and returns its job id right away; the response is pushed to
+        the page through onCommandResult(job) when the skill finishes.
+        """
+        return {"job_id": self.pipeline.submit(text)}
+
+    def cancel_command(self, job_id):
+        return self.pipeline.cancel(job_id)
+
+    def get_pipeline_stats(self):
+        return self.pipeline.get_stats()
+
+    def push_command_result(self, job):
+        if self.window:
+            self.window.evaluate_js(f"onCommandResult({json.dumps(job)})")
+
     def get_dashboard_data(self, date_str=None):
-        if not date_str:
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            
-        tasks = self.productivity.get_tasks_for_date(date_str)
-        upcoming = self.productivity.get_upcoming_tasks(10)
-        return {
-            "view_date": date_str,
-            "tasks": tasks,
-            "upcoming": upcoming
-        }
+        return self.productivity.get_dashboard_data(date_str)
+
+    def get_dashboard_delta(self, since_revision, date_str=None):
+        return self.productivity.get_dashboard_delta(since_revision, date_str)
 
     def toggle_task(self, task_id):
         self.productivity.toggle_task(task_id)
         return True
 
-    def get_music_history(self):
-        return self.engine.music.get_history()
+    def apply_batch(self, operations, date_str=None):
+        """
+        Applies a list of add/toggle/update/delete operations in one round trip and
+        returns the refreshed dashboard payload (plus per-operation results).
+        Nothing is applied if any operation is invalid; the payload then carries "error".
+        """
+        try:
+            results = self.productivity.apply_batch(operations)
+            error = None
+        except ValueError as e:
+            results = []
+            error = str(e)
+        data = self.get_dashboard_data(date_str)
+        data["results"] = results
+        if error:
+            data["error"] = error
+        return data
+
+    def get_music_history(self, limit=50, order="recent"):
+        """
+        Recently played entries (what the history indexes refer to) or, with
+        order="most_played", the highest play counts.
+        """
+        if order == "most_played":
+            return self.engine.music.get_most_played(limit)
+        return self.engine.music.get_history(limit)
 
     def play_music_history_item(self, index):
         # index is 0-based from UI probably, or let's use 1-based to match engine
         return self.engine.music.play_from_history(int(index) + 1)
 
+    def delete_history_item(self, index):
+        return self.engine.music.delete_history_item(index)
+
+    def clear_history(self):
+        return self.engine.music.clear_history()
+
     def delete_task(self, task_id):
         self.productivity.delete_task(task_id)
         return True
@@ -65,6 +113,15 @@ class DesktopAIBridge:
         if key == "music_source":
             self.engine.set_music_mode(value)
     
+    def get_persistence_metrics(self):
+        return default_service().get_metrics()
+
+    def get_skill_report(self):
+        return self.engine.get_skill_report()
+
+    def get_animation_stats(self):
+        return get_animator(self.window).get_frame_stats()
+
     def minimize(self):
         self.window.minimize()
 
@@ -75,127 +132,75 @@ class DesktopAIBridge:
         global TRAY_ICON
         if TRAY_ICON:
              TRAY_ICON.stop()
+        # Write any debounced changes before the process goes away
+        default_service().flush()
         self.window.destroy()
         sys.exit()
 
 # --- Window Management Logic ---
 
 SIDEBAR_WIDTH = 800
-ANIMATION_STEP = 50
+SLIDE_DURATION = 0.15 # Seconds, independent of frame rate
 IS_OPEN = False
 TRAY_ICON = None
+ANIMATOR = None
+SLIDE_LOCK = threading.Lock()
 
 def get_rightmost_monitor_geometry():
-    try:
-        monitors = []
-        def _callback(hMonitor, hdcMonitor, lprcMonitor, dwData):
-            r = lprcMonitor.contents
-            monitors.append((r.left, r.top, r.right, r.bottom))
-            return 1
-
-        MonitorEnumProc = ctypes.WINFUNCTYPE(c_int, c_long, c_long, POINTER(RECT), c_long)
-        cb = MonitorEnumProc(_callback)
-        windll.user32.EnumDisplayMonitors(0, 0, cb, 0)
-        
-        if not monitors: return 1920, 1080, 0, 0
-        
-        monitors.sort(key=lambda m: m[2], reverse=True)
-        l, t, r, b = monitors[0]
-        return (r - l), (b - t), l, t
-    except:
-        return 1920, 1080, 0, 0
+    # Cached; only re-enumerated when the display layout changes (see monitors.py)
+    return get_topology().rightmost()
+
+def get_animator(window):
+    global ANIMATOR
+    with SLIDE_LOCK:
+        if ANIMATOR is None:
+            ANIMATOR = SlideAnimator(window, duration=SLIDE_DURATION)
+        return ANIMATOR
 
+def set_topmost():
+    hwnd = windll.user32.FindWindowW(None, "DesktopAI")
+    windll.user32.SetWindowPos(hwnd, -1, 0, 0, 0, 0, 3) # HWND_TOPMOST | SWP_NOMOVE | SWP_NOSIZE
+
+# slide_in/slide_out return immediately: the animation runs on the animator thread,
+# and a slide in the opposite direction takes over from the current position.
 def slide_in(window):
     global IS_OPEN
-    if IS_OPEN: return
-    
+    animator = get_animator(window)
+    with SLIDE_LOCK:
+        if IS_OPEN: return
+        IS_OPEN = True
+
     w, h, x_off, y_off = get_rightmost_monitor_geometry()
     target_x = (x_off + w) - SIDEBAR_WIDTH
     start_x = x_off + w
-    
-    # Pre-position
-    window.resize(SIDEBAR_WIDTH, h)
-    window.move(start_x, y_off)
-    window.restore() # Show it
-    
-    # Animate
-    current_x = start_x
-    while current_x > target_x:
-        current_x -= ANIMATION_STEP
-        window.move(int(current_x), y_off)
-        time.sleep(0.005) # 5ms
-    
-    window.move(int(target_x), y_off)
-    IS_OPEN = True
-    
-    # Always On Top
-    hwnd = windll.user32.FindWindowW(None, "DesktopAI")
-    windll.user32.SetWindowPos(hwnd, -1, 0, 0, 0, 0, 3) # HWND_TOPMOST | SWP_NOMOVE | SWP_NOSIZE
+
+    def prepare():
+        # Pre-position off-screen, then show it
+        window.resize(SIDEBAR_WIDTH, h)
+        window.move(start_x, y_off)
+        window.restore()
+
+    animator.slide(start_x, target_x, y_off, on_start=prepare, on_done=set_topmost)
 
 def slide_out(window):
     global IS_OPEN
-    if not IS_OPEN: return
-    
+    animator = get_animator(window)
+    with SLIDE_LOCK:
+        if not IS_OPEN: return
+        IS_OPEN = False
+
     w, h, x_off, y_off = get_rightmost_monitor_geometry()
     target_x = x_off + w
-    current_x = window.x
-    
-    while current_x < target_x:
-        current_x += ANIMATION_STEP
-        window.move(int(current_x), y_off)
-        time.sleep(0.005)
-        
-    window.hide()
-    IS_OPEN = False
+    animator.slide(window.x, target_x, y_off, on_done=window.hide)
 
 def edge_listener(window):
-    class POINT(Structure):
-        _fields_ = [("x", c_long), ("y", c_long)]
-
-    hover_start = 0
-    is_hovering = False
-    
-    leave_start = 0
-    is_leaving = False
-    
-    while True:
-        try:
-            pt = POINT()
-            windll.user32.GetCursorPos(byref(pt))
-            w, h, x_off, y_off = get_rightmost_monitor_geometry()
-            right_edge = x_off + w
-            
-            # Open Logic
-            if pt.x >= right_edge - 3:
-                if not is_hovering:
-                    is_hovering = True
-                    hover_start = time.time()
-                elif time.time() - hover_start >= 0.3:
-                    if not IS_OPEN: 
-                        # Must run on main thread preferably, but pywebview is thread safe-ish
-                        # For window moves it's fine
-                        slide_in(window)
-                    is_hovering = False
-            else:
-                is_hovering = False
-            
-            # Close Logic
-            if IS_OPEN:
-                sidebar_left = right_edge - SIDEBAR_WIDTH
-                if pt.x < sidebar_left:
-                    if not is_leaving:
-                        is_leaving = True
-                        leave_start = time.time()
-                    elif time.time() - leave_start >= 0.4:
-                        slide_out(window)
-                        is_leaving = False
-                else:
-                    is_leaving = False
-                    
-        except Exception as e:
-            print(e)
-            pass
-        time.sleep(0.1)
+    # Adaptive polling with a cached monitor layout instead of a 100 ms enumeration loop
+    watcher = EdgeWatcher(Win32PointerSource(), get_topology(),
+                          is_open=lambda: IS_OPEN,
+                          on_open=lambda: slide_in(window),
+                          on_close=lambda: slide_out(window),
+                          sidebar_width=SIDEBAR_WIDTH, open_delay=0.3, close_delay=0.4)
+    watcher.run()
 
 def setup_tray(window):
     global TRAY_ICON
@@ -235,11 +240,16 @@ def start_app():
         on_top=True
     )
     bridge.window = window
-    window.expose(bridge.process_command, bridge.get_dashboard_data, bridge.toggle_task, 
+    window.expose(bridge.process_command, bridge.submit_command, bridge.cancel_command,
+                 bridge.get_pipeline_stats, bridge.get_dashboard_data, bridge.get_dashboard_delta,
+                 bridge.toggle_task, bridge.apply_batch,
                  bridge.delete_task, bridge.quick_add_task, bridge.update_setting, 
                  bridge.quit_app, bridge.hide_window, bridge.minimize,
                  bridge.get_music_history, bridge.play_music_history_item,
-                 bridge.engine.music.delete_history_item, bridge.engine.music.clear_history)
+                 bridge.delete_history_item, bridge.clear_history,
+                 bridge.get_persistence_metrics, bridge.get_animation_stats, bridge.get_skill_report)
+    # Skills load on first use; once the page is up, preload them in the background
+    window.events.loaded += lambda: bridge.engine.warm_up()
     
     # Initialize Tray
     setup_tray(window)
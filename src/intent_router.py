@@ -0,0 +1,113 @@
+import re
+
+
+class IntentRule:
+    def __init__(self, name, handler, keywords=(), priority=0):
+        """
+        name: identifier used in benchmarks / debugging
+        handler: callable(text, lower_text) -> response string, or None to fall through
+        keywords: lowercase substrings, at least one must be present for the rule to run.
+                  A rule without keywords is evaluated for every input.
+        """
+        self.name = name
+        self.handler = handler
+        self.keywords = tuple(k.lower() for k in keywords)
+        self.priority = priority
+
+
+class IntentRouter:
+    """
+    Declarative replacement for the long if/elif cascade in AIEngine.process_input.
+
+    Every rule registers its trigger keywords once. All keywords are compiled into a
+    single alternation regex, so one scan over the input finds every rule that could
+    possibly fire; only those rules (plus the keyword-less ones) are evaluated, in
+    registration order. The scan cost depends on the input length, not on the rule count.
+    """
+
+    def __init__(self):
+        self.rules = []
+        self._always = []
+        self._keyword_rules = {}
+        self._pattern = None
+
+    def register(self, name, handler, keywords=()):
+        rule = IntentRule(name, handler, keywords, priority=len(self.rules))
+        self.rules.append(rule)
+        self._pattern = None # Rebuild lazily
+        return rule
+
+    def compile(self):
+        self._always = [r.priority for r in self.rules if not r.keywords]
+
+        keyword_rules = {}
+        for rule in self.rules:
+            for kw in rule.keywords:
+                keyword_rules.setdefault(kw, set()).add(rule.priority)
+
+        # The alternation only reports the longest keyword starting at a position, so a
+        # keyword also triggers the rules of every keyword that is a prefix of it
+        # (e.g. "lookup" would otherwise hide a rule registered on "look").
+        closure = {}
+        for kw, prios in keyword_rules.items():
+            merged = set(prios)
+            for other, other_prios in keyword_rules.items():
+                if other != kw and kw.startswith(other):
+                    merged |= other_prios
+            closure[kw] = frozenset(merged)
+        self._keyword_rules = closure
+
+        if closure:
+            alternation = "|".join(re.escape(k) for k in sorted(closure, key=len, reverse=True))
+            # Zero-width lookahead so overlapping keywords ("night light" / "light mode") are all seen
+            self._pattern = re.compile(f"(?=({alternation}))")
+        else:
+            self._pattern = re.compile(r"(?!)")
+        return self
+
+    def candidates(self, lower_text):
+        if self._pattern is None:
+            self.compile()
+        found = set(self._always)
+        for match in self._pattern.finditer(lower_text):
+            found |= self._keyword_rules[match.group(1)]
+        return sorted(found)
+
+    def classify(self, lower_text):
+        """
+        Name of the first rule whose keywords match, without running any handler.
+        Keyword-less rules are ignored; returns None if no keyword matched.
+        """
+        for priority in self.candidates(lower_text):
+            if self.rules[priority].keywords:
+                return self.rules[priority].name
+        return None
+
+    def dispatch(self, text, lower_text=None):
+        """
+        Returns (rule_name, response) for the first candidate rule that answers,
+        or (None, None) if every rule fell through.
+        """
+        if lower_text is None:
+            lower_text = text.lower()
+        for priority in self.candidates(lower_text):
+            rule = self.rules[priority]
+            response = rule.handler(text, lower_text)
+            if response is not None:
+                return rule.name, response
+        return None, None
+
+    def dispatch_linear(self, text, lower_text=None):
+        """
+        Reference implementation: evaluates every rule in order like the old cascade.
+        Kept for benchmarks and consistency tests.
+        """
+        if lower_text is None:
+            lower_text = text.lower()
+        for rule in self.rules:
+            if rule.keywords and not any(k in lower_text for k in rule.keywords):
+                continue
+            response = rule.handler(text, lower_text)
+            if response is not None:
+                return rule.name, response
+        return None, None
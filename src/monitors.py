@@ -0,0 +1,180 @@
+import ctypes
+import threading
+import time
+from ctypes import byref, sizeof, Structure, POINTER
+from ctypes.wintypes import RECT, DWORD, BOOL, HMONITOR, HDC, LPARAM
+
+try:
+    from ctypes import windll
+except ImportError:
+    windll = None
+
+# GetSystemMetrics: virtual screen bounds + monitor count change whenever the layout does
+SM_XVIRTUALSCREEN = 76
+SM_YVIRTUALSCREEN = 77
+SM_CXVIRTUALSCREEN = 78
+SM_CYVIRTUALSCREEN = 79
+SM_CMONITORS = 80
+
+class MONITORINFO(Structure):
+    _fields_ = [
+        ("cbSize", DWORD),
+        ("rcMonitor", RECT),
+        ("rcWork", RECT),
+        ("dwFlags", DWORD)
+    ]
+
+
+class MonitorSource:
+    """
+    Where monitor rectangles come from.
+    monitors(): list of (left, top, right, bottom), the expensive enumeration
+    signature(): cheap value that changes when the display layout changes
+    """
+
+    def monitors(self):
+        raise NotImplementedError
+
+    def signature(self):
+        return None
+
+
+class Win32MonitorSource(MonitorSource):
+    """
+    EnumDisplayMonitors with a single ctypes callback allocated up front.
+    work_area: report the work area (without the taskbar) instead of the full monitor.
+    """
+
+    def __init__(self, work_area=False):
+        self.work_area = work_area
+        self._found = []
+        if windll is not None:
+            MonitorEnumProc = ctypes.WINFUNCTYPE(BOOL, HMONITOR, HDC, POINTER(RECT), LPARAM)
+            self._callback = MonitorEnumProc(self._on_monitor)
+
+    def _on_monitor(self, hMonitor, hdcMonitor, lprcMonitor, dwData):
+        try:
+            if self.work_area:
+                mi = MONITORINFO()
+                mi.cbSize = sizeof(MONITORINFO)
+                if windll.user32.GetMonitorInfoW(hMonitor, byref(mi)):
+                    r = mi.rcWork
+                    self._found.append((r.left, r.top, r.right, r.bottom))
+                    return 1
+            r = lprcMonitor.contents
+            self._found.append((r.left, r.top, r.right, r.bottom))
+            return 1
+        except:
+            return 0
+
+    def monitors(self):
+        self._found = []
+        windll.user32.EnumDisplayMonitors(0, 0, self._callback, 0)
+        return list(self._found)
+
+    def signature(self):
+        metrics = windll.user32.GetSystemMetrics
+        return (metrics(SM_XVIRTUALSCREEN), metrics(SM_YVIRTUALSCREEN),
+                metrics(SM_CXVIRTUALSCREEN), metrics(SM_CYVIRTUALSCREEN), metrics(SM_CMONITORS))
+
+
+class FakeMonitorSource(MonitorSource):
+    """
+    In-memory monitor layout for tests and benchmarks off Windows.
+    """
+
+    def __init__(self, monitors=((0, 0, 1920, 1080),)):
+        self.layout = list(monitors)
+        self.enumerations = 0
+
+    def monitors(self):
+        self.enumerations += 1
+        return list(self.layout)
+
+    def signature(self):
+        return tuple(self.layout)
+
+
+class MonitorTopology:
+    """
+    Cached monitor layout shared by the window-management code.
+
+    The enumeration only runs again when the display layout changes (the source's
+    signature differs, or notify_display_change() was called, e.g. on WM_DISPLAYCHANGE)
+    or when the cached result is older than `ttl` seconds, which also picks up
+    work-area changes such as a moved taskbar.
+    """
+
+    def __init__(self, source, ttl=30.0, fallback=(1920, 1080, 0, 0), clock=time.monotonic):
+        """
+        fallback: (width, height, x, y) or a callable returning it, used when
+                  enumeration fails or finds nothing
+        """
+        self.source = source
+        self.ttl = ttl
+        self.fallback = fallback
+        self.clock = clock
+        self.hits = 0
+        self.refreshes = 0
+        self._lock = threading.Lock()
+        self._signature = None
+        self._monitors = None
+        self._refreshed_at = 0.0
+
+    def notify_display_change(self):
+        with self._lock:
+            self._monitors = None
+
+    def monitors(self):
+        """
+        Cached list of (left, top, right, bottom).
+        """
+        with self._lock:
+            signature = self.source.signature()
+            now = self.clock()
+            if (self._monitors is None or signature != self._signature
+                    or now - self._refreshed_at >= self.ttl):
+                self._monitors = self.source.monitors()
+                self._signature = signature
+                self._refreshed_at = now
+                self.refreshes += 1
+            else:
+                self.hits += 1
+            return self._monitors
+
+    def rightmost(self, fallback=None):
+        """
+        (width, height, x, y) of the monitor with the largest right edge.
+        """
+        try:
+            monitors = self.monitors()
+        except Exception:
+            monitors = None
+        if not monitors:
+            fallback = fallback or self.fallback
+            return fallback() if callable(fallback) else fallback
+        l, t, r, b = max(monitors, key=lambda m: m[2])
+        return (r - l), (b - t), l, t
+
+    def get_stats(self):
+        return {"hits": self.hits, "refreshes": self.refreshes}
+
+
+_TOPOLOGIES = {}
+_TOPOLOGIES_LOCK = threading.Lock()
+
+def get_topology(work_area=False):
+    """
+    The process-wide topology (one per flavour: full monitor or work area).
+    """
+    with _TOPOLOGIES_LOCK:
+        if work_area not in _TOPOLOGIES:
+            _TOPOLOGIES[work_area] = MonitorTopology(Win32MonitorSource(work_area=work_area))
+        return _TOPOLOGIES[work_area]
+
+def set_topology(topology, work_area=False):
+    """
+    Replaces the shared topology, e.g. with one over a FakeMonitorSource.
+    """
+    with _TOPOLOGIES_LOCK:
+        _TOPOLOGIES[work_area] = topology
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+TIMEOUT = (3.05, 10) # (connect, read) seconds, used when a call does not pass its own
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+SAMPLES = 512 # Latency samples kept per host
+
+
+class _HostStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.samples = deque(maxlen=SAMPLES)
+
+    def to_dict(self):
+        samples = sorted(self.samples)
+        pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))] if samples else 0.0
+        return {"requests": self.requests, "errors": self.errors, "retries": self.retries,
+                "p50_ms": pick(0.5), "p95_ms": pick(0.95), "max_ms": samples[-1] if samples else 0.0}
+
+
+class HttpClient:
+    """
+    One pooled requests.Session shared by the network skills.
+
+    Connections are kept alive and reused per host, at most `per_host` at a time
+    (callers beyond that wait for a free connection instead of opening more). Idempotent
+    requests are retried with exponential backoff on connection errors and 429/5xx.
+    Every call gets a default timeout and is timed per host; timed() instruments
+    libraries that bring their own HTTP stack (e.g. ddgs).
+    """
+
+    def __init__(self, timeout=TIMEOUT, retries=2, backoff=0.3, per_host=4, max_hosts=16, user_agent=USER_AGENT):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        retry = Retry(total=retries, connect=retries, read=retries, status=retries, backoff_factor=backoff,
+                      status_forcelist=RETRY_STATUSES, allowed_methods=("GET", "HEAD", "OPTIONS"),
+                      raise_on_status=False)
+        self.adapter = HTTPAdapter(pool_connections=max_hosts, pool_maxsize=per_host, pool_block=True, max_retries=retry)
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self._lock = threading.Lock()
+        self._hosts = {}
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        with self.timed(urlsplit(url).netloc) as record:
+            response = self.session.request(method, url, **kwargs)
+            retries = getattr(response.raw, "retries", None)
+            record["retries"] = len(retries.history) if retries is not None else 0
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    @contextmanager
+    def timed(self, host):
+        """
+        Records the duration (and failure) of the block under `host`.
+        """
+        record = {"retries": 0}
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield record
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                stats = self._hosts.get(host)
+                if stats is None:
+                    stats = self._hosts[host] = _HostStats()
+                stats.requests += 1
+                stats.errors += failed
+                stats.retries += record["retries"]
+                stats.samples.append(elapsed)
+
+    def connections_opened(self):
+        """
+        Connections opened so far across all pooled hosts (fewer than requests = reuse).
+        """
+        pools = self.adapter.poolmanager.pools
+        return sum(getattr(pools.get(key), "num_connections", 0) for key in pools.keys())
+
+    def get_stats(self):
+        with self._lock:
+            hosts = {host: stats.to_dict() for host, stats in self._hosts.items()}
+        return {
+            "requests": sum(h["requests"] for h in hosts.values()),
+            "errors": sum(h["errors"] for h in hosts.values()),
+            "connections": self.connections_opened(),
+            "hosts": hosts,
+        }
+
+    def close(self):
+        self.session.close()
+
+
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+def default_client():
+    """
+    Process-wide HttpClient, created on first use.
+    """
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = HttpClient()
+        return _DEFAULT
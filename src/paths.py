@@ -0,0 +1,13 @@
+import os
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def data_dir():
+    """
+    Folder for runtime data and caches: DESKTOPAI_DATA_DIR if set (tests and benchmarks
+    point it at a temporary folder), else the app folder itself.
+    """
+    return os.environ.get("DESKTOPAI_DATA_DIR") or APP_DIR
+
+def data_path(name):
+    return os.path.join(data_dir(), name)
@@ -0,0 +1,315 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+RETRY_DELAY = 1.0 # First retry after a failed write; doubles per failure up to RETRY_MAX
+RETRY_MAX = 60.0
+
+class _Store:
+    def __init__(self, path, get_data, lock, on_written):
+        self.path = path
+        self.get_data = get_data
+        self.lock = lock or threading.RLock()
+        self.on_written = on_written
+        self.write_lock = threading.Lock() # One writer per file (background thread vs flush)
+        self.first_dirty = None
+        self.last_dirty = None
+        self.failures = 0 # Consecutive failed writes
+        self.retry_at = None # No background attempt before this after a failure
+
+
+class PersistenceService:
+    """
+    Shared background writer for the JSON files (productivity snapshot, music history).
+
+    Stores are registered once with a callback returning their data. Mutations only
+    mark a store dirty; a single background thread waits until the store has been quiet
+    for `debounce` seconds (or dirty for `max_delay` seconds), then serializes it under
+    the store's lock and writes compact JSON to a temp file that is renamed over the
+    target. A burst of mutations therefore costs one write, off the caller's thread.
+    A failed write (serialization or I/O) leaves the store dirty and is retried with
+    exponential backoff instead of on every pass.
+    """
+
+    def __init__(self, debounce=0.5, max_delay=5.0):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._stores = {}
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+        self.metrics = {
+            "mutations": 0,
+            "writes": 0,
+            "writes_avoided": 0,
+            "write_errors": 0,
+            "bytes_written": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    def register(self, name, path, get_data, lock=None, on_written=None):
+        """
+        get_data: returns the JSON-serializable payload; called with `lock` held
+        on_written: optional callback(bytes_written) run after the file is in place
+        """
+        with self._cond:
+            self._stores[name] = _Store(path, get_data, lock, on_written)
+
+    def unregister(self, name):
+        self.flush(name)
+        with self._cond:
+            self._stores.pop(name, None)
+
+    def mark_dirty(self, name):
+        with self._cond:
+            store = self._stores[name]
+            now = time.monotonic()
+            if store.first_dirty is None:
+                store.first_dirty = now
+            store.last_dirty = now
+            self.metrics["mutations"] += 1
+            self._ensure_thread()
+            self._cond.notify()
+
+    def record_append(self, nbytes):
+        # Mutations persisted by a store's own small append (e.g. the productivity journal)
+        with self._cond:
+            self.metrics["mutations"] += 1
+            self.metrics["bytes_written"] += nbytes
+            self._update_avoided()
+
+    def flush(self, name=None):
+        """
+        Synchronously writes dirty stores (all of them, or just `name`).
+        """
+        with self._cond:
+            names = [name] if name is not None else list(self._stores)
+            stores = [(n, self._stores[n]) for n in names if n in self._stores]
+        for n, store in stores:
+            if store.first_dirty is not None:
+                self._write(n, store)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self.flush()
+
+    def get_metrics(self):
+        with self._cond:
+            metrics = dict(self.metrics)
+        metrics["avg_flush_ms"] = metrics["total_flush_ms"] / metrics["writes"] if metrics["writes"] else 0.0
+        return metrics
+
+    def _update_avoided(self):
+        self.metrics["writes_avoided"] = max(0, self.metrics["mutations"] - self.metrics["writes"])
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped = False
+            self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                now = time.monotonic()
+                due = []
+                wait = None
+                for name, store in self._stores.items():
+                    if store.first_dirty is None:
+                        continue
+                    deadline = min(store.last_dirty + self.debounce, store.first_dirty + self.max_delay)
+                    if store.retry_at is not None:
+                        deadline = max(deadline, store.retry_at)
+                    if deadline <= now:
+                        due.append((name, store))
+                    else:
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                if not due:
+                    self._cond.wait(wait)
+                    continue
+            for name, store in due:
+                try:
+                    self._write(name, store)
+                except Exception as e:
+                    print(f"Error saving {store.path}: {e}")
+
+    def _write(self, name, store):
+        with store.write_lock:
+            start = time.perf_counter()
+            with store.lock:
+                with self._cond:
+                    if store.first_dirty is None:
+                        return # Someone else already wrote it
+                    dirty_since = store.first_dirty
+                    store.first_dirty = None
+                    store.last_dirty = None
+                try:
+                    text = json.dumps(store.get_data(), separators=(",", ":"))
+                except Exception:
+                    self._write_failed(store, dirty_since)
+                    raise
+
+            tmp_path = store.path + ".tmp"
+            try:
+                with open(tmp_path, "w") as f:
+                    f.write(text)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, store.path)
+            except Exception:
+                # Missing folder, disk full, file locked: keep the change for a later attempt
+                self._write_failed(store, dirty_since)
+                raise
+            with self._cond:
+                store.failures = 0
+                store.retry_at = None
+            if store.on_written:
+                store.on_written(len(text))
+
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._cond:
+                self.metrics["writes"] += 1
+                self.metrics["bytes_written"] += len(text)
+                self.metrics["last_flush_ms"] = elapsed
+                self.metrics["max_flush_ms"] = max(self.metrics["max_flush_ms"], elapsed)
+                self.metrics["total_flush_ms"] += elapsed
+                self._update_avoided()
+
+    def _write_failed(self, store, dirty_since):
+        with self._cond:
+            # Mutations marked since the attempt started keep their (later) timestamps
+            store.first_dirty = dirty_since if store.first_dirty is None else min(store.first_dirty, dirty_since)
+            store.last_dirty = store.last_dirty or dirty_since
+            store.failures += 1
+            store.retry_at = time.monotonic() + min(RETRY_MAX, RETRY_DELAY * 2 ** (store.failures - 1))
+            self.metrics["write_errors"] += 1
+
+
+class SnapshotJournal:
+    """
+    File half of the snapshot + append-only journal scheme.
+
+    Mutations are appended as JSON lines to <path>.journal; the snapshot at <path> is
+    written by a PersistenceService. When the journal outgrows the snapshot it is rotated
+    to <path>.journal.old and the owner asks the service for a new snapshot; the old
+    journal is deleted only once a snapshot serialized after that rotation is on disk.
+    Owners read the snapshot with read_snapshot() and apply replay() on top of it.
+    """
+
+    def __init__(self, path, compact_min_bytes=64 * 1024):
+        self.path = path
+        self.journal_file = path + ".journal"
+        self.old_journal_file = self.journal_file + ".old"
+        self.compact_min_bytes = compact_min_bytes
+        self.bytes_written = 0
+        self.rotations = 0
+        self.compaction_pending = False
+        self._journal = None
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+    def read_snapshot(self, default):
+        """
+        Parsed snapshot, or default() if it is missing or unreadable.
+        """
+        if os.path.exists(self.journal_file):
+            self._journal_bytes = os.path.getsize(self.journal_file)
+        # A crash before the last snapshot finished leaves the old journal behind
+        self.compaction_pending = os.path.exists(self.old_journal_file)
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    data = json.load(f)
+                self._snapshot_bytes = os.path.getsize(self.path)
+                return data
+            except Exception:
+                pass
+        return default()
+
+    def replay(self):
+        """
+        Journal records newer than the snapshot, oldest first.
+        """
+        for path in (self.old_journal_file, self.journal_file):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Torn write from a crash: everything before it is still valid
+                        break
+                    yield record
+
+    def append(self, record):
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'a')
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self._journal.write(line)
+        self._journal.flush()
+        self._journal_bytes += len(line)
+        self.bytes_written += len(line)
+        return len(line)
+
+    def needs_compaction(self):
+        # Geometric policy keeps the amortized cost per mutation O(1)
+        return not self.compaction_pending and self._journal_bytes > max(self.compact_min_bytes, self._snapshot_bytes)
+
+    def rotate(self):
+        """
+        Moves the current journal aside; the next snapshot must cover it.
+        """
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_file):
+            if os.path.exists(self.old_journal_file):
+                # Previous snapshot still pending: keep everything in one old journal
+                with open(self.journal_file, 'r') as src, open(self.old_journal_file, 'a') as dst:
+                    dst.write(src.read())
+                os.remove(self.journal_file)
+            else:
+                os.replace(self.journal_file, self.old_journal_file)
+        self._journal_bytes = 0
+        self.rotations += 1
+        self.compaction_pending = True
+
+    def snapshot_written(self, covered_rotations, nbytes):
+        """
+        Called once a snapshot serialized after `covered_rotations` rotations is on disk.
+        """
+        self._snapshot_bytes = nbytes
+        self.bytes_written += nbytes
+        if covered_rotations == self.rotations:
+            if os.path.exists(self.old_journal_file):
+                os.remove(self.old_journal_file)
+            self.compaction_pending = False
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+
+_DEFAULT = None
+_DEFAULT_LOCK = threading.Lock()
+
+def default_service():
+    """
+    The process-wide service shared by ProductivityManager and MusicSkill.
+    """
+    global _DEFAULT
+    with _DEFAULT_LOCK:
+        if _DEFAULT is None:
+            _DEFAULT = PersistenceService()
+            atexit.register(_DEFAULT.flush)
+        return _DEFAULT
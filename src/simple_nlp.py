@@ -1,9 +1,18 @@
 import re
+import json
 import math
 from collections import Counter
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many postings a plain dict accumulation beats the NumPy call overhead
+NUMPY_MIN_POSTINGS = 2048
+
 class SimpleIntentClassifier:
-    def __init__(self):
+    def __init__(self, use_numpy=True):
         # Define intents and their training phrases
         self.intents = {
             "system.shutdown": [
@@ -31,8 +40,18 @@ class SimpleIntentClassifier:
                 "check weather", "how is the weather", "weather report", "is it raining"
             ]
         }
+        self.use_numpy = use_numpy and np is not None
+        self.vocabulary = set()
+        self._build_vocabulary()
+        self._compile()
+
+    def rebuild(self):
+        """
+        Recompiles the model. Call after editing self.intents directly.
+        """
         self.vocabulary = set()
         self._build_vocabulary()
+        self._compile()
 
     def _build_vocabulary(self):
         for phrases in self.intents.values():
@@ -66,22 +85,200 @@ class SimpleIntentClassifier:
             return 0.0
         return numerator / denominator
 
-    def predict(self, text):
-        input_vec = self._get_vector(text)
-        best_intent = None
-        max_score = 0.0
-        
-        # Compare against all training phrases (Nearest Neighbor)
+    def _compile(self):
+        """
+        Vectorizes every training phrase once (instead of on every predict call).
+        Phrases keep raw term counts plus a precomputed norm, and the cosine division is
+        done last, so scores are bit-identical to the original dict arithmetic.
+
+        The term matrix is stored column-major, i.e. as an inverted index
+        (term -> phrases containing it), so a prediction only touches the phrases
+        that share at least one token with the input.
+        """
+        self._term_index = {term: i for i, term in enumerate(sorted(self.vocabulary))}
+        self._intent_words = {}
+        self._phrase_intents = []
+        self._phrase_vectors = []
+        self._phrase_norms = []
+        self._postings = {} # term -> [(phrase index, count)], phrase indices ascending
+
         for intent, phrases in self.intents.items():
             for phrase in phrases:
-                phrase_vec = self._get_vector(phrase)
-                score = self._cosine_similarity(input_vec, phrase_vec)
-                if score > max_score:
-                    max_score = score
-                    best_intent = intent
-        
+                vec = self._get_vector(phrase)
+                idx = len(self._phrase_intents)
+                self._phrase_intents.append(intent)
+                self._phrase_vectors.append(vec)
+                self._phrase_norms.append(math.sqrt(sum(c**2 for c in vec.values())))
+                for word, count in vec.items():
+                    self._postings.setdefault(word, []).append((idx, count))
+
+        self._matrix = None
+        if self.use_numpy:
+            # CSC layout: column t spans col_rows/col_data[col_ptr[t]:col_ptr[t+1]]
+            col_ptr = [0]
+            col_rows = []
+            col_data = []
+            for term in sorted(self._term_index, key=self._term_index.get):
+                for idx, count in self._postings.get(term, ()):
+                    col_rows.append(idx)
+                    col_data.append(count)
+                col_ptr.append(len(col_rows))
+
+            norms = np.array(self._phrase_norms, dtype=np.float64)
+            norms[norms == 0] = np.inf # Empty phrases always score 0
+            self._matrix = {
+                "col_ptr": np.array(col_ptr, dtype=np.int64),
+                "col_rows": np.array(col_rows, dtype=np.int64),
+                "col_data": np.array(col_data, dtype=np.float64),
+                "norms": norms,
+            }
+
+    def words_of(self, intents):
+        """
+        Vocabulary of the given intents' phrases. An input sharing no word with it can
+        never be classified as one of them, so callers can skip predict() cheaply.
+        """
+        key = frozenset(intents)
+        words = self._intent_words.get(key)
+        if words is None:
+            words = frozenset(word for intent in key for phrase in self.intents.get(intent, ())
+                              for word in self._tokenize(phrase))
+            self._intent_words[key] = words
+        return words
+
+    def load_intents(self, path, replace=False):
+        """
+        Loads training phrases from a JSON file of the form {"intent": ["phrase", ...]}
+        and recompiles the model.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        if replace:
+            self.intents = {}
+        for intent, phrases in loaded.items():
+            self.intents.setdefault(intent, []).extend(phrases)
+        self.rebuild()
+
+    def _query(self, text):
+        # Returns (term counts restricted to vocabulary, input norm)
+        vec = self._get_vector(text)
+        return vec, math.sqrt(sum(c**2 for c in vec.values()))
+
+    def _candidates(self, text):
+        """
+        Returns (phrase indices, scores) for every phrase sharing a token with text,
+        ordered by phrase index.
+        """
+        vec, norm = self._query(text)
+        if not vec:
+            return [], []
+
+        # NumPy only pays off once the query touches a lot of postings
+        touched = sum(len(self._postings[w]) for w in vec)
+        if self._matrix is not None and touched > NUMPY_MIN_POSTINGS:
+            m = self._matrix
+            col_ptr = m["col_ptr"]
+            terms = np.array([self._term_index[w] for w in vec], dtype=np.int64)
+            counts = np.array(list(vec.values()), dtype=np.float64)
+            lengths = col_ptr[terms + 1] - col_ptr[terms]
+            offsets = np.arange(touched) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            positions = np.repeat(col_ptr[terms], lengths) + offsets
+            rows, inverse = np.unique(m["col_rows"][positions], return_inverse=True)
+            dots = np.bincount(inverse, weights=np.repeat(counts, lengths) * m["col_data"][positions])
+            return rows, dots / (norm * m["norms"][rows])
+
+        dots = {}
+        for word, count in vec.items():
+            for idx, phrase_count in self._postings[word]:
+                dots[idx] = dots.get(idx, 0) + count * phrase_count
+        rows = sorted(dots)
+        return rows, [dots[idx] / (norm * self._phrase_norms[idx]) for idx in rows]
+
+    def predict(self, text):
+        rows, scores = self._candidates(text)
+        if not len(rows):
+            return None, 0.0
+
+        # Nearest neighbour: first phrase with the highest score wins (same as the original loop)
+        if np is not None and isinstance(scores, np.ndarray):
+            best = int(np.argmax(scores))
+        else:
+            best = max(range(len(scores)), key=scores.__getitem__)
+        max_score = float(scores[best])
+
         # Threshold to avoid random matches
         if max_score < 0.3:
             return None, 0.0
-            
-        return best_intent, max_score
+
+        return self._phrase_intents[int(rows[best])], max_score
+
+    def predict_topk(self, text, k=3):
+        """
+        Returns up to k (intent, score) pairs, best first, one entry per intent.
+        Unlike predict, no confidence threshold is applied.
+        """
+        rows, scores = self._candidates(text)
+        best_per_intent = {}
+        for idx, score in zip(rows, scores):
+            intent = self._phrase_intents[int(idx)]
+            if intent not in best_per_intent or score > best_per_intent[intent]:
+                best_per_intent[intent] = float(score)
+        # Ties keep the intent whose phrase came first
+        ranked = sorted(best_per_intent.items(), key=lambda item: -item[1])
+        return ranked[:k]
+
+    def _best(self, scores):
+        # Same selection as predict, over a dense row of scores
+        best = int(np.argmax(scores))
+        max_score = float(scores[best])
+        if max_score < 0.3:
+            return None, 0.0
+        return self._phrase_intents[best], max_score
+
+    def predict_many(self, texts):
+        """
+        Batch version of predict for offline evaluation. Returns a list of (intent, score).
+        """
+        texts = list(texts)
+        if self._matrix is None:
+            return [self.predict(t) for t in texts]
+
+        m = self._matrix
+        n_phrases = len(self._phrase_intents)
+        results = [(None, 0.0)] * len(texts)
+        if not n_phrases:
+            return results
+
+        # Sparse x sparse product: each query term pulls in its column of the term matrix
+        queries = [self._query(t) for t in texts]
+        col_ptr, col_rows, col_data = m["col_ptr"], m["col_rows"], m["col_data"]
+        # Keep the dense (batch x phrases) score block around a few million floats
+        chunk = max(1, 4_000_000 // n_phrases)
+
+        for begin in range(0, len(texts), chunk):
+            batch = queries[begin:begin + chunk]
+            q_rows, q_terms, q_counts = [], [], []
+            q_norms = np.ones(len(batch), dtype=np.float64)
+            for row, (vec, norm) in enumerate(batch):
+                for word, count in vec.items():
+                    q_rows.append(row)
+                    q_terms.append(self._term_index[word])
+                    q_counts.append(count)
+                if norm:
+                    q_norms[row] = norm
+
+            q_terms = np.array(q_terms, dtype=np.int64)
+            lengths = col_ptr[q_terms + 1] - col_ptr[q_terms]
+            total = int(lengths.sum())
+            # Flattened positions of every (query term, phrase) pair
+            offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+            positions = np.repeat(col_ptr[q_terms], lengths) + offsets
+            flat = np.repeat(np.array(q_rows, dtype=np.int64), lengths) * n_phrases + col_rows[positions]
+            weights = np.repeat(np.array(q_counts, dtype=np.float64), lengths) * col_data[positions]
+            dots = np.bincount(flat, weights=weights, minlength=len(batch) * n_phrases).reshape(len(batch), n_phrases)
+            scores = dots / (q_norms[:, None] * m["norms"])
+
+            for row, (vec, _) in enumerate(batch):
+                if vec:
+                    results[begin + row] = self._best(scores[row])
+        return results
@@ -0,0 +1,127 @@
+import importlib
+import threading
+import time
+
+
+class SkillUnavailable(Exception):
+    """
+    A skill could not be loaded, usually because an optional dependency is missing.
+    """
+
+    def __init__(self, name, error):
+        super().__init__(f"{name}: {error}")
+        self.name = name
+        self.error = error
+
+
+class SkillRegistry:
+    """
+    Skills by name, imported and built on first use.
+
+    register() only records where a skill lives. The first get() imports its module and,
+    if a factory was given, builds the skill object from it; later calls return the same
+    object. A skill whose import or construction fails (typically a missing optional
+    dependency such as pycaw on a non-Windows machine) is remembered as unavailable and
+    raises SkillUnavailable, without affecting any other skill. Each skill loads under its
+    own lock, so a slow import only holds up callers of that skill; the registry lock
+    guards the dicts alone. warm_up() loads skills ahead of time, by default on a
+    background thread.
+    """
+
+    def __init__(self, package=None):
+        """
+        package: anchor for relative module names (e.g. __package__ of the caller)
+        """
+        self.package = package
+        self._specs = {} # name -> (module name, factory or None)
+        self._skills = {}
+        self._errors = {}
+        self._locks = {} # name -> RLock held while that skill is imported and built
+        self._lock = threading.Lock()
+        self.timings = {} # name -> ms spent importing and building
+
+    def register(self, name, module, factory=None):
+        """
+        factory: callable(module) -> skill object; without one the module itself is the skill
+        """
+        self._specs[name] = (module, factory)
+
+    def provide(self, name, skill):
+        """
+        Installs a ready-made skill (tests and benchmarks use stand-ins this way).
+        """
+        with self._lock:
+            self._skills[name] = skill
+            self._errors.pop(name, None)
+
+    def get(self, name):
+        skill = self._skills.get(name)
+        if skill is not None:
+            return skill
+        with self._skill_lock(name):
+            with self._lock:
+                if name in self._skills:
+                    return self._skills[name]
+                if name in self._errors:
+                    raise SkillUnavailable(name, self._errors[name])
+                module_name, factory = self._specs[name]
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(module_name, self.package)
+                skill = factory(module) if factory else module
+            except Exception as e:
+                with self._lock:
+                    self._errors[name] = e
+                print(f"Skill '{name}' unavailable: {e}")
+                raise SkillUnavailable(name, e) from e
+            finally:
+                with self._lock:
+                    self.timings[name] = (time.perf_counter() - start) * 1000
+            with self._lock:
+                return self._skills.setdefault(name, skill) # A provide() meanwhile wins
+
+    def _skill_lock(self, name):
+        # Reentrant: a factory may get() other skills, or its own module may import lazily
+        with self._lock:
+            lock = self._locks.get(name)
+            if lock is None:
+                lock = self._locks[name] = threading.RLock()
+            return lock
+
+    def is_loaded(self, name):
+        return name in self._skills
+
+    def warm_up(self, names=None, background=True):
+        """
+        Loads the given skills (default: all, in registration order) so their first use
+        is fast. Returns the background thread, or None when run inline.
+        """
+        names = list(self._specs if names is None else names)
+
+        def run():
+            for name in names:
+                try:
+                    self.get(name)
+                except SkillUnavailable:
+                    pass
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="skill-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def report(self):
+        """
+        One row per registered skill: module, whether it is loaded, the milliseconds its
+        import and construction took, and the error if it is unavailable.
+        """
+        with self._lock:
+            rows = []
+            for name, (module_name, _) in self._specs.items():
+                error = self._errors.get(name)
+                rows.append({"name": name, "module": module_name, "loaded": name in self._skills,
+                             "ms": round(self.timings.get(name, 0.0), 1),
+                             "error": str(error) if error else None})
+            return rows
@@ -0,0 +1,166 @@
+import heapq
+import operator
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from itertools import islice
+from ..persistence import SnapshotJournal, default_service
+
+HISTORY_CAPACITY = 10000
+_PLAY_ORDER = operator.itemgetter("plays", "timestamp")
+
+def _copy(entry):
+    return dict(entry)
+
+
+class MusicHistory:
+    """
+    Bounded play history with an id index.
+
+    Entries live in one OrderedDict keyed by id, least recently played first. That
+    doubles as the fixed-capacity ring (the oldest entry is evicted from the front) and as
+    the id index, so recording a play - dedupe, bump play count and last-played time, move
+    to front - is O(1) however long the history grows. Each play is one line appended to
+    music_history.json.journal; the snapshot (music_history.json, newest first, the same
+    list shape as before plus "plays") is rewritten in the background only when the
+    journal outgrows it.
+    """
+
+    def __init__(self, path, capacity=HISTORY_CAPACITY, persistence=None, clock=datetime.now):
+        self.path = path
+        self.capacity = capacity
+        self.clock = clock
+        self.lock = threading.RLock()
+        self.journal = SnapshotJournal(path)
+        self.entries = OrderedDict() # id -> entry, oldest play first
+        self._covered_rotations = 0
+
+        snapshot = self.journal.read_snapshot(list)
+        # Snapshot is newest first; older files may repeat an id further down
+        for entry in reversed(snapshot if isinstance(snapshot, list) else []):
+            if isinstance(entry, dict) and "id" in entry:
+                self._apply_play(entry.get("type"), entry["id"], entry.get("title"),
+                                 entry.get("timestamp", ""), entry.get("plays", 1))
+        for record in self.journal.replay():
+            self._apply(record)
+
+        self.persistence = persistence or default_service()
+        self._name = os.path.abspath(path)
+        self.persistence.register(self._name, path, self._snapshot_for_writer,
+                                  lock=self.lock, on_written=self._snapshot_written)
+        if self.journal.compaction_pending:
+            self.persistence.mark_dirty(self._name)
+
+    # --- Persistence ---
+    def _snapshot_for_writer(self):
+        # Runs on the persistence thread with self.lock held
+        self._covered_rotations = self.journal.rotations
+        return self.recent()
+
+    def _snapshot_written(self, nbytes):
+        with self.lock:
+            self.journal.snapshot_written(self._covered_rotations, nbytes)
+
+    def _commit(self, record):
+        self.persistence.record_append(self.journal.append(record))
+        if self.journal.needs_compaction():
+            self.journal.rotate()
+            self.persistence.mark_dirty(self._name)
+
+    def _apply(self, record):
+        op = record.get("op")
+        if op == "play":
+            self._apply_play(record["type"], record["id"], record["title"], record["timestamp"],
+                             total=record["plays"])
+        elif op == "delete":
+            self.entries.pop(record["id"], None)
+        elif op == "clear":
+            self.entries.clear()
+
+    def _apply_play(self, type, id, title, timestamp, plays=1, total=None):
+        entry = self.entries.get(id)
+        if entry is None:
+            entry = self.entries[id] = {"type": type, "id": id, "title": title, "timestamp": timestamp, "plays": 0}
+        else:
+            self.entries.move_to_end(id)
+            if title:
+                entry["title"] = title
+            entry["timestamp"] = max(entry["timestamp"], timestamp)
+        # Journal records carry the resulting count, so replaying one the snapshot
+        # already covers changes nothing
+        entry["plays"] = total if total is not None else entry["plays"] + plays
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return entry
+
+    # --- API ---
+    def record_play(self, type, id, title):
+        """
+        Moves `id` to the front (adding it if new) and counts the play.
+        """
+        with self.lock:
+            entry = self._apply_play(type, id, title, self.clock().isoformat())
+            record = {"op": "play", "type": type, "id": id, "title": entry["title"],
+                      "timestamp": entry["timestamp"], "plays": entry["plays"]}
+            self._commit(record)
+            return _copy(entry)
+
+    def get(self, index):
+        """
+        Entry at 1-based position `index`, most recent first (None if out of range).
+        """
+        with self.lock:
+            if not 1 <= index <= len(self.entries):
+                return None
+            entry = next(islice(reversed(self.entries.values()), index - 1, None))
+            return _copy(entry)
+
+    def delete(self, index):
+        with self.lock:
+            entry = self.get(index)
+            if entry is None:
+                return None
+            record = {"op": "delete", "id": entry["id"]}
+            self._apply(record)
+            self._commit(record)
+            return entry
+
+    def clear(self):
+        with self.lock:
+            record = {"op": "clear"}
+            self._apply(record)
+            self._commit(record)
+
+    def recent(self, limit=None):
+        """
+        Most recently played first.
+        """
+        with self.lock:
+            return [_copy(e) for e in islice(reversed(self.entries.values()), limit)]
+
+    def most_played(self, limit=10):
+        """
+        Highest play counts first; ties go to the more recently played entry.
+        """
+        with self.lock:
+            # Newest first: ties on plays then rarely displace the heap top
+            top = heapq.nlargest(limit, reversed(self.entries.values()), key=_PLAY_ORDER)
+            return [_copy(e) for e in top]
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def flush(self):
+        """
+        Compacts the journal into a fresh snapshot right away.
+        """
+        with self.lock:
+            self.journal.rotate()
+            self.persistence.mark_dirty(self._name)
+        self.persistence.flush(self._name)
+
+    def close(self):
+        self.persistence.unregister(self._name)
+        self.journal.close()
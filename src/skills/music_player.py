@@ -1,63 +1,49 @@
-import yt_dlp
 import webbrowser
 import re
 import urllib.parse
-import threading
-import json
 import os
-from datetime import datetime
-import requests
-from bs4 import BeautifulSoup
+from .. import paths
+from ..persistence import default_service
+from .music_history import MusicHistory
+from .spotify_meta import SpotifyMetadataCache
+from .youtube_resolver import YDL_OPTS, YoutubeResolver
+from .music_queue import MusicQueue, FAILED
+
+LOOP_WAIT = 15 # Seconds m!loop waits for tracks that are still resolving
 
 class MusicSkill:
-    def __init__(self):
-        self.queue = [] # List of tuples (type, id/url, title)
+    def __init__(self, persistence=None, resolver=None, data_dir=None):
+        """
+        data_dir: folder for the history and metadata files (default: the app's data folder)
+        """
         self.mode = "Spotify" # Default mode
-        self.ydl_opts = {
-            'quiet': True,
-            'format': 'bestaudio/best',
-            'noplaylist': True,
-            'extract_flat': True,
-        }
+        self.ydl_opts = dict(YDL_OPTS)
         # Use absolute path for history file to avoid CWD issues
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        self.history_file = os.path.join(base_dir, "music_history.json")
-        self.history = self._load_history()
-
-    def _load_history(self):
-        if os.path.exists(self.history_file):
-            try:
-                with open(self.history_file, "r") as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading history: {e}")
-                return []
-        return []
-
-    def _save_history(self):
-        try:
-            with open(self.history_file, "w") as f:
-                json.dump(self.history, f, indent=4)
-        except Exception as e:
-            print(f"Error saving history: {e}")
+        self.data_dir = data_dir or paths.data_dir()
+        self.history_file = os.path.join(self.data_dir, "music_history.json")
+        self.persistence = persistence or default_service()
+        # Ring-buffered, indexed by id, persisted as an append-only journal
+        self.history = MusicHistory(self.history_file, persistence=self.persistence)
+        self.spotify_meta = SpotifyMetadataCache(os.path.join(self.data_dir, "spotify_metadata.json"),
+                                                 persistence=self.persistence)
+        self.spotify_meta.seed(self.history.recent())
+        # Pooled yt-dlp extractors plus a persistent query -> (id, title) cache
+        self.resolver = resolver or YoutubeResolver(self.ydl_opts, persistence=self.persistence,
+                                                    cache_file=os.path.join(self.data_dir, "youtube_cache.json"))
+        self.queue = MusicQueue(self.resolver) # Entries resolve in the background
 
     def _add_to_history(self, type, id, title):
-        # Check if already at the top to avoid immediate duplicates
-        if self.history and self.history[0].get('id') == id:
-             return
-        
-        entry = {
-            "type": type,
-            "id": id,
-            "title": title,
-            "timestamp": datetime.now().isoformat()
-        }
-        self.history.insert(0, entry)
-        self.history = self.history[:50] # Limit to 50 items
-        self._save_history()
-
-    def get_history(self):
-        return self.history
+        # Dedupes by id: a replay moves the entry to the top and counts the play
+        self.history.record_play(type, id, title)
+
+    def get_history(self, limit=None):
+        return self.history.recent(limit)
+
+    def get_most_played(self, limit=10):
+        return self.history.most_played(limit)
+
+    def get_history_item(self, index):
+        return self.history.get(index)
 
     def set_mode(self, mode):
         if mode in ["Spotify", "YouTube"]:
@@ -69,25 +55,7 @@ class MusicSkill:
         """
         Returns (id, title) for a query or link using yt-dlp.
         """
-        try:
-            # If it's not a link, make it a search query
-            if not query.startswith("http"):
-                query = f"ytsearch1:{query}"
-            
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                info = ydl.extract_info(query, download=False)
-                
-                if 'entries' in info:
-                    if len(info['entries']) > 0:
-                        video = info['entries'][0]
-                        return video['id'], video['title']
-                else:
-                    return info['id'], info['title']
-                    
-        except Exception as e:
-            print(f"Error extracting video info: {e}")
-            return None, None
-        return None, None
+        return self.resolver.resolve(query)
 
     def _clean_spotify_query(self, query):
         return re.sub(r'on spotify', '', query, flags=re.IGNORECASE).replace("spotify", "").strip()
@@ -98,45 +66,8 @@ class MusicSkill:
         """
         # Always handle direct links appropriately regardless of mode
         if "open.spotify.com" in query:
-             title = "Spotify Link"
-             
-             # Attempt to fetch metadata
-             try:
-                 headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-                 response = requests.get(query, headers=headers, timeout=3)
-                 if response.status_code == 200:
-                     soup = BeautifulSoup(response.text, 'html.parser')
-                     
-                     # Try OpenGraph title first (usually cleanest)
-                     og_title = soup.find("meta", property="og:title")
-                     og_desc = soup.find("meta", property="og:description")
-                     
-                     if og_title:
-                         content = og_title.get("content", "")
-                         # Basic cleanup if needed
-                         title = content
-                         
-                         # If it's a song, og:title is usually just the song name
-                         # og:description usually contains the artist: "Artist · Song · 202X"
-                         if og_desc:
-                             desc = og_desc.get("content", "")
-                             # simple heuristic: if description starts with something that isn't the song name
-                             parts = desc.split(" · ")
-                             if len(parts) > 0:
-                                 artist = parts[0]
-                                 title = f"{title} - {artist}"
-                     else:
-                         # Fallback to page title
-                         web_title = soup.title.string if soup.title else ""
-                         if web_title:
-                             title = web_title.replace(" | Spotify", "")
-             except Exception as e:
-                 print(f"Error fetching Spotify metadata: {e}")
-                 # Fallback to simple regex parsing if request fails
-                 match = re.search(r'open\.spotify\.com/(track|album|playlist)/([a-zA-Z0-9]+)', query)
-                 if match:
-                     type_ = match.group(1).capitalize()
-                     title = f"Spotify {type_}"
+             # Cached by normalized link; a miss reads only the page <head>
+             title = self.spotify_meta.get_title(query)
                  
              self._add_to_history("spotify", query, title)
              webbrowser.open(query)
@@ -179,44 +110,71 @@ class MusicSkill:
         if self.mode == "Spotify":
              return "⚠️ Queueing (`m!add`) is not supported in Spotify mode. Switch to YouTube mode for queue features."
         
-        # YouTube Mode
-        vid_id, title = self._get_video_info(query)
-        if vid_id:
-            self.queue.append(('youtube', vid_id, title))
-            return f"Added to queue: {title}"
-        return f"Could not find music for: {query}"
-
-    def start_loop(self):
+        # YouTube Mode: queued right away, yt-dlp resolves it in the background
+        entry = self.queue.add(query)
+        return self._describe_entry(entry)
+
+    def add_many_to_queue(self, queries):
+        """
+        Queues several tracks at once ("m!add a; b; c"); they resolve in parallel.
+        """
+        if self.mode == "Spotify":
+             return "⚠️ Queueing (`m!add`) is not supported in Spotify mode. Switch to YouTube mode for queue features."
+
+        return "\n".join(self._describe_entry(self.queue.add(query)) for query in queries)
+
+    def _describe_entry(self, entry):
+        if entry.status == FAILED:
+            return f"Could not find music for: {entry.query}"
+        if entry.id:
+            return f"Added to queue: {entry.title}"
+        return f"Added to queue: {entry.query} (looking it up...)"
+
+    def start_loop(self, timeout=LOOP_WAIT):
         if self.mode == "Spotify":
              return "⚠️ Looping (`m!loop`) is not supported in Spotify mode."
              
-        if not self.queue:
+        if not len(self.queue):
             return "The music queue is empty. Add songs with 'm!add <name>'."
         
-        # Filter for YouTube items
-        yt_ids = [item[1] for item in self.queue if item[0] == 'youtube']
+        # Only waits if some entries are still being looked up
+        self.queue.wait(timeout)
+        # Lookups that found nothing are reported here, once, and leave the queue
+        lines = [self._describe_entry(entry) for entry in self.queue.take_failed()]
+        yt_ids = [entry.id for entry in self.queue.ready('youtube')]
                 
         if not yt_ids:
-            return "No YouTube songs in queue to loop."
+            lines.append("No YouTube songs in queue to loop.")
+            return "\n".join(lines)
             
         id_str = ",".join(yt_ids)
         url = f"https://www.youtube.com/watch_videos?video_ids={id_str}"
         
         webbrowser.open(url)
-        return f"Starting loop of {len(yt_ids)} songs on YouTube."
+        skipped = self.queue.pending_count()
+        note = f" ({skipped} still resolving, skipped)" if skipped else ""
+        lines.append(f"Starting loop of {len(yt_ids)} songs on YouTube.{note}")
+        return "\n".join(lines)
 
     def format_history(self):
-        if not self.history:
+        recent = self.history.recent(10) # Top 10
+        if not recent:
             return "History is empty."
         
         lines = ["**Music History:**"]
-        for i, item in enumerate(self.history[:10], 1): # Top 10
+        for i, item in enumerate(recent, 1):
             lines.append(f"{i}. {item.get('title', 'Unknown')} ({item.get('type')})")
+
+        favourites = [item for item in self.history.most_played(5) if item["plays"] > 1]
+        if favourites:
+            lines.append("**Most Played:**")
+            for item in favourites:
+                lines.append(f"- {item.get('title', 'Unknown')} ({item.get('type')}) · {item['plays']} plays")
         return "\n".join(lines)
 
     def play_from_history(self, index):
-        if 1 <= index <= len(self.history):
-            item = self.history[index - 1]
+        item = self.history.get(index)
+        if item:
             if item['type'] == 'youtube':
                 # If ID looks like a URL (legacy fallback), open it directly
                 if item['id'].startswith("http"):
@@ -225,7 +183,7 @@ class MusicSkill:
                     url = f"https://www.youtube.com/watch?v={item['id']}"
                     webbrowser.open(url)
                 
-                # Re-add to top of history (update timestamp)
+                # Moves it to the top of history (no duplicate further down)
                 self._add_to_history(item['type'], item['id'], item['title'])
                 return f"Playing from history: {item.get('title')}"
                 
@@ -237,18 +195,15 @@ class MusicSkill:
         return f"Invalid history index. Use 1-{len(self.history)}."
     
     def delete_history_item(self, index):
-        if 1 <= index <= len(self.history):
-            removed = self.history.pop(index - 1)
-            self._save_history()
+        removed = self.history.delete(index)
+        if removed:
             return f"Removed '{removed.get('title')}' from history."
         return "Invalid index."
 
     def clear_history(self):
-        self.history = []
-        self._save_history()
+        self.history.clear()
         return "Music history cleared."
 
     def clear_queue(self):
-        count = len(self.queue)
-        self.queue = []
+        count = self.queue.clear()
         return f"Queue cleared ({count} items removed)."
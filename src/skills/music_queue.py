@@ -0,0 +1,142 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .youtube_resolver import cache_key
+
+PENDING, READY, FAILED = "pending", "ready", "failed"
+
+
+class QueueEntry:
+    def __init__(self, entry_id, query, type="youtube", id=None, title=None, status=PENDING):
+        self.entry_id = entry_id
+        self.query = query
+        self.type = type
+        self.id = id
+        self.title = title or query # Placeholder until resolved
+        self.status = status
+
+    def to_dict(self):
+        return {"entry_id": self.entry_id, "query": self.query, "type": self.type,
+                "id": self.id, "title": self.title, "status": self.status}
+
+
+class MusicQueue:
+    """
+    Play queue whose entries are resolved in the background.
+
+    add() appends a placeholder and returns at once; a small worker pool resolves the
+    query (through the resolver's cache) and fills in id and title, or marks the entry
+    failed if nothing was found; failed entries stay until take_failed() or clear(). Identical queries still pending share a single resolution.
+    wait() blocks only while entries are in flight.
+    """
+
+    def __init__(self, resolver, workers=3):
+        """
+        resolver: object with resolve(query) -> (id, title) and cached(query) -> (id, title) or None
+        """
+        self.resolver = resolver
+        self.entries = []
+        self._ids = itertools.count(1)
+        self._pending = {} # cache key -> entries waiting on that resolution
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="queue-resolve")
+        self.stats = {"added": 0, "resolutions": 0, "deduped": 0, "failed": 0}
+
+    def add(self, query):
+        """
+        Queues a query and returns its entry (possibly still pending).
+        """
+        query = query.strip()
+        key = cache_key(query)
+        cached = self.resolver.cached(query)
+        with self._cond:
+            entry = QueueEntry(next(self._ids), query)
+            self.entries.append(entry)
+            self.stats["added"] += 1
+            if cached:
+                entry.id, entry.title = cached
+                entry.status = READY
+                return entry
+            waiting = self._pending.get(key)
+            if waiting is not None:
+                waiting.append(entry)
+                self.stats["deduped"] += 1
+                return entry
+            self._pending[key] = [entry]
+            self.stats["resolutions"] += 1
+        self._executor.submit(self._resolve, key, query)
+        return entry
+
+    def _resolve(self, key, query):
+        try:
+            vid_id, title = self.resolver.resolve(query)
+        except Exception as e:
+            print(f"Error resolving queued track: {e}")
+            vid_id, title = None, None
+        with self._cond:
+            waiting = self._pending.pop(key, [])
+            for entry in waiting:
+                if vid_id:
+                    entry.id, entry.title, entry.status = vid_id, title, READY
+                else:
+                    entry.status = FAILED
+                    self.stats["failed"] += 1
+            self._cond.notify_all()
+
+    def pending_count(self):
+        with self._cond:
+            return sum(1 for e in self.entries if e.status == PENDING)
+
+    def wait(self, timeout=None):
+        """
+        Blocks until no entry is pending. Returns False if the timeout ran out first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while any(e.status == PENDING for e in self.entries):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def ready(self, type="youtube"):
+        with self._cond:
+            return [e for e in self.entries if e.status == READY and e.type == type]
+
+    def take_failed(self):
+        """
+        Removes the entries whose lookup found nothing and returns them, so they get reported once.
+        """
+        with self._cond:
+            failed = [e for e in self.entries if e.status == FAILED]
+            if failed:
+                self.entries = [e for e in self.entries if e.status != FAILED]
+            return failed
+
+    def items(self):
+        with self._cond:
+            return [e.to_dict() for e in self.entries]
+
+    def clear(self):
+        """
+        Empties the queue; resolutions still in flight finish but are dropped.
+        """
+        with self._cond:
+            count = len(self.entries)
+            self.entries = []
+            self._pending = {}
+            self._cond.notify_all()
+            return count
+
+    def __len__(self):
+        with self._cond:
+            return len(self.entries)
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats["pending"] = sum(1 for e in self.entries if e.status == PENDING)
+            stats["size"] = len(self.entries)
+        return stats
@@ -0,0 +1,16 @@
+def notify(title, message, timeout=10):
+    """
+    Shows a desktop notification through plyer (printed instead when plyer is missing).
+    """
+    # Imported on first use: the reminder engine loads with the UI, plyer need not
+    try:
+        from plyer import notification
+    except ImportError:
+        print(f"{title}: {message}")
+        return
+    notification.notify(
+        title=title,
+        message=message,
+        app_name='DesktopAI',
+        timeout=timeout
+    )
@@ -1,28 +1,127 @@
-import json
 import os
+import threading
+from collections import deque
 from datetime import datetime
+from .productivity_store import JsonTaskStorage, SqliteTaskStorage, migrate_json_to_sqlite
+from .reminders import parse_time
+
+# Fields a batch "update" operation may change
+TASK_FIELDS = ("title", "date", "time", "end_time", "reminder", "category", "completed")
+
+def check_task_fields(fields):
+    """
+    Raises ValueError unless every known field in `fields` has a storable value:
+    date "YYYY-MM-DD", time/end_time None or a time parse_time understands,
+    reminder/completed booleans, title/category strings.
+    """
+    for key, value in fields.items():
+        if key == "date":
+            try:
+                datetime.strptime(value, "%Y-%m-%d")
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid date: {value!r} (expected YYYY-MM-DD)")
+        elif key in ("time", "end_time"):
+            if value is not None and (not isinstance(value, str) or parse_time(value) is None):
+                raise ValueError(f"Invalid {key}: {value!r}")
+        elif key in ("reminder", "completed"):
+            if not isinstance(value, bool):
+                raise ValueError(f"{key} must be true or false, got {value!r}")
+        elif key in ("title", "category"):
+            if not isinstance(value, str):
+                raise ValueError(f"{key} must be a string, got {value!r}")
+
+# How many (revision, task id) change records are kept for dashboard deltas.
+# Clients further behind than that get a full payload instead.
+CHANGE_LOG_SIZE = 4096
 
 class ProductivityManager:
-    def __init__(self, data_file="productivity_data.json"):
+    def __init__(self, data_file="productivity_data.json", backend="json", persistence=None):
+        """
+        backend: "json" (in-memory + journal file), "sqlite", or a storage object
+                 implementing the same methods as JsonTaskStorage.
+        persistence: PersistenceService writing the JSON snapshot (default: shared service)
+        """
         self.data_file = data_file
-        self.data = self._load_data()
+        self.persistence = persistence
+        self.storage = self._create_storage(backend)
+        self._last_id = self.storage.max_id()
 
-    def _load_data(self):
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    data = json.load(f)
-                    # Ensure schema
-                    if "tasks" not in data: data["tasks"] = []
-                    if "scratchpad" not in data: data["scratchpad"] = ""
-                    return data
-            except:
-                return {"tasks": [], "scratchpad": ""}
-        return {"tasks": [], "scratchpad": ""}
+        # Change feed: every mutation bumps the revision and records the task ids it touched
+        self._lock = threading.RLock()
+        self.revision = 0
+        self._changes = deque(maxlen=CHANGE_LOG_SIZE)
+        self._truncated_revision = 0 # Changes up to this revision may have been dropped
+        self._listeners = [] # callback(task_id, task or None) after every change
+
+    def _create_storage(self, backend):
+        if backend == "json":
+            return JsonTaskStorage(self.data_file, persistence=self.persistence)
+        if backend == "sqlite":
+            if self.data_file.endswith(".db"):
+                db_file = self.data_file
+            else:
+                db_file = os.path.splitext(self.data_file)[0] + ".db"
+                # First start on SQLite: bring the existing JSON data over once
+                has_json = os.path.exists(self.data_file) or os.path.exists(self.data_file + ".journal")
+                if not os.path.exists(db_file) and has_json:
+                    migrate_json_to_sqlite(self.data_file, db_file)
+            return SqliteTaskStorage(db_file)
+        return backend
 
     def save_data(self):
-        with open(self.data_file, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        # Regular mutations are persisted as they happen; this forces a full checkpoint
+        self.storage.flush()
+
+    def _record_changes(self, task_ids):
+        # Caller holds self._lock
+        self.revision += 1
+        for task_id in task_ids:
+            if len(self._changes) == self._changes.maxlen:
+                self._truncated_revision = self._changes[0][0]
+            self._changes.append((self.revision, task_id))
+        if self._listeners:
+            for task_id in task_ids:
+                task = self.storage.get_task(task_id)
+                for callback in self._listeners:
+                    try:
+                        callback(task_id, task)
+                    except Exception as e:
+                        print(f"Task listener failed: {e}")
+
+    def add_listener(self, callback):
+        """
+        Calls callback(task_id, task) after every change to a task (task is None once it
+        is deleted). Returns all current tasks, taken under the same lock, so the caller
+        can build its own view without missing or double-counting a change.
+        """
+        with self._lock:
+            self._listeners.append(callback)
+            return self.get_all_tasks()
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def changed_since(self, revision):
+        """
+        Ids of tasks touched after `revision`, or None if the change log no longer
+        reaches back that far (or the revision is from another session).
+        """
+        with self._lock:
+            if revision is None or revision < self._truncated_revision or revision > self.revision:
+                return None
+            ids = {}
+            for rev, task_id in reversed(self._changes):
+                if rev <= revision:
+                    break
+                ids[task_id] = True
+            return list(ids)
+
+    def _next_id(self):
+        # Millisecond timestamps collide when tasks are added in bursts, keep ids unique
+        self._last_id = max(int(datetime.now().timestamp() * 1000), self._last_id + 1)
+        return self._last_id
 
     def add_task(self, title, date_str, time_str=None, end_time=None, reminder=False, category="Other"):
         """
@@ -31,49 +130,181 @@ class ProductivityManager:
         end_time: HH:MM (End Time)
         reminder: boolean
         """
-        task = {
-            "id": int(datetime.now().timestamp() * 1000),
-            "title": title,
-            "date": date_str,
-            "time": time_str,
-            "end_time": end_time,
-            "reminder": reminder,
-            "category": category,
-            "completed": False
-        }
-        self.data["tasks"].append(task)
-        self.save_data()
-        return task
+        with self._lock:
+            task = {
+                "id": self._next_id(),
+                "title": title,
+                "date": date_str,
+                "time": time_str,
+                "end_time": end_time,
+                "reminder": reminder,
+                "category": category,
+                "completed": False
+            }
+            task = self.storage.add_task(task)
+            self._record_changes([task["id"]])
+            return task
 
     def toggle_task(self, task_id):
-        for task in self.data["tasks"]:
-            if task["id"] == task_id:
-                task["completed"] = not task["completed"]
-                self.save_data()
-                return task
-        return None
+        with self._lock:
+            task = self.storage.get_task(task_id)
+            if task is None:
+                return None
+            task = self.storage.update_task(task_id, {"completed": not task["completed"]})
+            self._record_changes([task_id])
+            return task
 
     def delete_task(self, task_id):
-        self.data["tasks"] = [t for t in self.data["tasks"] if t["id"] != task_id]
-        self.save_data()
+        with self._lock:
+            self.storage.delete_task(task_id)
+            self._record_changes([task_id])
+
+    def apply_batch(self, operations):
+        """
+        operations: list of dicts, each one of
+            {"op": "add", "title": ..., "date": ..., optional "time", "end_time", "reminder", "category"}
+            {"op": "toggle", "id": ...}
+            {"op": "update", "id": ..., "fields": {...}}
+            {"op": "delete", "id": ...}
+        Every operation is validated before anything is written: an operation that is not a
+        dict, an unknown op or task id, "fields" that is not a dict or a field value of the
+        wrong type or format (see check_task_fields) raises ValueError and leaves the data
+        untouched. The batch is then persisted as one unit.
+        Returns the resulting task (None for deletes) per operation.
+        """
+        if not isinstance(operations, (list, tuple)):
+            raise ValueError(f"Operations must be a list, got {type(operations).__name__}")
+        with self._lock:
+            records = []
+            results = []
+            state = {} # id -> task as it will look after the operations seen so far (None = deleted)
+
+            def current(task_id):
+                try:
+                    hash(task_id)
+                except TypeError:
+                    raise ValueError(f"Invalid task id: {task_id!r}")
+                if task_id in state:
+                    task = state[task_id]
+                else:
+                    task = self.storage.get_task(task_id)
+                if task is None:
+                    raise ValueError(f"Task {task_id} not found")
+                return task
+
+            for op in operations:
+                if not isinstance(op, dict):
+                    raise ValueError(f"Operation must be an object, got {type(op).__name__}")
+                kind = op.get("op")
+                if kind == "add":
+                    if not op.get("title"):
+                        raise ValueError("Task title is required")
+                    # A missing date means today; reminder is coerced to a bool below
+                    check_task_fields({k: op[k] for k in ("title", "date", "time", "end_time", "category")
+                                       if op.get(k) is not None})
+                    task = {
+                        "id": self._next_id(),
+                        "title": op["title"],
+                        "date": op.get("date") or datetime.now().strftime("%Y-%m-%d"),
+                        "time": op.get("time"),
+                        "end_time": op.get("end_time"),
+                        "reminder": bool(op.get("reminder", False)),
+                        "category": op.get("category", "Other"),
+                        "completed": False
+                    }
+                    state[task["id"]] = dict(task)
+                    records.append({"op": "add", "task": task})
+                    results.append(state[task["id"]])
+                elif kind == "toggle":
+                    task = current(op.get("id"))
+                    fields = {"completed": not task["completed"]}
+                    state[op["id"]] = dict(task, **fields)
+                    records.append({"op": "update", "id": op["id"], "fields": fields})
+                    results.append(state[op["id"]])
+                elif kind == "update":
+                    task = current(op.get("id"))
+                    fields = op.get("fields") or {}
+                    if not isinstance(fields, dict):
+                        raise ValueError(f"Update fields must be an object, got {type(fields).__name__}")
+                    fields = {k: v for k, v in fields.items() if k in TASK_FIELDS}
+                    check_task_fields(fields)
+                    state[op["id"]] = dict(task, **fields)
+                    records.append({"op": "update", "id": op["id"], "fields": fields})
+                    results.append(state[op["id"]])
+                elif kind == "delete":
+                    current(op.get("id"))
+                    state[op["id"]] = None
+                    records.append({"op": "delete", "id": op["id"]})
+                    results.append(None)
+                else:
+                    raise ValueError(f"Unknown operation: {kind}")
+
+            if records:
+                self.storage.apply_batch(records)
+                self._record_changes([r["task"]["id"] if r["op"] == "add" else r["id"] for r in records])
+            return results
 
     def get_tasks_for_date(self, date_str):
-        return [t for t in self.data["tasks"] if t["date"] == date_str]
+        return self.storage.tasks_for_date(date_str)
 
     def get_all_tasks(self):
-        return self.data["tasks"]
+        return self.storage.all_tasks()
 
     def get_upcoming_tasks(self, limit=10):
         # Get tasks from tomorrow onwards
         today = datetime.now().strftime("%Y-%m-%d")
-        all_tasks = self.data["tasks"]
-        future = [t for t in all_tasks if t["date"] > today and not t["completed"]]
-        future.sort(key=lambda x: x["date"])
-        return future[:limit]
+        return self.storage.upcoming_tasks(today, limit)
+
+    def get_dashboard_data(self, date_str=None, upcoming_limit=10):
+        """
+        Payload for the web dashboard: the tasks of one day plus upcoming tasks.
+        """
+        if not date_str:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+        with self._lock:
+            return {
+                "view_date": date_str,
+                "revision": self.revision,
+                "tasks": self.get_tasks_for_date(date_str),
+                "upcoming": self.get_upcoming_tasks(upcoming_limit)
+            }
+
+    def get_dashboard_delta(self, since_revision, date_str=None, upcoming_limit=10):
+        """
+        What changed in the dashboard of `date_str` since `since_revision`:
+        "upserted" tasks (new or modified, on that day) and "removed" ids (deleted or
+        moved to another day). "upcoming" is short and depends on every pending task,
+        so it is always sent whole. Falls back to the full payload ("full": True) when
+        the change log cannot answer.
+        """
+        if not date_str:
+            date_str = datetime.now().strftime("%Y-%m-%d")
+        with self._lock:
+            changed = self.changed_since(since_revision)
+            if changed is None:
+                return dict(self.get_dashboard_data(date_str, upcoming_limit), full=True)
+            upserted = []
+            removed = []
+            for task_id in changed:
+                task = self.storage.get_task(task_id)
+                if task is not None and task["date"] == date_str:
+                    upserted.append(task)
+                else:
+                    removed.append(task_id)
+            return {
+                "view_date": date_str,
+                "revision": self.revision,
+                "full": False,
+                "upserted": upserted,
+                "removed": removed,
+                "upcoming": self.get_upcoming_tasks(upcoming_limit)
+            }
 
     def get_scratchpad(self):
-        return self.data.get("scratchpad", "")
+        return self.storage.get_scratchpad()
 
     def save_scratchpad(self, content):
-        self.data["scratchpad"] = content
-        self.save_data()
+        self.storage.set_scratchpad(content)
+
+    def close(self):
+        self.storage.close()
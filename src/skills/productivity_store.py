@@ -0,0 +1,428 @@
+import bisect
+import os
+import sqlite3
+import threading
+from ..persistence import SnapshotJournal, default_service
+
+def empty_data():
+    return {"tasks": [], "scratchpad": ""}
+
+def apply_record(tasks, data, record):
+    """
+    Applies one journal record. `tasks` is an id -> task dict (insertion ordered)
+    so replay stays O(1) per record.
+    Records are absolute (no "flip" operations) so replaying a journal twice
+    yields the same state, which keeps recovery safe if we crash mid-compaction.
+    """
+    op = record.get("op")
+    if op == "add":
+        tasks[record["task"]["id"]] = record["task"]
+    elif op == "update":
+        if record["id"] in tasks:
+            tasks[record["id"]].update(record["fields"])
+    elif op == "delete":
+        tasks.pop(record["id"], None)
+    elif op == "scratchpad":
+        data["scratchpad"] = record["content"]
+    elif op == "batch":
+        for sub in record["records"]:
+            apply_record(tasks, data, sub)
+
+
+class JsonJournalStore(SnapshotJournal):
+    """
+    Snapshot + write-ahead journal storage for ProductivityManager.
+
+    The snapshot is the regular productivity_data.json. Every mutation is appended as a
+    single JSON line to <data_file>.journal, so a change costs one small append instead
+    of rewriting every task. Once the journal outgrows the snapshot it is rotated to
+    <data_file>.journal.old and a new snapshot is requested from the persistence service,
+    which writes it atomically in the background; the old journal is deleted only after
+    a snapshot covering it is on disk. Loading reads the snapshot and replays both journals.
+    """
+
+    def __init__(self, data_file, compact_min_bytes=64 * 1024):
+        super().__init__(data_file, compact_min_bytes)
+        self.data_file = data_file
+
+    def load(self):
+        data = self.read_snapshot(empty_data)
+        # Ensure schema
+        if not isinstance(data, dict):
+            data = empty_data()
+        if "tasks" not in data: data["tasks"] = []
+        if "scratchpad" not in data: data["scratchpad"] = ""
+
+        tasks = None
+        for record in self.replay():
+            if tasks is None:
+                tasks = {t["id"]: t for t in data["tasks"]}
+            apply_record(tasks, data, record)
+        if tasks is not None:
+            data["tasks"] = list(tasks.values())
+        return data
+
+
+class JsonTaskStorage:
+    """
+    Default backend: all tasks in memory, persisted through JsonJournalStore.
+
+    Tasks are indexed incrementally so reads don't scan the whole list:
+      - id -> task (insertion ordered, doubles as the task list)
+      - date -> {id: task} for the day view
+      - date -> sorted [(seq, id)] of incomplete tasks, plus a sorted list of those dates,
+        so get_upcoming_tasks walks forward from "today" and stops after `limit` tasks.
+    seq is the insertion order, which keeps results identical to the old list scans.
+    """
+
+    def __init__(self, data_file, persistence=None):
+        self.data_file = data_file
+        self.journal = JsonJournalStore(data_file)
+        # Guards the indexes against the persistence thread serializing a snapshot
+        self.lock = threading.RLock()
+        self.persistence = persistence or default_service()
+        self._name = os.path.abspath(data_file)
+        self._covered_rotations = 0
+        data = self.journal.load()
+        self.scratchpad = data["scratchpad"]
+        self._tasks = {}
+        self._seq = {}
+        self._next_seq = 0
+        self._by_date = {}
+        self._pending = {}
+        self._pending_dates = []
+
+        max_id = max((t["id"] for t in data["tasks"] if isinstance(t.get("id"), int)), default=0)
+        reassigned = False
+        for task in data["tasks"]:
+            if task.get("id") in self._tasks:
+                # Old files could contain colliding millisecond ids; give the duplicate a fresh one
+                max_id += 1
+                task["id"] = max_id
+                reassigned = True
+            self._insert(task)
+
+        self.persistence.register(self._name, data_file, self._snapshot_for_writer,
+                                  lock=self.lock, on_written=self._snapshot_written)
+        if reassigned:
+            # The new ids only exist in memory: a journal replayed onto the old snapshot would
+            # merge the duplicates again, so snapshot them now and retire the current journal
+            with self.lock:
+                self.journal.rotate()
+            self.persistence.mark_dirty(self._name)
+            try:
+                self.persistence.flush(self._name)
+            except Exception as e:
+                print(f"Error saving {data_file}: {e}") # Still dirty: the writer retries
+        elif self.journal.compaction_pending:
+            self.persistence.mark_dirty(self._name)
+
+    def _snapshot(self):
+        return {"tasks": list(self._tasks.values()), "scratchpad": self.scratchpad}
+
+    def _snapshot_for_writer(self):
+        # Runs on the persistence thread with self.lock held
+        self._covered_rotations = self.journal.rotations
+        return self._snapshot()
+
+    def _snapshot_written(self, nbytes):
+        with self.lock:
+            self.journal.snapshot_written(self._covered_rotations, nbytes)
+
+    def _commit(self, record):
+        self.persistence.record_append(self.journal.append(record))
+        if self.journal.needs_compaction():
+            self.journal.rotate()
+            self.persistence.mark_dirty(self._name)
+
+    # --- Index maintenance ---
+    def _insert(self, task):
+        task_id = task["id"]
+        self._tasks[task_id] = task
+        self._seq[task_id] = self._next_seq
+        self._next_seq += 1
+        self._index(task)
+
+    def _index(self, task):
+        task_id = task["id"]
+        seq = self._seq[task_id]
+        bucket = self._by_date.setdefault(task.get("date"), {})
+        out_of_order = bool(bucket) and seq < self._seq[next(reversed(bucket))]
+        bucket[task_id] = task
+        if out_of_order:
+            # Only happens when a task moves to another date: restore insertion order
+            ordered = sorted(bucket.values(), key=lambda t: self._seq[t["id"]])
+            bucket.clear()
+            bucket.update((t["id"], t) for t in ordered)
+
+        if not task.get("completed"):
+            date = task.get("date")
+            pending = self._pending.get(date)
+            if pending is None:
+                pending = self._pending[date] = []
+                bisect.insort(self._pending_dates, date)
+            bisect.insort(pending, (seq, task_id))
+
+    def _unindex(self, task):
+        task_id = task["id"]
+        date = task.get("date")
+        bucket = self._by_date.get(date)
+        if bucket is not None:
+            bucket.pop(task_id, None)
+            if not bucket:
+                del self._by_date[date]
+
+        pending = self._pending.get(date)
+        if pending is not None:
+            entry = (self._seq[task_id], task_id)
+            i = bisect.bisect_left(pending, entry)
+            if i < len(pending) and pending[i] == entry:
+                del pending[i]
+            if not pending:
+                del self._pending[date]
+                del self._pending_dates[bisect.bisect_left(self._pending_dates, date)]
+
+    # --- Storage API ---
+    def max_id(self):
+        with self.lock:
+            return max((i for i in self._tasks if isinstance(i, int)), default=0)
+
+    def _apply(self, record):
+        # Index maintenance for one add/update/delete record, without journaling
+        op = record["op"]
+        if op == "add":
+            task = record["task"]
+            existing = self._tasks.get(task["id"])
+            if existing is not None:
+                self._unindex(existing)
+                self._tasks[task["id"]] = task
+                self._index(task)
+            else:
+                self._insert(task)
+            return task
+        if op == "update":
+            task = self._tasks.get(record["id"])
+            if task is not None:
+                self._unindex(task)
+                task.update(record["fields"])
+                self._index(task)
+            return task
+        if op == "delete":
+            task = self._tasks.pop(record["id"], None)
+            if task is not None:
+                self._unindex(task)
+                del self._seq[record["id"]]
+            return None
+        raise ValueError(f"Unknown operation: {op}")
+
+    def add_task(self, task):
+        with self.lock:
+            record = {"op": "add", "task": task}
+            self._apply(record)
+            self._commit(record)
+            return task
+
+    def get_task(self, task_id):
+        with self.lock:
+            return self._tasks.get(task_id)
+
+    def update_task(self, task_id, fields):
+        with self.lock:
+            if task_id not in self._tasks:
+                return None
+            record = {"op": "update", "id": task_id, "fields": fields}
+            task = self._apply(record)
+            self._commit(record)
+            return task
+
+    def delete_task(self, task_id):
+        with self.lock:
+            record = {"op": "delete", "id": task_id}
+            self._apply(record)
+            self._commit(record)
+
+    def apply_batch(self, records):
+        """
+        Applies add/update/delete records as one journal line, so a crash keeps
+        either the whole batch or none of it.
+        """
+        with self.lock:
+            for record in records:
+                self._apply(record)
+            self._commit({"op": "batch", "records": records})
+
+    def tasks_for_date(self, date_str):
+        with self.lock:
+            return list(self._by_date.get(date_str, {}).values())
+
+    def all_tasks(self):
+        with self.lock:
+            return list(self._tasks.values())
+
+    def upcoming_tasks(self, after_date, limit):
+        result = []
+        with self.lock:
+            dates = self._pending_dates
+            for i in range(bisect.bisect_right(dates, after_date), len(dates)):
+                for _, task_id in self._pending[dates[i]]:
+                    if len(result) >= limit:
+                        return result
+                    result.append(self._tasks[task_id])
+        return result
+
+    def get_scratchpad(self):
+        return self.scratchpad
+
+    def set_scratchpad(self, content):
+        with self.lock:
+            self.scratchpad = content
+            self._commit({"op": "scratchpad", "content": content})
+
+    def flush(self):
+        # Full snapshot right now (e.g. before quitting)
+        with self.lock:
+            self.journal.rotate()
+            self.persistence.mark_dirty(self._name)
+        self.persistence.flush(self._name)
+
+    def close(self):
+        self.persistence.unregister(self._name)
+        self.journal.close()
+
+
+TASK_COLUMNS = ["id", "title", "date", "time", "end_time", "reminder", "category", "completed"]
+INSERT_TASK_SQL = f"INSERT OR REPLACE INTO tasks ({', '.join(TASK_COLUMNS)}) VALUES ({', '.join('?' * len(TASK_COLUMNS))})"
+
+class SqliteTaskStorage:
+    """
+    SQLite backend. Lookups go through indexes instead of scanning every task:
+    (date) for the day view, (completed, date) for upcoming tasks, and the id primary key.
+    """
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        # The webview bridge and the Tk worker threads call in from different threads
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT,
+                    date TEXT,
+                    time TEXT,
+                    end_time TEXT,
+                    reminder INTEGER NOT NULL DEFAULT 0,
+                    category TEXT,
+                    completed INTEGER NOT NULL DEFAULT 0
+                )""")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_date ON tasks(date)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_completed_date ON tasks(completed, date)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+    def _task_values(self, task):
+        return [int(bool(task.get(c))) if c in ("reminder", "completed") else task.get(c) for c in TASK_COLUMNS]
+
+    def _row_to_task(self, row):
+        task = dict(row)
+        task["reminder"] = bool(task["reminder"])
+        task["completed"] = bool(task["completed"])
+        return task
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return [self._row_to_task(r) for r in self._conn.execute(sql, params)]
+
+    def max_id(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM tasks").fetchone()[0]
+
+    def add_task(self, task):
+        with self._lock, self._conn:
+            self._conn.execute(INSERT_TASK_SQL, self._task_values(task))
+        return task
+
+    def get_task(self, task_id):
+        rows = self._query("SELECT * FROM tasks WHERE id = ?", (task_id,))
+        return rows[0] if rows else None
+
+    def update_task(self, task_id, fields):
+        sql, values = self._update_sql(fields)
+        if values:
+            with self._lock, self._conn:
+                self._conn.execute(sql, values + [task_id])
+        return self.get_task(task_id)
+
+    def delete_task(self, task_id):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def _update_sql(self, fields):
+        fields = {k: v for k, v in fields.items() if k in TASK_COLUMNS and k != "id"}
+        values = [int(bool(v)) if k in ("reminder", "completed") else v for k, v in fields.items()]
+        return f"UPDATE tasks SET {', '.join(f'{k} = ?' for k in fields)} WHERE id = ?", values
+
+    def apply_batch(self, records):
+        """
+        Applies add/update/delete records in a single transaction.
+        """
+        with self._lock, self._conn:
+            for record in records:
+                if record["op"] == "add":
+                    self._conn.execute(INSERT_TASK_SQL, self._task_values(record["task"]))
+                elif record["op"] == "update":
+                    sql, values = self._update_sql(record["fields"])
+                    if values:
+                        self._conn.execute(sql, values + [record["id"]])
+                elif record["op"] == "delete":
+                    self._conn.execute("DELETE FROM tasks WHERE id = ?", (record["id"],))
+                else:
+                    raise ValueError(f"Unknown operation: {record['op']}")
+
+    def tasks_for_date(self, date_str):
+        return self._query("SELECT * FROM tasks WHERE date = ? ORDER BY id", (date_str,))
+
+    def all_tasks(self):
+        return self._query("SELECT * FROM tasks ORDER BY id")
+
+    def upcoming_tasks(self, after_date, limit):
+        return self._query("SELECT * FROM tasks WHERE completed = 0 AND date > ? ORDER BY date, id LIMIT ?",
+                           (after_date, limit))
+
+    def get_scratchpad(self):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'scratchpad'").fetchone()
+        return row[0] if row else ""
+
+    def set_scratchpad(self, content):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('scratchpad', ?)", (content,))
+
+    def import_data(self, data):
+        with self._lock, self._conn:
+            self._conn.executemany(INSERT_TASK_SQL, [self._task_values(t) for t in data.get("tasks", [])])
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('scratchpad', ?)",
+                               (data.get("scratchpad", ""),))
+
+    def flush(self):
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def migrate_json_to_sqlite(json_file, db_file):
+    """
+    One-shot migration of productivity_data.json (snapshot + journal) into SQLite.
+    The JSON files are left untouched. Returns the number of migrated tasks.
+    """
+    data = JsonJournalStore(json_file).load()
+    storage = SqliteTaskStorage(db_file)
+    storage.import_data(data)
+    storage.close()
+    return len(data["tasks"])
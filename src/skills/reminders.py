@@ -0,0 +1,199 @@
+import heapq
+import re
+import threading
+from datetime import date, datetime, time, timedelta
+from .notify import notify
+
+DEFAULT_TIME = "09:00" # Tasks without a start time are reminded about in the morning
+REMINDER_LEAD = timedelta(minutes=10)
+MAX_SLEEP = 60.0 # Re-check at least this often: the wall clock can jump (suspend, DST)
+GROUP_LIMIT = 3 # More reminders due at once than this become one summary notification
+
+# Times as the engine captures them ("2pm", "9", "2:30pm") or as the UI stores them ("14:30")
+TIME_RE = re.compile(r'^\s*(\d{1,2})(?::(\d{2}))?(?::(\d{2}))?\s*(?:([ap])\.?m\.?)?\s*$', re.IGNORECASE)
+AFTERNOON_HOURS = range(1, 8) # "at 3" without am/pm means 15:00; "at 9" stays 09:00
+
+def parse_time(value):
+    """
+    datetime.time for "HH:MM[:SS]", a bare hour ("9") or an am/pm time ("2pm",
+    "2:30 PM", "12am"); None if it is none of those. As in "lecture at 3", a bare 1-7
+    without am/pm is read as afternoon; zero-padded times ("03:00", as the UI stores
+    them) are 24-hour.
+    """
+    match = TIME_RE.match(value)
+    if not match:
+        return None
+    hour, minute, second = int(match.group(1)), int(match.group(2) or 0), int(match.group(3) or 0)
+    meridiem = (match.group(4) or "").lower()
+    if meridiem:
+        if not 1 <= hour <= 12:
+            return None
+        hour = hour % 12 + (12 if meridiem == "p" else 0)
+    elif hour in AFTERNOON_HOURS and not match.group(1).startswith("0"):
+        hour += 12
+    if hour > 23 or minute > 59 or second > 59:
+        return None
+    return time(hour, minute, second)
+
+def reminder_times(task, lead=REMINDER_LEAD):
+    """
+    (remind_at, starts_at) for a pending task with reminder set, else None.
+    """
+    if not task.get("reminder") or task.get("completed") or not task.get("date"):
+        return None
+    try:
+        day = date.fromisoformat(task["date"]) # YYYY-MM-DD
+    except ValueError:
+        return None
+    at = parse_time(task.get("time") or DEFAULT_TIME)
+    if at is None:
+        return None
+    start = datetime.combine(day, at)
+    return start - lead, start
+
+
+class ReminderEngine:
+    """
+    Fires notifications for tasks created with reminder=True.
+
+    Upcoming reminders sit in a min-heap of (remind_at, task id), built once from the
+    manager's tasks and then kept current from its change notifications: an add, toggle,
+    update or delete only touches that task's entry. Superseded heap entries are skipped
+    when they surface. One thread sleeps until the earliest reminder (at most `max_sleep`)
+    and is only woken early when a change brings the earliest reminder forward.
+    """
+
+    def __init__(self, manager, notifier=None, clock=datetime.now, lead=REMINDER_LEAD,
+                 max_sleep=MAX_SLEEP, group_limit=GROUP_LIMIT):
+        """
+        notifier: callable(message); defaults to a desktop notification via plyer
+        """
+        self.manager = manager
+        self.notifier = notifier or self._notify_user
+        self.clock = clock
+        self.lead = lead
+        self.max_sleep = max_sleep
+        self.group_limit = group_limit
+        self._cond = threading.Condition()
+        self._heap = [] # (remind_at, task id)
+        self._pending = {} # task id -> (remind_at, starts_at, title)
+        self._stale = 0 # Heap entries no longer matching _pending
+        self._stopped = False
+        self.stats = {"fired": 0, "notifications": 0, "wakeups": 0, "updates": 0}
+
+        tasks = manager.add_listener(self._on_task_changed)
+        with self._cond:
+            now = self.clock()
+            for task in tasks:
+                entry = self._entry(task, now)
+                if entry:
+                    self._pending[task["id"]] = entry
+            self._heap = [(entry[0], task_id) for task_id, entry in self._pending.items()]
+            heapq.heapify(self._heap)
+        self._thread = threading.Thread(target=self._run, name="reminders", daemon=True)
+        self._thread.start()
+
+    def _entry(self, task, now):
+        times = reminder_times(task, self.lead)
+        if times is None or times[1] <= now:
+            return None # No reminder, or the task has already started
+        return times[0], times[1], task.get("title") or "Task"
+
+    def _on_task_changed(self, task_id, task):
+        # Called by the manager, with its lock held, after every change
+        with self._cond:
+            self.stats["updates"] += 1
+            entry = self._entry(task, self.clock()) if task else None
+            old = self._pending.pop(task_id, None)
+            if old and entry and old[0] == entry[0]:
+                self._pending[task_id] = entry # Same time (e.g. renamed): heap entry still valid
+                return
+            if old:
+                self._stale += 1
+            if entry:
+                self._pending[task_id] = entry
+                heapq.heappush(self._heap, (entry[0], task_id))
+                if self._heap[0][1] == task_id:
+                    self._cond.notify() # New earliest reminder
+            if self._stale > 1024 and self._stale > len(self._pending):
+                self._heap = [(entry[0], tid) for tid, entry in self._pending.items()]
+                heapq.heapify(self._heap)
+                self._stale = 0
+
+    # --- Scheduler ---
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                due = self._pop_due(self.clock())
+                if not due:
+                    delay = self.max_sleep
+                    if self._heap:
+                        delay = min(delay, max(0.0, (self._heap[0][0] - self.clock()).total_seconds()))
+                    self._cond.wait(delay)
+                    self.stats["wakeups"] += 1
+                    continue
+            self._dispatch(due)
+
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            remind_at, task_id = heapq.heappop(self._heap)
+            entry = self._pending.get(task_id)
+            if entry is None or entry[0] != remind_at:
+                self._stale -= 1
+                continue
+            del self._pending[task_id]
+            due.append(entry)
+        self.stats["fired"] += len(due)
+        return due
+
+    def _dispatch(self, due):
+        if len(due) > self.group_limit:
+            titles = ", ".join(title for _, _, title in due[:self.group_limit])
+            messages = [f"{len(due)} reminders: {titles}, ..."]
+        else:
+            messages = [f"Reminder: {title} at {start.strftime('%H:%M')}" for _, start, title in due]
+        for message in messages:
+            try:
+                self.notifier(message)
+            except Exception as e:
+                print(f"Notification failed: {e}")
+        with self._cond:
+            self.stats["notifications"] += len(messages)
+
+    def wake(self):
+        """
+        Makes the scheduler re-check the clock now.
+        """
+        with self._cond:
+            self._cond.notify()
+
+    # --- API ---
+    def upcoming(self, limit=10):
+        """
+        The next reminders as {"id", "title", "remind_at", "starts_at"}, soonest first.
+        """
+        with self._cond:
+            soonest = heapq.nsmallest(limit, self._pending.items(), key=lambda item: (item[1][0], item[0]))
+        return [{"id": task_id, "title": title, "remind_at": remind_at.isoformat(timespec="minutes"),
+                 "starts_at": start.isoformat(timespec="minutes")}
+                for task_id, (remind_at, start, title) in soonest]
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats["pending"] = len(self._pending)
+            stats["heap"] = len(self._heap)
+        return stats
+
+    def close(self):
+        self.manager.remove_listener(self._on_task_changed)
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self._thread.join(timeout=1)
+
+    def _notify_user(self, message):
+        notify('DesktopAI Reminder', message)
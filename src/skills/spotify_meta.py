@@ -0,0 +1,189 @@
+import codecs
+import json
+import os
+import re
+import threading
+import time
+from html.parser import HTMLParser
+from urllib.parse import urlsplit, urlunsplit
+from ..net import default_client
+from ..paths import data_path
+from ..persistence import default_service
+
+SPOTIFY_LINK_RE = re.compile(r'/(?:intl-[a-z-]+/)?(track|album|playlist|artist|episode|show)/([a-zA-Z0-9]+)')
+GENERIC_TITLES = {"Spotify Link", "Spotify Track", "Spotify Album", "Spotify Playlist", "Spotify Artist",
+                  "Spotify Episode", "Spotify Show"}
+CHUNK_SIZE = 4096
+MAX_HEAD_BYTES = 512 * 1024 # Give up on pages whose <head> never ends
+
+def normalize_spotify_url(url):
+    """
+    Canonical cache key for a Spotify link: tracking parameters (?si=...) and fragments
+    dropped, host lowercased, localized /intl-xx/ prefix removed.
+    """
+    parts = urlsplit(url.strip())
+    path = re.sub(r'^/intl-[a-z-]+/', '/', parts.path).rstrip("/")
+    return urlunsplit(("https", parts.netloc.lower(), path, "", ""))
+
+def fallback_title(url):
+    match = SPOTIFY_LINK_RE.search(urlsplit(url).path)
+    return f"Spotify {match.group(1).capitalize()}" if match else "Spotify Link"
+
+
+class HeadMetaParser(HTMLParser):
+    """
+    Collects og:title, og:description and <title> and flags `done` as soon as the
+    document head is over, so the caller can stop downloading.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.meta = {}
+        self.title = ""
+        self.done = False
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta":
+            attrs = dict(attrs)
+            key = attrs.get("property") or attrs.get("name")
+            if key in ("og:title", "og:description") and key not in self.meta:
+                self.meta[key] = attrs.get("content") or ""
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "title":
+            self._in_title = False
+        elif tag == "head":
+            self.done = True
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+
+    def result(self):
+        """
+        Display title in the same shape play_now has always used: "Song - Artist".
+        """
+        title = self.meta.get("og:title", "").strip()
+        if title:
+            desc = self.meta.get("og:description", "")
+            # og:description usually reads "Artist · Song · 202X"
+            artist = desc.split(" · ")[0].strip() if desc else ""
+            return f"{title} - {artist}" if artist else title
+        web_title = self.title.strip()
+        return web_title.replace(" | Spotify", "") if web_title else None
+
+
+class SpotifyMetadataCache:
+    """
+    Persistent Spotify URL -> display title cache, consulted before any network fetch.
+
+    Keys are normalized links, so the same track shared with different ?si= tokens is
+    one entry. Misses stream the page and stop reading once the <head> meta tags have
+    been seen, instead of downloading and soup-parsing the whole document.
+    """
+
+    def __init__(self, cache_file=None, client=None, persistence=None, timeout=3):
+        self.client = client or default_client()
+        self.timeout = timeout
+        self._lock = threading.RLock()
+        self.stats = {"hits": 0, "misses": 0, "fetches": 0, "fetch_errors": 0, "bytes_read": 0, "fetch_ms": 0.0}
+        if cache_file is None:
+            cache_file = data_path("spotify_metadata.json")
+        self.cache_file = cache_file
+        self.entries = self._load()
+        self.persistence = persistence or default_service()
+        self.persistence.register(self.cache_file, self.cache_file, lambda: self.entries, lock=self._lock)
+
+    def _load(self):
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading Spotify metadata cache: {e}")
+        return {}
+
+    def seed(self, history):
+        """
+        Imports titles already resolved in music history entries ({"type", "id", "title"}).
+        """
+        added = False
+        with self._lock:
+            for entry in history:
+                url, title = entry.get("id", ""), entry.get("title")
+                if entry.get("type") != "spotify" or "open.spotify.com" not in url or title in GENERIC_TITLES:
+                    continue
+                key = normalize_spotify_url(url)
+                if title and key not in self.entries:
+                    self.entries[key] = title
+                    added = True
+        if added:
+            self.persistence.mark_dirty(self.cache_file)
+
+    def get_title(self, url):
+        """
+        Display title for a Spotify link: cached, fetched, or a generic fallback on failure.
+        """
+        key = normalize_spotify_url(url)
+        with self._lock:
+            title = self.entries.get(key)
+            self.stats["hits" if title else "misses"] += 1
+        if title:
+            return title
+
+        try:
+            title = self.fetch(url)
+        except Exception as e:
+            print(f"Error fetching Spotify metadata: {e}")
+            with self._lock:
+                self.stats["fetch_errors"] += 1
+            title = None
+        if not title:
+            return fallback_title(url)
+        with self._lock:
+            self.entries[key] = title
+        self.persistence.mark_dirty(self.cache_file)
+        return title
+
+    def fetch(self, url):
+        """
+        Streams the page until its head has been parsed; returns the title or None.
+        """
+        start = time.perf_counter()
+        parser = HeadMetaParser()
+        read = 0
+        response = self.client.get(url, stream=True, timeout=self.timeout)
+        try:
+            if response.status_code != 200:
+                return None
+            # requests assumes ISO-8859-1 for text/* without a charset; Spotify pages are UTF-8
+            charset = response.encoding if "charset" in response.headers.get("Content-Type", "") else "utf-8"
+            decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                read += len(chunk)
+                parser.feed(decoder.decode(chunk))
+                if parser.done or read >= MAX_HEAD_BYTES:
+                    break
+            return parser.result()
+        finally:
+            response.close() # Drops the rest of the body
+            with self._lock:
+                self.stats["fetches"] += 1
+                self.stats["bytes_read"] += read
+                self.stats["fetch_ms"] += (time.perf_counter() - start) * 1000
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self.entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        self.persistence.unregister(self.cache_file)
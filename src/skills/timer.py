@@ -1,59 +1,253 @@
+import heapq
+import itertools
+import json
+import os
+import re
 import threading
 import time
-import re
-from plyer import notification
-from datetime import timedelta
+from datetime import datetime, timedelta
+from ..paths import data_path
+from ..persistence import default_service
+from .notify import notify
+
+HOURS_RE = re.compile(r'(\d+)\s*(?:hour|hr)', re.IGNORECASE)
+MINUTES_RE = re.compile(r'(\d+)\s*(?:minute|min)', re.IGNORECASE)
+SECONDS_RE = re.compile(r'(\d+)\s*(?:second|sec)', re.IGNORECASE)
+NAME_RE = re.compile(r'\b(?:called|named|labell?ed)\s+["\']?(.+?)["\']?\s*$', re.IGNORECASE)
+
+def parse_duration(text):
+    # Parse inputs like:
+    # "set timer for 10 minutes"
+    # "timer 5 min"
+    # "set alarm for 30 seconds"
+    seconds = 0
+    hours_match = HOURS_RE.search(text)
+    minutes_match = MINUTES_RE.search(text)
+    seconds_match = SECONDS_RE.search(text)
+
+    if hours_match: seconds += int(hours_match.group(1)) * 3600
+    if minutes_match: seconds += int(minutes_match.group(1)) * 60
+    if seconds_match: seconds += int(seconds_match.group(1))
+    return seconds
+
 
 class TimerSkill:
-    def __init__(self):
-        self.active_timers = []
+    """
+    Timers driven by one scheduler thread.
+
+    Pending timers sit in a min-heap of (monotonic deadline, id); the scheduler thread
+    sleeps until the earliest deadline (or until a new, earlier timer wakes it) and
+    fires everything due. Cancelled timers are dropped from the id map and skipped when
+    they surface in the heap. Timers are persisted to timers.json with wall-clock due
+    times, so pending ones survive a restart (those that came due while the app was
+    closed fire on startup).
+    """
+
+    def __init__(self, state_file=None, persistence=None, notifier=None,
+                 clock=time.monotonic, wall_clock=time.time):
+        """
+        notifier: callable(message); defaults to a desktop notification via plyer
+        """
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.notifier = notifier or self._notify_user
+        self._cond = threading.Condition()
+        self._heap = [] # (deadline, id)
+        self.timers = {} # id -> {"id", "name", "seconds", "due", "deadline"}
+        self._stale = 0 # Heap entries of cancelled timers not yet popped
+        self._ids = itertools.count(1)
+        self._thread = None
+        self._stopped = False
+        self.stats = {"set": 0, "fired": 0, "cancelled": 0}
+
+        if state_file is None:
+            state_file = data_path("timers.json")
+        self.state_file = state_file
+        self._load()
+        self.persistence = persistence or default_service()
+        self.persistence.register(self.state_file, self.state_file, self._snapshot, lock=self._cond)
+        if self.timers:
+            self._ensure_thread()
+
+    def _load(self):
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, "r") as f:
+                saved = json.load(f)
+        except Exception as e:
+            print(f"Error loading timers: {e}")
+            return
+        now, wall = self.clock(), self.wall_clock()
+        for timer in saved:
+            # Re-anchor the wall-clock due time on this session's monotonic clock
+            timer["deadline"] = now + max(0.0, timer["due"] - wall)
+            self.timers[timer["id"]] = timer
+            heapq.heappush(self._heap, (timer["deadline"], timer["id"]))
+        self._ids = itertools.count(max(self.timers, default=0) + 1)
+
+    def _snapshot(self):
+        return [{k: t[k] for k in ("id", "name", "seconds", "due")}
+                for t in sorted(self.timers.values(), key=lambda t: t["deadline"])]
+
+    # --- Scheduler ---
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="timer-scheduler", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                due = self._pop_due()
+                if not due:
+                    delay = self._heap[0][0] - self.clock() if self._heap else None
+                    self._cond.wait(delay)
+                    continue
+            self.persistence.mark_dirty(self.state_file)
+            for timer in due:
+                self._fire(timer)
+
+    def _pop_due(self):
+        due = []
+        now = self.clock()
+        while self._heap and self._heap[0][0] <= now:
+            _, timer_id = heapq.heappop(self._heap)
+            timer = self.timers.pop(timer_id, None)
+            if timer is None:
+                self._stale -= 1 # Cancelled earlier
+                continue
+            due.append(timer)
+        self.stats["fired"] += len(due)
+        return due
+
+    def _fire(self, timer):
+        if timer["name"]:
+            message = f"Your timer '{timer['name']}' has finished!"
+        else:
+            message = "Your timer has finished!"
+        try:
+            self.notifier(message)
+        except Exception as e:
+            print(f"Notification failed: {e}")
+
+    def wake(self):
+        """
+        Makes the scheduler re-check its deadlines now (e.g. after a clock change).
+        """
+        with self._cond:
+            self._cond.notify()
+
+    # --- API ---
+    def add_timer(self, seconds, name=None):
+        """
+        Schedules a timer `seconds` from now and returns it.
+        """
+        with self._cond:
+            timer_id = next(self._ids)
+            deadline = self.clock() + seconds
+            timer = {"id": timer_id, "name": name, "seconds": seconds,
+                     "due": self.wall_clock() + seconds, "deadline": deadline}
+            self.timers[timer_id] = timer
+            heapq.heappush(self._heap, (deadline, timer_id))
+            self.stats["set"] += 1
+            if self._heap[0][1] == timer_id:
+                self._cond.notify() # New earliest deadline
+            self._ensure_thread()
+        self.persistence.mark_dirty(self.state_file)
+        return dict(timer)
 
     def set_timer(self, user_input):
-        # Parse inputs like:
-        # "set timer for 10 minutes"
-        # "timer 5 min"
-        # "set alarm for 30 seconds"
-        
-        seconds = 0
-        
-        # Regex for components
-        hours_match = re.search(r'(\d+)\s*(?:hour|hr)', user_input)
-        minutes_match = re.search(r'(\d+)\s*(?:minute|min)', user_input)
-        seconds_match = re.search(r'(\d+)\s*(?:second|sec)', user_input)
-        
-        if hours_match: seconds += int(hours_match.group(1)) * 3600
-        if minutes_match: seconds += int(minutes_match.group(1)) * 60
-        if seconds_match: seconds += int(seconds_match.group(1))
-        
+        seconds = parse_duration(user_input)
         if seconds == 0:
             return "I couldn't understand the duration. Try 'set timer for 5 minutes'."
-        
-        # Start thread
-        thread = threading.Thread(target=self._run_timer, args=(seconds,))
-        thread.daemon = True
-        thread.start()
-        
+
+        name_match = NAME_RE.search(user_input)
+        timer = self.add_timer(seconds, name_match.group(1) if name_match else None)
         duration_str = str(timedelta(seconds=seconds))
-        return f"Timer set for {duration_str}."
+        label = f" '{timer['name']}'" if timer["name"] else ""
+        return f"Timer{label} set for {duration_str}. (#{timer['id']})"
 
-    def _run_timer(self, duration):
-        time.sleep(duration)
-        self._notify_user()
+    def get_timers(self):
+        """
+        Pending timers, soonest first, with the seconds remaining.
+        """
+        with self._cond:
+            now = self.clock()
+            timers = sorted(self.timers.values(), key=lambda t: t["deadline"])
+            return [dict(t, remaining=max(0.0, t["deadline"] - now)) for t in timers]
 
-    def _notify_user(self):
-        # Sound?
-        try:
-            # Simple beep 3 times
-            # import winsound
-            # winsound.Beep(1000, 500)
-            # winsound.Beep(1000, 500)
-            # winsound.Beep(1000, 500)
-            pass
-            notification.notify(
-                title='DesktopAI Timer',
-                message='Your timer has finished!',
-                app_name='DesktopAI',
-                timeout=10
-            )
-        except Exception as e:
-            print(f"Notification failed: {e}")
+    def list_timers(self):
+        timers = self.get_timers()
+        if not timers:
+            return "No timers running."
+        lines = ["**Timers:**"]
+        for t in timers:
+            label = t["name"] or "Timer"
+            remaining = str(timedelta(seconds=round(t["remaining"])))
+            ends = datetime.fromtimestamp(t["due"]).strftime("%H:%M:%S")
+            lines.append(f"#{t['id']} {label}: {remaining} left (ends {ends})")
+        return "\n".join(lines)
+
+    def _cancel(self, timer_ids):
+        for timer_id in timer_ids:
+            del self.timers[timer_id]
+        self._stale += len(timer_ids)
+        self.stats["cancelled"] += len(timer_ids)
+        if self._stale > 64 and self._stale > len(self.timers):
+            # Mostly tombstones: rebuild rather than carry them
+            self._heap = [(t["deadline"], t["id"]) for t in self.timers.values()]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def cancel_timer(self, ref=None):
+        """
+        Cancels a timer by id ("3", "#3") or name; "all" cancels every timer. Without a
+        reference, cancels the only running timer.
+        """
+        ref = (ref or "").strip().lstrip("#")
+        with self._cond:
+            if not self.timers:
+                return "No timers running."
+            if ref.lower() == "all":
+                count = len(self.timers)
+                self._cancel(list(self.timers))
+                message = f"Cancelled {count} timers."
+            else:
+                if not ref:
+                    matches = list(self.timers.values()) if len(self.timers) == 1 else []
+                    if not matches:
+                        return "Several timers are running. Say which one (e.g. 'cancel timer 2')."
+                elif ref.isdigit():
+                    matches = [self.timers[int(ref)]] if int(ref) in self.timers else []
+                else:
+                    matches = [t for t in self.timers.values() if (t["name"] or "").lower() == ref.lower()]
+                if not matches:
+                    return f"No timer '{ref}' found."
+                timer = min(matches, key=lambda t: t["deadline"])
+                self._cancel([timer["id"]])
+                label = f" '{timer['name']}'" if timer["name"] else ""
+                message = f"Cancelled timer{label} (#{timer['id']})."
+            self._cond.notify()
+        self.persistence.mark_dirty(self.state_file)
+        return message
+
+    def get_stats(self):
+        with self._cond:
+            stats = dict(self.stats)
+            stats["pending"] = len(self.timers)
+            stats["heap"] = len(self._heap)
+        return stats
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=1)
+        self.persistence.unregister(self.state_file)
+
+    def _notify_user(self, message):
+        notify('DesktopAI Timer', message)
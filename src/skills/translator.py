@@ -1,7 +1,84 @@
-from deep_translator import GoogleTranslator
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from ..net import default_client
+from ..paths import data_path
+from ..persistence import default_service
+
+try:
+    from deep_translator import GoogleTranslator
+except ImportError:
+    GoogleTranslator = None
+
+MAX_ENTRIES = 5000
+CHUNK_CHARS = 1000 # Text per request; Google takes it in the query string
+
+SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])')
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+def split_sentences(text, limit=CHUNK_CHARS):
+    """
+    Splits text longer than `limit` at sentence ends (and, for a single overlong
+    sentence, at spaces or hard at `limit`) into pieces of at most `limit` characters.
+    """
+    if len(text) <= limit:
+        return [text]
+    pieces = []
+    for sentence in filter(None, SENTENCE_END_RE.split(text)):
+        sentence = sentence.strip()
+        while len(sentence) > limit:
+            cut = sentence.rfind(" ", 0, limit + 1)
+            cut = cut if cut > 0 else limit
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+class GoogleProvider:
+    """
+    deep_translator's GoogleTranslator, timed through the pooled HttpClient's stats.
+
+    GoogleTranslator makes its own requests (it cannot take a session), so like ddgs in
+    web_skills it is only instrumented here; the translation memory is what saves calls.
+    """
+
+    def __init__(self, client=None):
+        self.client = client or default_client()
+
+    def translate(self, text, target_code, source_code="auto"):
+        if GoogleTranslator is None:
+            raise RuntimeError("deep_translator is not installed")
+        with self.client.timed("google.translate"):
+            # A GoogleTranslator keeps per-call state in its URL parameters; one per call is thread-safe
+            return GoogleTranslator(source=source_code, target=target_code).translate(text)
+
 
 class TranslatorSkill:
-    def __init__(self):
+    """
+    Translation with a translation memory.
+
+    Translations are remembered per (whitespace-normalized text, target language) in an
+    LRU of `max_entries`, persisted to translation_memory.json through the persistence
+    service. translate_many() looks up only the texts the memory misses, packing them
+    one per line into requests of up to `chunk_chars` characters; texts longer than that
+    are split at sentence boundaries first.
+    """
+
+    def __init__(self, provider=None, memory_file=None, persistence=None,
+                 max_entries=MAX_ENTRIES, chunk_chars=CHUNK_CHARS):
+        """
+        provider: object with translate(text, target_code, source_code); defaults to GoogleProvider
+        """
+        self.provider = provider or GoogleProvider()
+        self.max_entries = max_entries
+        self.chunk_chars = chunk_chars
         self.langs = {
             "english": "en",
             "chinese": "zh-CN",
@@ -9,26 +86,155 @@ class TranslatorSkill:
             "chinese traditional": "zh-TW",
             "mandarin": "zh-CN"
         }
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "texts": 0, "hits": 0, "misses": 0, "requests": 0,
+                      "errors": 0, "total_ms": 0.0, "max_ms": 0.0, "last_ms": 0.0}
 
-    def translate(self, text, target_lang):
+        if memory_file is None:
+            memory_file = data_path("translation_memory.json")
+        self.memory_file = memory_file
+        self.memory = self._load() # (target code, text) -> translation, oldest use first
+        self.persistence = persistence or default_service()
+        self.persistence.register(self.memory_file, self.memory_file, self._snapshot, lock=self._lock)
+
+    def _load(self):
+        memory = OrderedDict()
+        if os.path.exists(self.memory_file):
+            try:
+                with open(self.memory_file, "r") as f:
+                    for target_code, text, translation in json.load(f):
+                        memory[(target_code, text)] = translation
+            except Exception as e:
+                print(f"Error loading translation memory: {e}")
+        return memory
+
+    def _snapshot(self):
+        # Ordered rows so LRU order survives a restart
+        return [[target_code, text, translation] for (target_code, text), translation in self.memory.items()]
+
+    def _target_code(self, target_lang):
         target_code = self.langs.get(target_lang.lower())
-        
-        # Auto-detect common "translate X to Y" patterns passed in as raw text
-        # But usually the engine will extract the text. 
-        # Here we assume 'text' is the content to translate.
-        
         if not target_code:
             # Fallback or smart detection
             if "chinese" in target_lang.lower():
                 target_code = "zh-CN" # Default to simplified
             elif "english" in target_lang.lower():
                 target_code = "en"
-            else:
-                return f"Unsupported language: {target_lang}. Supported: English, Chinese (Simplified/Traditional)."
+        return target_code
+
+    def translate(self, text, target_lang):
+        # The engine extracts the content from "translate X to Y"; `text` is just X
+        if not self._target_code(target_lang):
+            return f"Unsupported language: {target_lang}. Supported: English, Chinese (Simplified/Traditional)."
 
         try:
-            translator = GoogleTranslator(source='auto', target=target_code)
-            result = translator.translate(text)
+            result = self.translate_many([text], target_lang)[0]
             return f"Translated to {target_lang}: {result}"
         except Exception as e:
             return f"Translation error: {str(e)}"
+
+    def translate_many(self, texts, target_lang):
+        """
+        Translates several texts to `target_lang` (name or code), in order. Raises
+        ValueError for unsupported languages and request errors as they come.
+        """
+        target_code = self._target_code(target_lang) or (target_lang if target_lang in self.langs.values() else None)
+        if not target_code:
+            raise ValueError(f"Unsupported language: {target_lang}")
+
+        start = time.perf_counter()
+        results = [None] * len(texts)
+        missing = OrderedDict() # text -> indexes waiting on it
+        with self._lock:
+            for i, text in enumerate(texts):
+                text = normalize_text(text)
+                translation = self.memory.get((target_code, text)) if text else text
+                if translation is not None:
+                    if text:
+                        self.memory.move_to_end((target_code, text))
+                        self.stats["hits"] += 1
+                    results[i] = translation
+                else:
+                    missing.setdefault(text, []).append(i)
+            self.stats["misses"] += len(missing)
+
+        try:
+            if missing:
+                translated = self._translate_uncached(list(missing), target_code)
+                with self._lock:
+                    for text, translation in zip(missing, translated):
+                        self.memory[(target_code, text)] = translation
+                        self.memory.move_to_end((target_code, text))
+                        for i in missing[text]:
+                            results[i] = translation
+                    while len(self.memory) > self.max_entries:
+                        self.memory.popitem(last=False)
+                self.persistence.mark_dirty(self.memory_file)
+        except Exception:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise
+        finally:
+            self._record_call(len(texts), (time.perf_counter() - start) * 1000)
+        return results
+
+    def _record_call(self, count, elapsed_ms):
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["texts"] += count
+            self.stats["total_ms"] += elapsed_ms
+            self.stats["max_ms"] = max(self.stats["max_ms"], elapsed_ms)
+            self.stats["last_ms"] = elapsed_ms
+
+    def _translate_uncached(self, texts, target_code):
+        # Long texts become several segments; segments are packed into line-per-segment chunks
+        segments, owners = [], []
+        for n, text in enumerate(texts):
+            for piece in split_sentences(text, self.chunk_chars):
+                segments.append(piece)
+                owners.append(n)
+
+        translated = []
+        chunk, size = [], 0
+        for segment in segments:
+            if chunk and size + 1 + len(segment) > self.chunk_chars:
+                translated += self._request_lines(chunk, target_code)
+                chunk, size = [], 0
+            chunk.append(segment)
+            size += len(segment) + (1 if size else 0)
+        if chunk:
+            translated += self._request_lines(chunk, target_code)
+
+        parts = [[] for _ in texts]
+        for n, piece in zip(owners, translated):
+            parts[n].append(piece)
+        joiner = "" if target_code.startswith("zh") else " "
+        return [joiner.join(p) for p in parts]
+
+    def _request_lines(self, lines, target_code):
+        if len(lines) > 1:
+            result = self._request("\n".join(lines), target_code).split("\n")
+            if len(result) == len(lines):
+                return [line.strip() for line in result]
+            # Line structure did not survive the round trip: one request per line instead
+        return [self._request(line, target_code) for line in lines]
+
+    def _request(self, text, target_code, source_code="auto"):
+        if not text:
+            return text
+        with self._lock:
+            self.stats["requests"] += 1
+        result = self.provider.translate(text, target_code, source_code)
+        if result is None:
+            raise RuntimeError(f"No translation found for '{text}'")
+        return result
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self.memory)
+        stats["avg_ms"] = stats["total_ms"] / stats["calls"] if stats["calls"] else 0.0
+        return stats
+
+    def close(self):
+        self.persistence.unregister(self.memory_file)
@@ -1,43 +1,171 @@
-import requests
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from ..net import TIMEOUT, default_client
+from ..paths import data_path
+from ..persistence import default_service
 
-def get_weather(city_name):
+GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+FORECAST_FIELDS = "temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m"
+
+def describe(wcode):
+    # Interpret weather code (simplified)
+    condition = "Clear"
+    if wcode > 2: condition = "Cloudy"
+    if wcode > 50: condition = "Rainy"
+    if wcode > 70: condition = "Snowy"
+    if wcode > 95: condition = "Thunderstorm"
+    return condition
+
+
+class WeatherService:
+    """
+    Open-Meteo client with caching.
+
+    City -> location lookups are memoized for good (places do not move) and persisted
+    to weather_geocode.json through the persistence service. Forecasts are cached per
+    coordinate for `forecast_ttl` seconds in an LRU of `max_forecasts` entries. All
+    requests go through the shared pooled HttpClient (keep-alive, retries) with
+    explicit timeouts.
+    """
+
+    def __init__(self, client=None, geocode_file=None, forecast_ttl=600, max_forecasts=128,
+                 geocode_url=GEOCODE_URL, forecast_url=FORECAST_URL, timeout=TIMEOUT,
+                 persistence=None, clock=time.monotonic):
+        self.client = client or default_client()
+        self.geocode_url = geocode_url
+        self.forecast_url = forecast_url
+        self.timeout = timeout
+        self.forecast_ttl = forecast_ttl
+        self.max_forecasts = max_forecasts
+        self.clock = clock
+        self._lock = threading.RLock()
+        self._forecasts = OrderedDict() # (lat, lon) -> (fetched_at, payload)
+        self._unknown = set() # Names the geocoder had no result for (this session only)
+        self.stats = {"geocode_hits": 0, "geocode_misses": 0, "forecast_hits": 0,
+                      "forecast_misses": 0, "requests": 0}
+
+        if geocode_file is None:
+            geocode_file = data_path("weather_geocode.json")
+        self.geocode_file = geocode_file
+        self.geocodes = self._load_geocodes()
+        self.persistence = persistence or default_service()
+        self.persistence.register(self.geocode_file, self.geocode_file, lambda: self.geocodes, lock=self._lock)
+
+    def _load_geocodes(self):
+        if os.path.exists(self.geocode_file):
+            try:
+                with open(self.geocode_file, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"Error loading geocode cache: {e}")
+        return {}
+
+    def _get_json(self, url, params):
+        with self._lock:
+            self.stats["requests"] += 1
+        res = self.client.get(url, params=params, timeout=self.timeout)
+        res.raise_for_status()
+        return res.json()
+
+    def geocode(self, city_name):
+        """
+        Returns {"name", "latitude", "longitude"} or None if the place is unknown.
+        """
+        key = " ".join(city_name.lower().split())
+        with self._lock:
+            if key in self.geocodes or key in self._unknown:
+                self.stats["geocode_hits"] += 1
+                return self.geocodes.get(key)
+            self.stats["geocode_misses"] += 1
+
+        geo_res = self._get_json(self.geocode_url, {"name": city_name, "count": 1, "language": "en", "format": "json"})
+        if not geo_res.get("results"):
+            with self._lock:
+                self._unknown.add(key)
+            return None
+
+        result = geo_res["results"][0]
+        location = {
+            "name": f"{result['name']}, {result.get('country', '')}",
+            "latitude": result["latitude"],
+            "longitude": result["longitude"],
+        }
+        with self._lock:
+            self.geocodes[key] = location
+        self.persistence.mark_dirty(self.geocode_file)
+        return location
+
+    def forecast(self, lat, lon):
+        key = (round(lat, 2), round(lon, 2))
+        now = self.clock()
+        with self._lock:
+            cached = self._forecasts.get(key)
+            if cached and now - cached[0] < self.forecast_ttl:
+                self._forecasts.move_to_end(key)
+                self.stats["forecast_hits"] += 1
+                return cached[1]
+            self.stats["forecast_misses"] += 1
+
+        payload = self._get_json(self.forecast_url, {"latitude": lat, "longitude": lon, "current": FORECAST_FIELDS})
+        if "current" in payload:
+            with self._lock:
+                self._forecasts[key] = (now, payload)
+                self._forecasts.move_to_end(key)
+                while len(self._forecasts) > self.max_forecasts:
+                    self._forecasts.popitem(last=False)
+        return payload
+
+    def get_weather(self, city_name):
+        """
+        Fetches current weather for a specific city using Open-Meteo.
+        """
+        try:
+            location = self.geocode(city_name)
+            if location is None:
+                return f"I couldn't find a location named '{city_name}'."
+
+            w_res = self.forecast(location["latitude"], location["longitude"])
+            if "current" not in w_res:
+                return "Could not retrieve weather data."
+
+            current = w_res["current"]
+            temp = current["temperature_2m"]
+            wind = current["wind_speed_10m"]
+            unit = w_res["current_units"]["temperature_2m"]
+            condition = describe(current["weather_code"])
+
+            return f"Weather in {location['name']}:\nCondition: {condition}\nTemperature: {temp}{unit}\nWind: {wind} km/h"
+
+        except Exception as e:
+            return f"Error checking weather: {e}"
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["geocodes"] = len(self.geocodes)
+            stats["forecasts"] = len(self._forecasts)
+        return stats
+
+    def close(self):
+        self.persistence.unregister(self.geocode_file)
+
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+def default_weather():
     """
-    Fetches current weather for a specific city using Open-Meteo.
+    Process-wide WeatherService, created on first use.
     """
-    try:
-        # 1. Geocode the city
-        geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={city_name}&count=1&language=en&format=json"
-        geo_res = requests.get(geo_url).json()
-        
-        if "results" not in geo_res:
-            return f"I couldn't find a location named '{city_name}'."
-            
-        location = geo_res["results"][0]
-        lat = location["latitude"]
-        lon = location["longitude"]
-        resolved_name = f"{location['name']}, {location.get('country', '')}"
-        
-        # 2. Get Weather
-        weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current=temperature_2m,relative_humidity_2m,weather_code,wind_speed_10m"
-        w_res = requests.get(weather_url).json()
-        
-        if "current" not in w_res:
-            return "Could not retrieve weather data."
-            
-        current = w_res["current"]
-        temp = current["temperature_2m"]
-        wind = current["wind_speed_10m"]
-        unit = w_res["current_units"]["temperature_2m"]
-        
-        # Interpret weather code (simplified)
-        wcode = current["weather_code"]
-        condition = "Clear"
-        if wcode > 2: condition = "Cloudy"
-        if wcode > 50: condition = "Rainy"
-        if wcode > 70: condition = "Snowy"
-        if wcode > 95: condition = "Thunderstorm"
-        
-        return f"Weather in {resolved_name}:\nCondition: {condition}\nTemperature: {temp}{unit}\nWind: {wind} km/h"
-        
-    except Exception as e:
-        return f"Error checking weather: {e}"
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = WeatherService()
+        return _SERVICE
+
+def get_weather(city_name):
+    return default_weather().get_weather(city_name)
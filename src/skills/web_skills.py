@@ -1,4 +1,13 @@
+import json
+import os
+import threading
+import time
 import warnings
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from ..net import default_client
+from ..paths import data_path
+from ..persistence import default_service
 
 # Suppress the "package renamed" warning aggressively
 warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*renamed to.*ddgs.*")
@@ -11,41 +20,241 @@ except ImportError:
     except ImportError:
          DDGS = None
 
+WEB_TTL = 6 * 3600 # Encyclopedic answers ("what is ...") barely change within a day
+NEWS_TTL = 15 * 60 # Headlines go stale quickly
+MAX_ENTRIES = 500
+MAX_RESULTS = 3
+
+# One DDGS for the process: it keeps its search engine clients (and their connections)
+# between queries instead of starting from scratch each time
+_DDGS = None
+_DDGS_LOCK = threading.Lock()
+
+def _ddgs():
+    global _DDGS
+    with _DDGS_LOCK:
+        if _DDGS is None:
+            _DDGS = DDGS(timeout=default_client().timeout[1])
+        return _DDGS
+
+def normalize_query(query):
+    return " ".join(query.lower().split())
+
+
+class DdgsProvider:
+    """
+    The shared DDGS instance, timed through the pooled HttpClient's stats.
+    """
+
+    def _call(self, kind, query, max_results):
+        # Suppress warning locally as well just in case
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*renamed to.*ddgs.*")
+            with default_client().timed(f"ddgs.{kind}"):
+                ddgs = _ddgs()
+                search = ddgs.text if kind == "web" else ddgs.news
+                return search(query, max_results=max_results)
+
+    def web(self, query, max_results=MAX_RESULTS):
+        return self._call("web", query, max_results)
+
+    def news(self, query, max_results=MAX_RESULTS):
+        return self._call("news", query, max_results)
+
+
+class SearchService:
+    """
+    Web and news search with a result cache.
+
+    Results are cached per (kind, normalized query, result count) with separate TTLs for
+    web and news, in an LRU of `max_entries`. Concurrent lookups of the same query share
+    one provider call; search_many() fans several queries out over a small thread pool.
+    With a cache_file the cache is persisted through the persistence service.
+    """
+
+    def __init__(self, provider=None, web_ttl=WEB_TTL, news_ttl=NEWS_TTL, max_entries=MAX_ENTRIES,
+                 cache_file=None, persistence=None, workers=4, clock=time.time):
+        """
+        provider: object with web(query, max_results) and news(query, max_results) returning
+        lists of result dicts; defaults to DuckDuckGo
+        """
+        if provider is None and DDGS is not None:
+            provider = DdgsProvider()
+        self.provider = provider
+        self.ttls = {"web": web_ttl, "news": news_ttl}
+        self.max_entries = max_entries
+        self.workers = workers
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._inflight = {} # key -> Future of the provider call in progress
+        self._executor = None
+        self.stats = {"hits": 0, "misses": 0, "shared": 0, "errors": 0}
+
+        self.cache_file = cache_file
+        self.entries = self._load() # (kind, max_results, query) -> [results, fetched_at], oldest use first
+        self.persistence = None
+        if cache_file:
+            self.persistence = persistence or default_service()
+            self.persistence.register(cache_file, cache_file, self._snapshot, lock=self._lock)
+
+    def _load(self):
+        entries = OrderedDict()
+        if self.cache_file and os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    now = self.clock()
+                    for kind, max_results, query, results, fetched_at in json.load(f):
+                        if now - fetched_at < self.ttls.get(kind, 0):
+                            entries[(kind, max_results, query)] = [results, fetched_at]
+            except Exception as e:
+                print(f"Error loading search cache: {e}")
+        return entries
+
+    def _snapshot(self):
+        # Ordered rows so LRU order survives a restart
+        return [[*key, results, fetched_at] for key, (results, fetched_at) in self.entries.items()]
+
+    def search(self, query, kind="web", max_results=MAX_RESULTS):
+        """
+        Returns the result dicts for a "web" or "news" query. Provider errors are raised
+        (and not cached).
+        """
+        if kind not in self.ttls:
+            raise ValueError(f"Unknown search kind: {kind}")
+        key = (kind, max_results, normalize_query(query))
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and self.clock() - entry[1] < self.ttls[kind]:
+                self.entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0]
+            future = self._inflight.get(key)
+            shared = future is not None
+            if shared:
+                self.stats["shared"] += 1
+            else:
+                future = self._inflight[key] = Future()
+                self.stats["misses"] += 1
+        if shared:
+            return future.result() # Someone else is already fetching it
+
+        try:
+            if self.provider is None:
+                raise RuntimeError("Search library (ddgs) not installed correctly.")
+            results = list(getattr(self.provider, kind)(query.strip(), max_results=max_results) or [])
+        except Exception as e:
+            with self._lock:
+                self.stats["errors"] += 1
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            self.entries[key] = [results, self.clock()]
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self._inflight.pop(key, None)
+        future.set_result(results)
+        if self.persistence:
+            self.persistence.mark_dirty(self.cache_file)
+        return results
+
+    def _search_or_none(self, query, kind, max_results):
+        try:
+            return self.search(query, kind, max_results)
+        except Exception as e:
+            print(f"Error searching for '{query}': {e}")
+            return None
+
+    def search_many(self, queries, kind="web", max_results=MAX_RESULTS):
+        """
+        Runs several queries concurrently. Results are in input order, None where the
+        lookup failed; identical queries are only looked up once.
+        """
+        unique = OrderedDict()
+        for q in queries:
+            unique.setdefault(normalize_query(q), q) # First spelling wins
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="search")
+        futures = {norm: self._executor.submit(self._search_or_none, q, kind, max_results)
+                   for norm, q in unique.items()}
+        return [futures[normalize_query(q)].result() for q in queries]
+
+    def get_stats(self):
+        """
+        Counters plus hit_ratio: the share of lookups answered without a provider call of
+        their own (cache hits and lookups that joined one already in flight).
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self.entries)
+        lookups = stats["hits"] + stats["misses"] + stats["shared"]
+        stats["hit_ratio"] = (stats["hits"] + stats["shared"]) / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        if self.persistence:
+            self.persistence.unregister(self.cache_file)
+        if self._executor:
+            self._executor.shutdown(wait=False)
+
+
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+def default_search():
+    """
+    Process-wide SearchService with its cache in search_cache.json, created on first use.
+    """
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = SearchService(cache_file=data_path("search_cache.json"))
+        return _SERVICE
+
+def format_web(results):
+    if not results:
+        return "I couldn't find anything on the web for that."
+
+    summary = "Here is what I found:\n"
+    for r in results:
+        summary += f"- {r['title']}: {r['body']}\n({r['href']})\n\n"
+    return summary
+
+def format_news(results):
+    if not results:
+        return "No recent news found."
+
+    summary = "Latest News:\n"
+    for r in results:
+        summary += f"- {r['title']} ({r['source']})\n  {r['url']}\n\n"
+    return summary
+
 def search_web(query):
     if not DDGS:
         return "Search library (ddgs) not installed correctly."
 
     try:
-        # Suppress warning locally as well just in case
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*renamed to.*ddgs.*")
-            results = DDGS().text(query, max_results=3)
-            
-        if not results:
-            return "I couldn't find anything on the web for that."
-        
-        summary = "Here is what I found:\n"
-        for r in results:
-            summary += f"- {r['title']}: {r['body']}\n({r['href']})\n\n"
-        return summary
+        return format_web(default_search().search(query, "web"))
     except Exception as e:
         return f"Error searching web: {e}"
 
 def search_news(query):
     if not DDGS:
         return "Search library (ddgs) not installed correctly."
-        
+
     try:
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=RuntimeWarning, message=".*renamed to.*ddgs.*")
-            results = DDGS().news(query, max_results=3)
-            
-        if not results:
-            return "No recent news found."
-            
-        summary = "Latest News:\n"
-        for r in results:
-            summary += f"- {r['title']} ({r['source']})\n  {r['url']}\n\n"
-        return summary
+        return format_news(default_search().search(query, "news"))
     except Exception as e:
         return f"Error fetching news: {e}"
+
+def search_many(queries):
+    """
+    Web-searches several queries at once; one formatted answer per query, in order.
+    """
+    if not DDGS:
+        return ["Search library (ddgs) not installed correctly."] * len(queries)
+
+    results = default_search().search_many(queries, "web")
+    return [format_web(r) if r is not None else f"Error searching web for '{q}'." for q, r in zip(queries, results)]
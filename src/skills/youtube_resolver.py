@@ -0,0 +1,190 @@
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from ..paths import data_path
+from ..persistence import default_service
+
+try:
+    import yt_dlp
+except ImportError:
+    yt_dlp = None
+
+YDL_OPTS = {
+    'quiet': True,
+    'format': 'bestaudio/best',
+    'noplaylist': True,
+    'extract_flat': True,
+}
+CACHE_TTL = 7 * 24 * 3600 # Search results drift slowly; a week keeps repeats instant
+MAX_ENTRIES = 2000
+
+def cache_key(query):
+    query = query.strip()
+    return query if query.startswith("http") else " ".join(query.lower().split())
+
+
+class YoutubeResolver:
+    """
+    Resolves queries and links to (video id, title) with yt-dlp.
+
+    Extractors are expensive to build (option parsing, extractor registry), so up to
+    `pool_size` YoutubeDL instances are created on demand and reused; each call borrows
+    one, since a YoutubeDL is not meant to be shared between threads. Results are cached
+    per normalized query with a TTL and LRU bound, persisted through the persistence
+    service so repeat lookups survive restarts.
+    """
+
+    def __init__(self, ydl_opts=None, pool_size=3, ttl=CACHE_TTL, max_entries=MAX_ENTRIES,
+                 cache_file=None, persistence=None, factory=None, clock=time.time):
+        """
+        factory: callable(opts) -> object with extract_info(query, download=False);
+        defaults to yt_dlp.YoutubeDL
+        """
+        if factory is None and yt_dlp is not None:
+            factory = yt_dlp.YoutubeDL
+        self.factory = factory
+        self.ydl_opts = dict(YDL_OPTS if ydl_opts is None else ydl_opts)
+        self.pool_size = pool_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._executor = None
+        self.stats = {"hits": 0, "misses": 0, "extractions": 0, "errors": 0, "constructions": 0}
+
+        if cache_file is None:
+            cache_file = data_path("youtube_cache.json")
+        self.cache_file = cache_file
+        self.entries = self._load() # key -> [id, title, resolved_at], oldest use first
+        self.persistence = persistence or default_service()
+        self.persistence.register(self.cache_file, self.cache_file, self._snapshot, lock=self._lock)
+
+    def _load(self):
+        entries = OrderedDict()
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, "r") as f:
+                    for key, value in json.load(f):
+                        entries[key] = value
+            except Exception as e:
+                print(f"Error loading YouTube cache: {e}")
+        return entries
+
+    def _snapshot(self):
+        # Ordered pairs so LRU order survives a restart
+        return [[key, value] for key, value in self.entries.items()]
+
+    # --- Extractor pool ---
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.pool_size
+            if create:
+                self._created += 1
+                self.stats["constructions"] += 1
+        if create:
+            try:
+                return self.factory(self.ydl_opts)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get() # Pool is full: wait for a free extractor
+
+    def _release(self, ydl):
+        self._idle.put(ydl)
+
+    # --- Lookups ---
+    def cached(self, query):
+        """
+        (id, title) if the query is already cached and fresh, else None. Never extracts.
+        """
+        key = cache_key(query)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and self.clock() - entry[2] < self.ttl:
+                self.entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[0], entry[1]
+        return None
+
+    def _extract(self, query):
+        if self.factory is None:
+            raise RuntimeError("yt-dlp is not installed.")
+        # If it's not a link, make it a search query
+        target = query if query.startswith("http") else f"ytsearch1:{query}"
+        ydl = self._acquire()
+        try:
+            with self._lock:
+                self.stats["extractions"] += 1
+            info = ydl.extract_info(target, download=False)
+        finally:
+            self._release(ydl)
+        if 'entries' in info:
+            entries = list(info['entries'] or [])
+            if not entries:
+                return None, None
+            info = entries[0]
+        return info['id'], info['title']
+
+    def resolve(self, query):
+        """
+        Returns (id, title) for a query or link, or (None, None) if nothing was found.
+        """
+        key = cache_key(query)
+        cached = self.cached(query)
+        if cached:
+            return cached
+        with self._lock:
+            self.stats["misses"] += 1
+        try:
+            vid_id, title = self._extract(query.strip())
+        except Exception as e:
+            print(f"Error extracting video info: {e}")
+            with self._lock:
+                self.stats["errors"] += 1
+            return None, None
+        if vid_id:
+            with self._lock:
+                self.entries[key] = [vid_id, title, self.clock()]
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            self.persistence.mark_dirty(self.cache_file)
+        return vid_id, title
+
+    def resolve_many(self, queries):
+        """
+        Resolves several queries in parallel (bounded by the extractor pool). Results are
+        in input order; identical queries are only looked up once.
+        """
+        unique = OrderedDict()
+        for q in queries:
+            unique.setdefault(cache_key(q), q) # First spelling wins
+        unique = list(unique.items())
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.pool_size, thread_name_prefix="yt-resolve")
+        results = dict(zip((key for key, _ in unique), self._executor.map(self.resolve, (q for _, q in unique))))
+        return [results[cache_key(q)] for q in queries]
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self.entries)
+            stats["extractors"] = self._created
+        return stats
+
+    def close(self):
+        self.persistence.unregister(self.cache_file)
+        if self._executor:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,243 @@
+try:
+    import customtkinter as ctk
+except ImportError:
+    ctk = None
+
+# Height of one TaskCard including its padding, used by the virtualized list
+TASK_ROW_HEIGHT = 56
+
+
+class KeyedList:
+    """
+    Keeps a column of cards in sync with a list of tasks, keyed by task id.
+
+    Instead of destroying every widget and building new ones on each refresh, render()
+    diffs the new list against the cards on screen: cards whose task is gone are
+    destroyed, new tasks get a card, existing cards are only updated when their task
+    changed, and cards are only re-packed from the first position whose order changed.
+
+    make_card(): returns an object with update(task), show(), hide() and destroy().
+    make_placeholder(): optional, same interface minus update(); shown when the list is empty.
+    """
+
+    def __init__(self, make_card, make_placeholder=None):
+        self.make_card = make_card
+        self.make_placeholder = make_placeholder
+        self.cards = {}     # task id -> card
+        self.rendered = {}  # task id -> copy of the task the card currently shows
+        self.order = []     # task ids in on-screen order
+        self.placeholder = None
+        self.stats = {"created": 0, "updated": 0, "destroyed": 0, "moved": 0}
+
+    def render(self, tasks):
+        new_ids = [t["id"] for t in tasks]
+        keep = set(new_ids)
+
+        for task_id in self.order:
+            if task_id not in keep:
+                self.cards.pop(task_id).destroy()
+                del self.rendered[task_id]
+                self.stats["destroyed"] += 1
+        old_order = [i for i in self.order if i in keep]
+
+        for task in tasks:
+            card = self.cards.get(task["id"])
+            if card is None:
+                card = self.cards[task["id"]] = self.make_card()
+                self.stats["created"] += 1
+            elif self.rendered[task["id"]] == task:
+                continue
+            else:
+                self.stats["updated"] += 1
+            card.update(task)
+            # Tasks from the JSON backend are live dicts, keep what was drawn
+            self.rendered[task["id"]] = dict(task)
+
+        # Pack order: everything from the first mismatch onwards is re-packed in order.
+        # Appends and in-place updates touch nothing that is already on screen.
+        first = 0
+        while first < len(old_order) and old_order[first] == new_ids[first]:
+            first += 1
+        for task_id in old_order[first:]:
+            self.cards[task_id].hide()
+        for task_id in new_ids[first:]:
+            self.cards[task_id].show()
+        self.stats["moved"] += len(old_order) - first
+        self.order = new_ids
+
+        if self.make_placeholder:
+            if not tasks and self.placeholder is None:
+                self.placeholder = self.make_placeholder()
+                self.placeholder.show()
+            elif tasks and self.placeholder is not None:
+                self.placeholder.destroy()
+                self.placeholder = None
+
+
+class VirtualList:
+    """
+    Shows a window of `visible_rows` tasks out of an arbitrarily long list.
+
+    Only a pool of visible_rows cards is ever materialized; scrolling rebinds the
+    pooled cards to different tasks instead of creating widgets, so a 10k task list
+    costs the same to display as a 20 task one. The Tk side (scrollbar, wheel,
+    resize) calls scroll_to / scroll_by / set_visible_rows and reads fraction().
+    """
+
+    def __init__(self, make_card, visible_rows=10):
+        self.make_card = make_card
+        self.items = []
+        self.offset = 0
+        self.visible_rows = max(1, visible_rows)
+        self.pool = []      # cards, packed once in this order
+        self.bound = []     # copy of the task each pooled card shows, or None if hidden
+        self.stats = {"created": 0, "updated": 0}
+
+    def set_items(self, items):
+        self.items = items
+        self._clamp()
+        self._refresh()
+
+    def set_visible_rows(self, rows):
+        rows = max(1, rows)
+        if rows != self.visible_rows:
+            self.visible_rows = rows
+            self._clamp()
+            self._refresh()
+
+    def scroll_to(self, offset):
+        old = self.offset
+        self.offset = int(offset)
+        self._clamp()
+        if self.offset != old:
+            self._refresh()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+
+    def fraction(self):
+        """
+        (first, last) visible fractions, the format Tk scrollbars expect.
+        """
+        if not self.items:
+            return 0.0, 1.0
+        n = len(self.items)
+        return self.offset / n, min(1.0, (self.offset + self.visible_rows) / n)
+
+    def _clamp(self):
+        self.offset = max(0, min(self.offset, len(self.items) - self.visible_rows))
+
+    def _refresh(self):
+        while len(self.pool) < min(self.visible_rows, len(self.items)):
+            self.pool.append(self.make_card())
+            self.bound.append(None)
+            self.stats["created"] += 1
+
+        # Hidden cards are always a suffix of the pool, so showing them in pool order
+        # (pack appends at the end) keeps the on-screen order intact.
+        for i, card in enumerate(self.pool):
+            index = self.offset + i
+            if i < self.visible_rows and index < len(self.items):
+                task = self.items[index]
+                if self.bound[i] is None:
+                    card.show()
+                if self.bound[i] != task:
+                    card.update(task)
+                    self.bound[i] = dict(task)
+                    self.stats["updated"] += 1
+            elif self.bound[i] is not None:
+                card.hide()
+                self.bound[i] = None
+
+
+class TaskCard:
+    """
+    One task row for the Tk dashboard: checkbox, title, meta line and delete button.
+    Widgets are built once; update() only reconfigures what changed.
+
+    timed: True/False, or None to decide per task (shows the time if it has one).
+    """
+
+    def __init__(self, parent, theme, on_toggle, on_delete, fg_color=None, timed=None, show_date=False, on_wheel=None):
+        self.theme = theme
+        self.timed = timed
+        self.show_date = show_date
+        self.task_id = None
+        self._shown = {}
+
+        self.row = ctk.CTkFrame(parent, height=40, fg_color=fg_color or theme["bg_secondary"], corner_radius=8)
+
+        # Checkbox
+        self.status_var = ctk.BooleanVar(value=False)
+        self.chk = ctk.CTkCheckBox(self.row, text="", variable=self.status_var, width=20, corner_radius=10,
+                                   fg_color=theme["accent"], hover_color=theme["accent_hover"], border_color=theme["border"],
+                                   command=lambda: on_toggle(self.task_id))
+        self.chk.pack(side="left", padx=(10, 5))
+
+        # Content
+        details_frame = ctk.CTkFrame(self.row, fg_color="transparent")
+        details_frame.pack(side="left", fill="x", expand=True, pady=5)
+
+        self.title_lbl = ctk.CTkLabel(details_frame, text="", anchor="w", font=("Arial", 12, "bold"), text_color=theme["text"])
+        self.title_lbl.pack(fill="x")
+        self.meta_lbl = ctk.CTkLabel(details_frame, text="", anchor="w", font=("Arial", 10), text_color="#a6adc8")
+
+        # Delete (Tiny x)
+        self.del_btn = ctk.CTkButton(self.row, text="×", width=20, height=20, fg_color="transparent", hover_color=theme["error"],
+                                     text_color=theme["text"], command=lambda: on_delete(self.task_id))
+        self.del_btn.pack(side="right", padx=5)
+
+        if on_wheel:
+            for widget in (self.row, details_frame, self.title_lbl, self.meta_lbl, self.chk):
+                widget.bind("<MouseWheel>", on_wheel)
+
+    def meta_text(self, task):
+        meta = []
+        if task.get("category") == "Deadline": meta.append("⚠️ Deadline")
+        if self.show_date: meta.append(f"📅 {task['date']}")
+        timed = bool(task.get("time")) if self.timed is None else self.timed
+        if timed and task.get("time"):
+            time_str = f"{task['time']}"
+            if task.get("end_time"): time_str += f" - {task['end_time']}"
+            meta.append(f"🕒 {time_str}")
+        return "  ".join(meta)
+
+    def update(self, task):
+        self.task_id = task["id"]
+        if self.status_var.get() != bool(task["completed"]):
+            self.status_var.set(bool(task["completed"]))
+        if self._shown.get("title") != task["title"]:
+            self.title_lbl.configure(text=task["title"])
+            self._shown["title"] = task["title"]
+        meta = self.meta_text(task)
+        if self._shown.get("meta") != meta:
+            if meta:
+                self.meta_lbl.configure(text=meta)
+                self.meta_lbl.pack(fill="x")
+            else:
+                self.meta_lbl.pack_forget()
+            self._shown["meta"] = meta
+
+    def show(self):
+        self.row.pack(fill="x", pady=4, padx=5)
+
+    def hide(self):
+        self.row.pack_forget()
+
+    def destroy(self):
+        self.row.destroy()
+
+
+class EmptyLabel:
+    """
+    Placeholder shown by KeyedList when there is nothing to list.
+    """
+
+    def __init__(self, parent, text):
+        self.label = ctk.CTkLabel(parent, text=text, text_color="gray")
+
+    def show(self):
+        self.label.pack(pady=10)
+
+    def destroy(self):
+        self.label.destroy()
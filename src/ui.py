@@ -3,11 +3,14 @@ import pystray
 from PIL import Image, ImageDraw
 import threading
 import sys
-import time
-from ctypes import windll, Structure, c_long, byref
 import tkinter as tk
 from .engine import AIEngine
 from .skills.productivity import ProductivityManager
+from .skills.reminders import ReminderEngine
+from .persistence import default_service
+from .edge_watch import EdgeWatcher, Win32PointerSource
+from .monitors import get_topology
+from .task_lists import KeyedList, VirtualList, TaskCard, EmptyLabel, TASK_ROW_HEIGHT
 from tkcalendar import Calendar
 from datetime import datetime
 
@@ -41,6 +44,7 @@ class DesktopSidebar(ctk.CTk):
         super().__init__()
         
         self.productivity = ProductivityManager()
+        self.reminders = ReminderEngine(self.productivity) # Notifies for tasks with reminder set
         self.engine = AIEngine(self.productivity)
         
         # Configuration
@@ -107,6 +111,9 @@ class DesktopSidebar(ctk.CTk):
         # Start Edge Listener
         threading.Thread(target=self.edge_listener, daemon=True).start()
 
+        # Skills load on first use; preload them once the window is up
+        self.after(500, self.engine.warm_up)
+
     def setup_chat_tab(self):
         self.tab_chat.grid_columnconfigure(0, weight=1)
         self.tab_chat.grid_rowconfigure(0, weight=1)
@@ -231,6 +238,13 @@ class DesktopSidebar(ctk.CTk):
         self.todo_list = ctk.CTkScrollableFrame(right_col, fg_color=THEME["bg_secondary"], corner_radius=10)
         self.todo_list.grid(row=3, column=0, sticky="nsew")
 
+        # Keyed views: refreshes reuse the cards already on screen
+        self.timeline_view = KeyedList(lambda: self.make_task_card(self.timeline_list, THEME["bg_main"], timed=True),
+                                       lambda: EmptyLabel(self.timeline_list, "No scheduled events."))
+        self.todo_view = KeyedList(lambda: self.make_task_card(self.todo_list, THEME["bg_secondary"], timed=False),
+                                   lambda: EmptyLabel(self.todo_list, "No pending tasks."))
+        self.deadlines_view = KeyedList(lambda: self.make_task_card(self.deadlines_list, THEME["bg_secondary"], show_date=True))
+
     def setup_add_event_form(self):
         padding_frame = ctk.CTkFrame(self.add_event_frame, fg_color="transparent")
         padding_frame.pack(padx=10, pady=10, fill="x")
@@ -315,69 +329,37 @@ class DesktopSidebar(ctk.CTk):
         self.load_calendar_dashboard(date_str)
 
     def load_calendar_dashboard(self, date_str):
-        # 1. Clear Lists
-        for widget in self.timeline_list.winfo_children(): widget.destroy()
-        for widget in self.todo_list.winfo_children(): widget.destroy()
-        for widget in self.deadlines_list.winfo_children(): widget.destroy()
+        self.current_dashboard_date = date_str
 
-        # 2. Get Data
+        # 1. Get Data
         day_tasks = self.productivity.get_tasks_for_date(date_str)
         upcoming = self.productivity.get_upcoming_tasks(10)
 
-        # 3. Populate Schedule (Timed) & Todos (Untimed)
+        # 2. Populate Schedule (Timed) & Todos (Untimed)
         timed = [t for t in day_tasks if t.get("time")]
         untimed = [t for t in day_tasks if not t.get("time")]
         
         timed.sort(key=lambda x: x["time"]) # Sort by time
-        
-        for task in timed:
-            self.create_dashboard_card(self.timeline_list, task, is_timed=True)
-            
-        for task in untimed:
-            self.create_dashboard_card(self.todo_list, task, is_timed=False)
-            
-        if not timed:
-            ctk.CTkLabel(self.timeline_list, text="No scheduled events.", text_color="gray").pack(pady=10)
-        if not untimed:
-            ctk.CTkLabel(self.todo_list, text="No pending tasks.", text_color="gray").pack(pady=10)
-
-        # 4. Populate Deadlines
-        for task in upcoming:
-            self.create_dashboard_card(self.deadlines_list, task, is_timed=bool(task.get("time")), show_date=True)
-
-    def create_dashboard_card(self, parent, task, is_timed=False, show_date=False):
-        row = ctk.CTkFrame(parent, height=40, fg_color=THEME["bg_main"] if parent == self.timeline_list else THEME["bg_secondary"], corner_radius=8)
-        row.pack(fill="x", pady=4, padx=5)
-        
-        # Checkbox
-        status_var = ctk.BooleanVar(value=task["completed"])
-        chk = ctk.CTkCheckBox(row, text="", variable=status_var, width=20, corner_radius=10, 
-                              fg_color=THEME["accent"], hover_color=THEME["accent_hover"], border_color=THEME["border"],
-                               command=lambda: self.productivity.toggle_task(task["id"]))
-        chk.pack(side="left", padx=(10, 5))
-
-        # Content
-        details_frame = ctk.CTkFrame(row, fg_color="transparent")
-        details_frame.pack(side="left", fill="x", expand=True, pady=5)
-        
-        title_text = task["title"]
-        title_lbl = ctk.CTkLabel(details_frame, text=title_text, anchor="w", font=("Arial", 12, "bold"), text_color=THEME["text"])
-        title_lbl.pack(fill="x")
-        
-        meta = []
-        if task.get("category") == "Deadline": meta.append("⚠️ Deadline")
-        if show_date: meta.append(f"📅 {task['date']}")
-        if is_timed and task.get("time"):
-            time_str = f"{task['time']}"
-            if task.get("end_time"): time_str += f" - {task['end_time']}"
-            meta.append(f"🕒 {time_str}")
-        
-        if meta:
-             ctk.CTkLabel(details_frame, text="  ".join(meta), anchor="w", font=("Arial", 10), text_color="#a6adc8").pack(fill="x")
-
-        # Delete (Tiny x)
-        ctk.CTkButton(row, text="×", width=20, height=20, fg_color="transparent", hover_color=THEME["error"], 
-                      text_color=THEME["text"], command=lambda: [self.productivity.delete_task(task["id"]), row.destroy()]).pack(side="right", padx=5)
+
+        self.timeline_view.render(timed)
+        self.todo_view.render(untimed)
+
+        # 3. Populate Deadlines
+        self.deadlines_view.render(upcoming)
+
+    def make_task_card(self, parent, fg_color, timed=None, show_date=False, on_wheel=None):
+        return TaskCard(parent, THEME, self.productivity.toggle_task, self.delete_task_ui,
+                        fg_color=fg_color, timed=timed, show_date=show_date, on_wheel=on_wheel)
+
+    def delete_task_ui(self, task_id):
+        self.productivity.delete_task(task_id)
+        self.refresh_task_views()
+
+    def refresh_task_views(self):
+        if getattr(self, "current_dashboard_date", None):
+            self.load_calendar_dashboard(self.current_dashboard_date)
+        if hasattr(self, "all_tasks_view"):
+            self.refresh_task_list()
 
     def init_tasks_view(self):
         self.tasks_frame = ctk.CTkFrame(self.tools_container, fg_color="transparent")
@@ -395,10 +377,18 @@ class DesktopSidebar(ctk.CTk):
         add_btn = ctk.CTkButton(input_area, text="+", width=30, command=self.add_task_ui, fg_color=THEME["accent"], text_color=THEME["text_dark"])
         add_btn.pack(side="right", padx=5)
         
-        # Task List
-        self.task_list_frame = ctk.CTkScrollableFrame(self.tasks_frame, fg_color="transparent")
+        # Task List (virtualized: only the rows that fit are materialized)
+        self.task_list_frame = ctk.CTkFrame(self.tasks_frame, fg_color="transparent")
         self.task_list_frame.pack(fill="both", expand=True, padx=5, pady=5)
-        
+        self.task_scrollbar = ctk.CTkScrollbar(self.task_list_frame, command=self.on_task_scroll)
+        self.task_scrollbar.pack(side="right", fill="y")
+        self.task_rows = ctk.CTkFrame(self.task_list_frame, fg_color="transparent")
+        self.task_rows.pack(side="left", fill="both", expand=True)
+        self.task_rows.bind("<Configure>", self.on_task_rows_resize)
+        self.task_rows.bind("<MouseWheel>", self.on_task_wheel)
+
+        self.all_tasks_view = VirtualList(lambda: self.make_task_card(self.task_rows, THEME["bg_secondary"], show_date=True,
+                                                                      on_wheel=self.on_task_wheel))
         self.refresh_task_list()
 
     def add_task_ui(self, event=None):
@@ -410,11 +400,28 @@ class DesktopSidebar(ctk.CTk):
         self.refresh_task_list()
 
     def refresh_task_list(self):
-        for widget in self.task_list_frame.winfo_children(): widget.destroy()
         tasks = self.productivity.get_all_tasks()
         tasks.sort(key=lambda x: x["completed"])
-        for task in tasks:
-            self.create_dashboard_card(self.task_list_frame, task, is_timed=bool(task.get("time")), show_date=True)
+        self.all_tasks_view.set_items(tasks)
+        self.task_scrollbar.set(*self.all_tasks_view.fraction())
+
+    def on_task_rows_resize(self, event):
+        self.all_tasks_view.set_visible_rows(event.height // TASK_ROW_HEIGHT)
+        self.task_scrollbar.set(*self.all_tasks_view.fraction())
+
+    def on_task_scroll(self, action, amount, unit=None):
+        view = self.all_tasks_view
+        if action == "moveto":
+            view.scroll_to(round(float(amount) * len(view.items)))
+        elif unit == "pages":
+            view.scroll_by(int(amount) * view.visible_rows)
+        else:
+            view.scroll_by(int(amount))
+        self.task_scrollbar.set(*view.fraction())
+
+    def on_task_wheel(self, event):
+        self.all_tasks_view.scroll_by(-3 if event.delta > 0 else 3)
+        self.task_scrollbar.set(*self.all_tasks_view.fraction())
 
     def init_notes_view(self):
         self.notes_frame = ctk.CTkFrame(self.tools_container, fg_color="transparent")
@@ -446,52 +453,9 @@ class DesktopSidebar(ctk.CTk):
             self.notes_frame.pack(fill="both", expand=True)
 
     def get_rightmost_monitor_geometry(self):
-        try:
-            import ctypes
-            from ctypes import windll, byref, Structure, c_long, c_int, POINTER, sizeof
-            from ctypes.wintypes import RECT, DWORD
-
-            class MONITORINFO(Structure):
-                _fields_ = [
-                    ("cbSize", DWORD),
-                    ("rcMonitor", RECT),
-                    ("rcWork", RECT),
-                    ("dwFlags", DWORD)
-                ]
-
-            monitors = []
-            
-            def _callback(hMonitor, hdcMonitor, lprcMonitor, dwData):
-                try:
-                    mi = MONITORINFO()
-                    mi.cbSize = sizeof(MONITORINFO)
-                    if windll.user32.GetMonitorInfoW(hMonitor, byref(mi)):
-                        monitors.append((mi.rcWork.left, mi.rcWork.top, mi.rcWork.right, mi.rcWork.bottom))
-                    else:
-                        r = lprcMonitor.contents
-                        monitors.append((r.left, r.top, r.right, r.bottom))
-                    return 1
-                except:
-                    return 0
-            
-            MonitorEnumProc = ctypes.WINFUNCTYPE(c_int, c_long, c_long, POINTER(RECT), c_long)
-            cb = MonitorEnumProc(_callback)
-            windll.user32.EnumDisplayMonitors(0, 0, cb, 0)
-            
-            if not monitors:
-                rect = RECT()
-                windll.user32.SystemParametersInfoW(48, 0, byref(rect), 0)
-                return rect.right - rect.left, rect.bottom - rect.top, rect.left, rect.top
-            
-            monitors.sort(key=lambda m: m[2], reverse=True)
-            best_mon = monitors[0] 
-            
-            l, t, r, b = best_mon
-            width = r - l
-            height = b - t 
-            return width, height, l, t
-        except Exception as e:
-            return self.winfo_screenwidth(), self.winfo_screenheight() - 48, 0, 0
+        # Shared cached topology (work area, i.e. without the taskbar)
+        return get_topology(work_area=True).rightmost(
+            fallback=lambda: (self.winfo_screenwidth(), self.winfo_screenheight() - 48, 0, 0))
 
     def change_music_mode(self, choice):
         self.engine.set_music_mode(choice)
@@ -547,6 +511,8 @@ class DesktopSidebar(ctk.CTk):
 
     def quit_app(self, icon=None, item=None):
         self.icon.stop()
+        # Write any debounced changes before the process goes away
+        default_service().flush()
         self.destroy()
         sys.exit()
 
@@ -631,59 +597,13 @@ class DesktopSidebar(ctk.CTk):
         threading.Thread(target=self.icon.run, daemon=True).start()
 
     def edge_listener(self):
-        class POINT(Structure):
-            _fields_ = [("x", c_long), ("y", c_long)]
-
-        hover_start_time = 0
-        is_hovering = False
-        
-        # Buffer variables for auto-close
-        leave_start_time = 0
-        is_leaving = False
-        
-        while True:
-            try:
-                pt = POINT()
-                windll.user32.GetCursorPos(byref(pt))
-                w, h, x_off, y_off = self.get_rightmost_monitor_geometry()
-                
-                right_edge_x = x_off + w
-                sidebar_left_x = right_edge_x - self.sidebar_width
-                
-                # 1. Opening Logic
-                on_edge = False
-                if pt.x >= right_edge_x - 3:
-                    on_edge = True
-                
-                if on_edge and not self.is_open:
-                    if not is_hovering:
-                        is_hovering = True
-                        hover_start_time = time.time()
-                    elif time.time() - hover_start_time >= 0.5:
-                        self.after(0, self.slide_in)
-                        is_hovering = False
-                else:
-                    is_hovering = False
-                
-                # 2. Auto-Close Logic
-                if self.is_open:
-                    # Check if cursor is strictly OUTSIDE the sidebar box
-                    # We give a small buffer (e.g. 50px left) so it doesn't close immediately if you slip
-                    inside_x = (pt.x >= sidebar_left_x)
-                    
-                    if not inside_x:
-                        if not is_leaving:
-                            is_leaving = True
-                            leave_start_time = time.time()
-                        elif time.time() - leave_start_time >= 0.3: # 300ms delay
-                            self.after(0, self.slide_out)
-                            is_leaving = False
-                    else:
-                        is_leaving = False
-                    
-            except Exception as e:
-                pass
-            time.sleep(0.1)
+        # Adaptive polling with a cached monitor layout instead of a 100 ms enumeration loop
+        self.edge_watcher = EdgeWatcher(Win32PointerSource(), get_topology(work_area=True),
+                                        is_open=lambda: self.is_open,
+                                        on_open=lambda: self.after(0, self.slide_in),
+                                        on_close=lambda: self.after(0, self.slide_out),
+                                        sidebar_width=self.sidebar_width, open_delay=0.5, close_delay=0.3)
+        self.edge_watcher.run()
 
 if __name__ == "__main__":
     app = DesktopSidebar()
@@ -117,7 +117,7 @@ async function loadMusicHistory() {
     list.innerHTML = '<div style="padding:10px; color:#aaa">Loading...</div>';
     
     try {
-        const history = await pywebview.api.get_music_history();
+        const history = await pywebview.api.get_music_history(50);
         list.innerHTML = '';
         
         if(!history || history.length === 0) {
@@ -142,7 +142,8 @@ async function loadMusicHistory() {
             const meta = document.createElement('div');
             meta.className = 'task-meta';
             const date = new Date(item.timestamp).toLocaleString();
-            meta.textContent = `${item.type} • ${date}`;
+            const plays = item.plays > 1 ? ` • ${item.plays} plays` : '';
+            meta.textContent = `${item.type} • ${date}${plays}`;
             
             content.appendChild(title);
             content.appendChild(meta);
@@ -207,6 +208,11 @@ if(chatInput) {
     });
 }
 
+// Commands run in the background; their bubbles wait here until onCommandResult fills them in
+const pendingCommands = new Map(); // job_id -> bubble
+// A fast job can report back before submit_command's reply arrives; hold it until then
+const unclaimedResults = new Map(); // job_id -> job
+
 async function sendMessage() {
     const text = chatInput.value.trim();
     if (!text) return;
@@ -214,15 +220,54 @@ async function sendMessage() {
     addMessage('You', text);
     chatInput.value = '';
     
+    const bubble = addMessage('AI', '...');
+    if (bubble) bubble.classList.add('pending');
     try {
-        const response = await pywebview.api.process_command(text);
-        addMessage('AI', response);
-        
-        if (response.includes("Scheduled") || response.includes("Added") || response.includes("deadline")) {
-            loadDashboard();
+        const { job_id } = await pywebview.api.submit_command(text);
+        const early = unclaimedResults.get(job_id);
+        if (early) {
+            unclaimedResults.delete(job_id);
+            showCommandResult(bubble, early);
+            return;
+        }
+        if (bubble) {
+            bubble.title = 'Click to cancel';
+            bubble.onclick = () => cancelCommand(job_id);
         }
+        pendingCommands.set(job_id, bubble);
     } catch (err) {
-        addMessage('AI', 'Error: ' + err);
+        showCommandResult(bubble, { status: 'error', result: 'Error: ' + err });
+    }
+}
+
+async function cancelCommand(jobId) {
+    if (pendingCommands.has(jobId)) await pywebview.api.cancel_command(jobId);
+}
+
+// Called from Python (window.evaluate_js) when a submitted command finishes
+window.onCommandResult = function(job) {
+    if (!pendingCommands.has(job.job_id)) {
+        unclaimedResults.set(job.job_id, job);
+        return;
+    }
+    const bubble = pendingCommands.get(job.job_id);
+    pendingCommands.delete(job.job_id);
+    showCommandResult(bubble, job);
+};
+
+function showCommandResult(bubble, job) {
+    const response = job.result || '';
+    if (bubble) {
+        bubble.textContent = response;
+        bubble.classList.remove('pending');
+        bubble.title = '';
+        bubble.onclick = null;
+    } else {
+        addMessage('AI', response);
+    }
+    
+    if (job.status === 'done' && (response.includes("Scheduled") || response.includes("Added") || response.includes("deadline"))) {
+        loadDashboard();
     }
 }
 
@@ -239,36 +284,94 @@ function addMessage(sender, text) {
     msgDiv.appendChild(bubble);
     history.appendChild(msgDiv);
     history.scrollTop = history.scrollHeight;
+    return bubble;
 }
 
 // Dashboard
+// Last payload shown, kept current with deltas: {view_date, revision, tasks: Map(id -> task), upcoming}
+let dashboardCache = null;
+
 async function loadDashboard() {
     try {
         const dateStr = formatDateISO(selectedDate);
+        if (dashboardCache && dashboardCache.view_date === dateStr) {
+            // Only fetch what changed since the payload we already have
+            const delta = await pywebview.api.get_dashboard_delta(dashboardCache.revision, dateStr);
+            if (delta.full) {
+                showDashboard(delta);
+            } else if (applyDashboardDelta(delta)) {
+                renderDashboard(cachedDashboard());
+            }
+            return;
+        }
         const data = await pywebview.api.get_dashboard_data(dateStr);
-        
-        // Update header
-        const prettyDate = selectedDate.toDateString();
-        const schedHeader = document.getElementById('schedule-header');
-        if(schedHeader) schedHeader.textContent = `Schedule for ${prettyDate}`;
-
-        // Split Tasks
-        const dayTimed = data.tasks.filter(t => t.time);
-        const dayUntimed = data.tasks.filter(t => !t.time && !t.completed);
-        
-        // Filter upcoming to remove duplicates if they are already in dayTimed
-        const dayIds = new Set(data.tasks.map(t => t.id));
-        const relevantUpcoming = data.upcoming.filter(u => !dayIds.has(u.id));
-        
-        const scheduleItems = [...dayTimed, ...relevantUpcoming];
-        
-        renderSchedule(scheduleItems);
-        renderTodos(dayUntimed);
+        showDashboard(data);
     } catch(err) {
         console.error("Dashboard Load Error", err);
     }
 }
 
+function showDashboard(data) {
+    dashboardCache = {
+        view_date: data.view_date,
+        revision: data.revision,
+        tasks: new Map(data.tasks.map(t => [t.id, t])),
+        upcoming: data.upcoming
+    };
+    renderDashboard(data);
+}
+
+// Returns true if anything visible changed
+function applyDashboardDelta(delta) {
+    const cache = dashboardCache;
+    const upcomingChanged = JSON.stringify(delta.upcoming) !== JSON.stringify(cache.upcoming);
+    cache.revision = delta.revision;
+    cache.upcoming = delta.upcoming;
+    delta.removed.forEach(id => cache.tasks.delete(id));
+    delta.upserted.forEach(t => cache.tasks.set(t.id, t));
+    return upcomingChanged || delta.removed.length > 0 || delta.upserted.length > 0;
+}
+
+function cachedDashboard() {
+    return {
+        view_date: dashboardCache.view_date,
+        revision: dashboardCache.revision,
+        tasks: [...dashboardCache.tasks.values()].sort((a, b) => a.id - b.id),
+        upcoming: dashboardCache.upcoming
+    };
+}
+
+// Sends task mutations in one round trip; the response already holds the refreshed dashboard
+async function applyBatch(operations) {
+    try {
+        const data = await pywebview.api.apply_batch(operations, formatDateISO(selectedDate));
+        if (data.error) console.error("Batch Error", data.error);
+        showDashboard(data);
+    } catch(err) {
+        console.error("Batch Error", err);
+    }
+}
+
+function renderDashboard(data) {
+    // Update header
+    const prettyDate = selectedDate.toDateString();
+    const schedHeader = document.getElementById('schedule-header');
+    if(schedHeader) schedHeader.textContent = `Schedule for ${prettyDate}`;
+
+    // Split Tasks
+    const dayTimed = data.tasks.filter(t => t.time);
+    const dayUntimed = data.tasks.filter(t => !t.time && !t.completed);
+    
+    // Filter upcoming to remove duplicates if they are already in dayTimed
+    const dayIds = new Set(data.tasks.map(t => t.id));
+    const relevantUpcoming = data.upcoming.filter(u => !dayIds.has(u.id));
+    
+    const scheduleItems = [...dayTimed, ...relevantUpcoming];
+    
+    renderSchedule(scheduleItems);
+    renderTodos(dayUntimed);
+}
+
 function renderSchedule(items) {
     const container = document.getElementById('deadlines-list');
     if(!container) return;
@@ -308,8 +411,7 @@ function createTaskElement(item, showDate) {
     const check = document.createElement('div');
     check.className = `task-check ${item.completed ? 'completed' : ''}`;
     check.onclick = async () => {
-        await pywebview.api.toggle_task(item.id);
-        loadDashboard();
+        await applyBatch([{op: 'toggle', id: item.id}]);
     };
     
     const content = document.createElement('div');
@@ -331,8 +433,7 @@ function createTaskElement(item, showDate) {
     del.title = "Delete Task";
     del.onclick = async () => {
         if(confirm("Delete this task?")) {
-            await pywebview.api.delete_task(item.id);
-            loadDashboard();
+            await applyBatch([{op: 'delete', id: item.id}]);
         }
     };
     
@@ -347,8 +448,7 @@ async function addTask() {
     const text = prompt("Enter new task:");
     if(!text) return;
     
-    await pywebview.api.quick_add_task(text);
-    loadDashboard();
+    await applyBatch([{op: 'add', title: text}]);
 }
 
 function updateSetting(key, val) {
@@ -0,0 +1,109 @@
+import time
+from src.animation import SlideAnimator
+
+class FakeWindow:
+    """
+    Records every move with its timestamp; move_cost simulates a busy window manager.
+    """
+    def __init__(self, move_cost=0.0):
+        self.move_cost = move_cost
+        self.moves = []
+        self.events = []
+
+    def move(self, x, y):
+        if self.move_cost:
+            time.sleep(self.move_cost)
+        self.moves.append((time.monotonic(), x, y))
+
+    def xs(self):
+        return [x for _, x, _ in self.moves]
+
+def test_slide_runs_off_the_caller_thread():
+    window = FakeWindow(move_cost=0.002)
+    animator = SlideAnimator(window, duration=0.15)
+    start = time.monotonic()
+    animator.slide(1920, 1120, 0, on_start=lambda: window.events.append("start"),
+                   on_done=lambda: window.events.append("done"))
+    assert time.monotonic() - start < 0.01 # Caller is not blocked by the animation
+    assert animator.wait(2)
+
+    xs = window.xs()
+    assert xs[-1] == 1120
+    assert all(a >= b for a, b in zip(xs, xs[1:])) # Monotonic towards the target
+    assert window.events == ["start", "done"]
+    elapsed = window.moves[-1][0] - window.moves[0][0]
+    assert 0.12 <= elapsed <= 0.3, elapsed
+
+    stats = animator.get_frame_stats()
+    assert stats["frames"] == len(window.moves) - 1
+    assert stats["max_ms"] >= stats["avg_ms"] > 0
+    assert stats["last_duration_ms"] >= 150
+
+def test_slow_frames_do_not_stretch_the_animation():
+    # 40 ms per move: the old fixed-step loop (16 steps) would take well over half a second
+    window = FakeWindow(move_cost=0.04)
+    animator = SlideAnimator(window, duration=0.15)
+    animator.slide(1920, 1120, 0)
+    assert animator.wait(2)
+    elapsed = window.moves[-1][0] - window.moves[0][0]
+    assert elapsed <= 0.15 + 0.1, elapsed
+    assert window.xs()[-1] == 1120
+    assert len(window.moves) < 16
+
+def test_opposite_direction_takes_over_without_jumping():
+    window = FakeWindow(move_cost=0.001)
+    animator = SlideAnimator(window, duration=0.3)
+    done = []
+    animator.slide(1920, 1120, 0, on_done=lambda: done.append("in"))
+    time.sleep(0.1)
+    count = len(window.moves)
+    last_x = window.xs()[-1]
+    animator.slide(1920, 1920, 0, on_start=lambda: done.append("unexpected start"),
+                   on_done=lambda: done.append("out"))
+    assert animator.wait(2)
+
+    after = window.xs()[count:]
+    assert after[-1] == 1920
+    # Continues from where the window was, in the opposite direction
+    assert abs(after[0] - last_x) < 200
+    assert all(a <= b for a, b in zip(after[1:], after[2:]))
+    assert done == ["out"]
+    assert animator.get_frame_stats()["cancelled"] == 1
+
+def test_zero_duration_snaps():
+    window = FakeWindow()
+    animator = SlideAnimator(window, duration=0)
+    animator.slide(0, 500, 10)
+    assert animator.wait(1)
+    assert window.moves[-1][1:] == (500, 10)
+
+def test_failing_callbacks_keep_the_thread_alive():
+    window = FakeWindow()
+    animator = SlideAnimator(window, duration=0)
+
+    def fail():
+        raise OSError("window gone")
+
+    animator.slide(0, 100, 10, on_start=fail)
+    assert animator.wait(1) and not window.moves
+    animator.slide(0, 200, 10, on_done=fail)
+    assert animator.wait(1) and window.moves[-1][1:] == (200, 10)
+
+    move = window.move
+    window.move = lambda x, y: fail()
+    animator.slide(200, 300, 10)
+    assert animator.wait(1)
+    window.move = move
+
+    done = []
+    animator.slide(200, 400, 10, on_done=lambda: done.append(1))
+    assert animator.wait(1) and done == [1]
+    assert window.moves[-1][1:] == (400, 10) and animator._thread.is_alive()
+
+if __name__ == "__main__":
+    test_slide_runs_off_the_caller_thread()
+    test_slow_frames_do_not_stretch_the_animation()
+    test_opposite_direction_takes_over_without_jumping()
+    test_zero_duration_snaps()
+    test_failing_callbacks_keep_the_thread_alive()
+    print("SUCCESS: Slide animation checks passed.")
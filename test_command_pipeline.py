@@ -0,0 +1,124 @@
+import threading
+import time
+from src.command_pipeline import CommandPipeline
+
+class FakeEngine:
+    """
+    Slow skills keyed by the first word of the command; tracks peak concurrency per skill.
+    """
+    DELAYS = {"weather": 0.2, "music": 0.1, "search": 0.15, "hang": 5.0, "boom": 0.0}
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = {}
+        self.peak = {}
+
+    def classify(self, text):
+        skill = text.split()[0]
+        return skill if skill in self.DELAYS else "chat"
+
+    def process(self, text):
+        skill = self.classify(text)
+        with self.lock:
+            self.active[skill] = self.active.get(skill, 0) + 1
+            self.peak[skill] = max(self.peak.get(skill, 0), self.active[skill])
+        try:
+            if skill == "boom":
+                raise RuntimeError("skill crashed")
+            time.sleep(self.DELAYS.get(skill, 0.01))
+            return f"ok: {text}"
+        finally:
+            with self.lock:
+                self.active[skill] -= 1
+
+def _pipeline(engine, delivered=None, **kwargs):
+    on_result = (lambda job: delivered.append(job)) if delivered is not None else None
+    return CommandPipeline(engine.process, engine.classify, on_result=on_result, max_workers=16,
+                           limits={"music": 1, "weather": 2, "search": 2, "hang": 1}, **kwargs)
+
+def test_fifty_concurrent_commands():
+    engine = FakeEngine()
+    delivered = []
+    pipeline = _pipeline(engine, delivered)
+    commands = ([f"weather in city {i}" for i in range(10)] + [f"music add song {i}" for i in range(5)]
+                + [f"search topic {i}" for i in range(10)] + [f"hello {i}" for i in range(25)])
+
+    start = time.monotonic()
+    ids = [pipeline.submit(c) for c in commands]
+    submit_ms = (time.monotonic() - start) * 1000
+    # Every job id comes back without waiting on any skill (sequentially this is ~3.5 s)
+    assert submit_ms < 100, submit_ms
+
+    jobs = [pipeline.wait(i, timeout=10) for i in ids]
+    elapsed = time.monotonic() - start
+    assert all(j["status"] == "done" for j in jobs)
+    assert [j["result"] for j in jobs] == [f"ok: {c}" for c in commands]
+    # Per-skill limits were respected
+    assert engine.peak["music"] == 1
+    assert engine.peak["weather"] <= 2 and engine.peak["search"] <= 2
+    # Chat commands never queue behind slow skills
+    chat_queue = max(j["queue_ms"] for j in jobs if j["skill"] == "chat")
+    assert chat_queue < 150, chat_queue
+    # 10 weather jobs at 2 at a time dominate: ~1 s, not the 3.5 s sum
+    assert elapsed < 2.0, elapsed
+
+    stats = pipeline.get_stats()
+    assert stats["done"] == 50 and stats["queue_max_ms"] >= stats["queue_p50_ms"]
+    print(f"50 commands: submit {submit_ms:.1f} ms, total {elapsed * 1000:.0f} ms, "
+          f"queue p50 {stats['queue_p50_ms']:.1f} ms, max {stats['queue_max_ms']:.1f} ms")
+
+    time.sleep(0.1)
+    assert sorted(j["job_id"] for j in delivered) == sorted(ids)
+    pipeline.stop()
+
+def test_timeout_error_and_cancel():
+    engine = FakeEngine()
+    delivered = []
+    pipeline = _pipeline(engine, delivered, timeouts={"hang": 0.2})
+
+    hung = pipeline.submit("hang forever")
+    queued = pipeline.submit("hang again") # Waits behind the first for the single slot
+    crashed = pipeline.submit("boom now")
+
+    assert pipeline.cancel(queued)
+    assert pipeline.wait(queued, timeout=2)["status"] == "cancelled"
+    job = pipeline.wait(hung, timeout=2)
+    assert job["status"] == "timeout"
+    assert job["run_ms"] < 500
+    job = pipeline.wait(crashed, timeout=2)
+    assert job["status"] == "error" and "skill crashed" in job["result"]
+    assert not pipeline.cancel(crashed) # Already finished
+
+    # The hung call released its slot on timeout
+    running = pipeline.submit("hang once more")
+    time.sleep(0.05)
+    assert pipeline.get_job(running)["status"] == "running"
+    assert pipeline.cancel(running)
+    assert pipeline.wait(running, timeout=2)["status"] == "cancelled"
+
+    time.sleep(0.1)
+    assert {j["job_id"]: j["status"] for j in delivered} == {
+        hung: "timeout", queued: "cancelled", crashed: "error", running: "cancelled"}
+    pipeline.stop()
+
+def test_finished_jobs_are_bounded():
+    engine = FakeEngine()
+    pipeline = _pipeline(engine, keep_finished=10)
+    ids = [pipeline.submit(f"hello {i}") for i in range(300)]
+    assert pipeline.wait(ids[-1], timeout=10)["status"] == "done"
+    deadline = time.monotonic() + 5
+    while pipeline.get_stats()["done"] < 300:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    stats = pipeline.get_stats()
+    assert stats["jobs"] == 300 and stats["held"] == len(pipeline.jobs) == 10
+    assert pipeline.get_job(ids[0]) is None # Dropped
+    assert pipeline.get_job(ids[-1])["result"] == "ok: hello 299"
+    pipeline.stop()
+
+if __name__ == "__main__":
+    test_fifty_concurrent_commands()
+    test_timeout_error_and_cancel()
+    test_finished_jobs_are_bounded()
+    print("SUCCESS: Command pipeline checks passed.")
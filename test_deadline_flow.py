@@ -3,10 +3,17 @@ from src.skills.productivity import ProductivityManager
 from datetime import datetime, timedelta
 import os
 
+TEST_FILES = ["test_productivity_deadline.json", "test_productivity_deadline.json.journal",
+              "test_productivity_deadline.json.journal.old", "test_productivity_deadline.json.tmp"]
+
+def _cleanup():
+    for path in TEST_FILES:
+        if os.path.exists(path): os.remove(path)
+
 def test_deadline_flow():
-    # Use a dummy file
-    test_file = "test_productivity_deadline.json"
-    if os.path.exists(test_file): os.remove(test_file)
+    # Use a dummy file (mutations also go to a journal next to it)
+    test_file = TEST_FILES[0]
+    _cleanup()
     
     pm = ProductivityManager(test_file)
     engine = AIEngine(pm)
@@ -41,7 +48,8 @@ def test_deadline_flow():
         print("FAILURE: Deadlines missing or incorrect category.")
 
     # Cleanup
-    if os.path.exists(test_file): os.remove(test_file)
+    pm.close()
+    _cleanup()
 
 if __name__ == "__main__":
     test_deadline_flow()
@@ -0,0 +1,89 @@
+from src.edge_watch import EdgeWatcher, FakePointerSource
+from src.monitors import FakeMonitorSource, MonitorTopology
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class Sidebar:
+    """
+    Records open/close calls like slide_in/slide_out would.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.open = False
+        self.events = []
+
+    def on_open(self):
+        self.open = True
+        self.events.append(("open", self.clock()))
+
+    def on_close(self):
+        self.open = False
+        self.events.append(("close", self.clock()))
+
+def _watcher(path, monitors=None, **kwargs):
+    clock = FakeClock()
+    sidebar = Sidebar(clock)
+    source = monitors or FakeMonitorSource()
+    watcher = EdgeWatcher(FakePointerSource(path, clock), MonitorTopology(source),
+                          is_open=lambda: sidebar.open, on_open=sidebar.on_open, on_close=sidebar.on_close,
+                          sidebar_width=800, clock=clock, **kwargs)
+    return watcher, clock, sidebar, source
+
+def _drive(watcher, clock, until):
+    while clock.now < until:
+        clock.now += watcher.step()
+
+def test_idle_cursor_backs_off():
+    watcher, clock, sidebar, source = _watcher(lambda t: (500, 500))
+    _drive(watcher, clock, 60)
+    assert sidebar.events == []
+    # The old listener woke 600 times in a minute
+    assert watcher.wakeups <= 125, watcher.wakeups
+    # Monitor layout enumerated once, not on every tick
+    assert source.enumerations == 1
+
+def test_open_and_close_sequence():
+    def path(t):
+        if t < 5: return (300, 500)
+        if t < 10: return (1919, 500)    # Hover on the right edge
+        if t < 20: return (1500, 500)    # Inside the sidebar
+        return (200, 500)                # Left it
+    watcher, clock, sidebar, source = _watcher(path)
+    _drive(watcher, clock, 30)
+
+    assert [e for e, _ in sidebar.events] == ["open", "close"]
+    opened, closed = sidebar.events[0][1], sidebar.events[1][1]
+    # Delays are respected and the back-off adds at most one max_interval of latency
+    assert 5.3 <= opened <= 5.3 + watcher.max_interval + 1e-9, opened
+    assert 20.4 <= closed <= 20.4 + watcher.max_interval + 1e-9, closed
+    assert watcher.wakeups < 300 # 100 ms polling: 300
+
+def test_brief_hover_does_not_open():
+    def path(t):
+        return (1919, 500) if 5 <= t < 5.2 else (1000, 500)
+    watcher, clock, sidebar, _ = _watcher(path, max_interval=0.1, poll_interval=0.05)
+    _drive(watcher, clock, 10)
+    assert sidebar.events == []
+
+def test_display_change_moves_the_edge():
+    monitors = FakeMonitorSource([(0, 0, 1920, 1080)])
+    watcher, clock, sidebar, source = _watcher(lambda t: (2559, 500) if t > 5 else (100, 100), monitors)
+    _drive(watcher, clock, 3)
+    # A second monitor appears to the right; the cursor then sits on its edge
+    monitors.layout.append((1920, 0, 2560, 1440))
+    _drive(watcher, clock, 10)
+    assert [e for e, _ in sidebar.events] == ["open"]
+    assert source.enumerations == 2
+    assert watcher.geometry.rightmost() == (640, 1440, 1920, 0)
+
+if __name__ == "__main__":
+    test_idle_cursor_backs_off()
+    test_open_and_close_sequence()
+    test_brief_hover_does_not_open()
+    test_display_change_moves_the_edge()
+    print("SUCCESS: Edge watcher checks passed.")
@@ -0,0 +1,163 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import requests
+from src.net import HttpClient
+from src.persistence import PersistenceService
+from src.skills import translator as translator_module
+from src.skills.translator import GoogleProvider, TranslatorSkill
+
+class StubServer(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    lock = threading.Lock()
+    hits = {}
+    active = 0
+    peak = 0
+    ports = set()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with StubServer.lock:
+            StubServer.hits[url.path] = StubServer.hits.get(url.path, 0) + 1
+            StubServer.active += 1
+            StubServer.peak = max(StubServer.peak, StubServer.active)
+            StubServer.ports.add(self.client_address[1])
+            hits = StubServer.hits[url.path]
+        try:
+            if url.path == "/flaky" and hits <= 2:
+                return self._send(503, "busy")
+            if url.path == "/slow":
+                time.sleep(float(query.get("delay", 0.05)))
+            self._send(200, "ok")
+        finally:
+            with StubServer.lock:
+                StubServer.active -= 1
+
+    def _send(self, status, text):
+        data = text.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except BrokenPipeError:
+            pass
+
+    def log_message(self, *args):
+        pass
+
+def _serve():
+    StubServer.hits, StubServer.active, StubServer.peak, StubServer.ports = {}, 0, 0, set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def test_keep_alive_and_stats():
+    server, base = _serve()
+    client = HttpClient()
+    try:
+        for _ in range(20):
+            assert client.get(base + "/ok").text == "ok"
+        stats = client.get_stats()
+        assert stats["requests"] == 20 and stats["errors"] == 0
+        assert stats["connections"] == 1 and len(StubServer.ports) == 1
+        host = stats["hosts"][f"127.0.0.1:{server.server_port}"]
+        assert host["p95_ms"] >= host["p50_ms"] > 0
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+def test_retry_with_backoff():
+    server, base = _serve()
+    client = HttpClient(retries=2, backoff=0.05)
+    try:
+        start = time.perf_counter()
+        response = client.get(base + "/flaky")
+        assert response.status_code == 200
+        assert StubServer.hits["/flaky"] == 3
+        assert time.perf_counter() - start >= 0.05 # Backed off between attempts
+        assert client.get_stats()["hosts"][f"127.0.0.1:{server.server_port}"]["retries"] == 2
+
+        # Out of retries: the last response is returned, not an exception
+        StubServer.hits["/flaky"] = 0
+        assert HttpClient(retries=1, backoff=0).get(base + "/flaky").status_code == 503
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+def test_per_host_limit():
+    server, base = _serve()
+    client = HttpClient(per_host=2)
+    try:
+        threads = [threading.Thread(target=client.get, args=(base + "/slow?delay=0.05",)) for _ in range(8)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        assert StubServer.hits["/slow"] == 8
+        assert StubServer.peak <= 2
+        assert client.get_stats()["connections"] <= 2
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+def test_default_timeout_and_errors():
+    server, base = _serve()
+    client = HttpClient(timeout=0.05, retries=0)
+    try:
+        try:
+            client.get(base + "/slow?delay=0.5")
+            assert False, "expected a timeout"
+        except requests.exceptions.RequestException:
+            pass
+        assert client.get_stats()["errors"] == 1
+
+        with client.timed("library"):
+            pass
+        assert client.get_stats()["hosts"]["library"]["requests"] == 1
+    finally:
+        client.close()
+        server.shutdown()
+        server.server_close()
+
+class FakeGoogleTranslator:
+    """Mimics deep_translator's GoogleTranslator interface."""
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, text):
+        return f"[{self.target}] {text}"
+
+def test_translator_timed_through_shared_client():
+    client = HttpClient()
+    persistence = PersistenceService(debounce=60)
+    original = translator_module.GoogleTranslator
+    translator_module.GoogleTranslator = FakeGoogleTranslator
+    try:
+        translator = TranslatorSkill(provider=GoogleProvider(client), memory_file="test_http_translations.json",
+                                     persistence=persistence)
+        assert translator.translate("hello", "chinese") == "Translated to chinese: [zh-CN] hello"
+        assert translator.translate("你好", "English") == "Translated to English: [en] 你好"
+        assert translator.translate("hi", "klingon").startswith("Unsupported language")
+        assert client.get_stats()["hosts"]["google.translate"]["requests"] == 2
+
+        translator_module.GoogleTranslator = None
+        assert translator.translate("bye", "chinese") == "Translation error: deep_translator is not installed"
+        translator.close()
+    finally:
+        translator_module.GoogleTranslator = original
+        persistence.stop()
+        if os.path.exists("test_http_translations.json"): os.remove("test_http_translations.json")
+        client.close()
+
+if __name__ == "__main__":
+    test_keep_alive_and_stats()
+    test_retry_with_backoff()
+    test_per_host_limit()
+    test_default_timeout_and_errors()
+    test_translator_timed_through_shared_client()
+    print("SUCCESS: HTTP client checks passed.")
@@ -0,0 +1,71 @@
+import random
+from src.intent_router import IntentRouter
+
+def _build_router(calls):
+    def make(name, answer=True):
+        def handler(text, lower):
+            calls.append(name)
+            return f"{name}:{text}" if answer else None
+        return handler
+
+    router = IntentRouter()
+    router.register("look", make("look"), ["look"])
+    router.register("lookup", make("lookup"), ["lookup"])
+    router.register("decline", make("decline", answer=False), ["mode"])
+    router.register("dark", make("dark"), ["dark mode"])
+    router.register("night", make("night"), ["night light"])
+    router.register("light", make("light"), ["light mode"])
+    router.register("fallback", make("fallback"))
+    return router.compile()
+
+def test_priority_and_fallthrough():
+    calls = []
+    router = _build_router(calls)
+
+    assert router.dispatch("enable dark mode")[0] == "dark"
+    # The declining rule ran first but did not stop dispatch
+    assert calls == ["decline", "dark"]
+
+    assert router.dispatch("hello there") == ("fallback", "fallback:hello there")
+
+def test_prefix_keywords_are_not_shadowed():
+    calls = []
+    router = _build_router(calls)
+    # "lookup" is the longest match at that position, but "look" must still be a candidate
+    assert router.dispatch("lookup python")[0] == "look"
+
+def test_overlapping_keywords():
+    router = _build_router([])
+    names = [router.rules[p].name for p in router.candidates("night light mode")]
+    assert names == ["decline", "night", "light", "fallback"]
+
+def test_only_candidates_are_evaluated():
+    calls = []
+    router = _build_router(calls)
+    router.dispatch("night light please")
+    assert calls == ["night"]
+
+def test_classify_runs_no_handlers():
+    calls = []
+    router = _build_router(calls)
+    assert router.classify("night light please") == "night"
+    assert router.classify("dark mode") == "decline" # First keyword match, even if it would decline
+    assert router.classify("hello there") is None
+    assert calls == []
+
+def test_matches_linear_dispatch():
+    words = ["look", "lookup", "dark", "mode", "night", "light", "the", "lights", "darkmode", "moderate"]
+    rng = random.Random(7)
+    router = _build_router([])
+    for _ in range(2000):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        assert router.dispatch(text) == router.dispatch_linear(text), text
+
+if __name__ == "__main__":
+    test_priority_and_fallthrough()
+    test_prefix_keywords_are_not_shadowed()
+    test_overlapping_keywords()
+    test_only_candidates_are_evaluated()
+    test_classify_runs_no_handlers()
+    test_matches_linear_dispatch()
+    print("SUCCESS: Intent router checks passed.")
@@ -0,0 +1,85 @@
+import threading
+from src import monitors
+from src.monitors import FakeMonitorSource, MonitorTopology, get_topology, set_topology
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FailingSource(FakeMonitorSource):
+    def monitors(self):
+        raise OSError("EnumDisplayMonitors failed")
+
+def test_cached_until_layout_change_or_ttl():
+    clock = FakeClock()
+    source = FakeMonitorSource([(0, 0, 1920, 1080), (-1280, 0, 0, 1024)])
+    topology = MonitorTopology(source, ttl=30, clock=clock)
+
+    for _ in range(1000):
+        assert topology.rightmost() == (1920, 1080, 0, 0)
+    assert source.enumerations == 1
+    assert topology.get_stats() == {"hits": 999, "refreshes": 1}
+
+    # TTL expiry
+    clock.now = 31
+    topology.rightmost()
+    assert source.enumerations == 2
+
+    # Layout change is seen through the signature on the next call
+    source.layout.append((1920, 0, 4480, 1440))
+    assert topology.rightmost() == (2560, 1440, 1920, 0)
+    assert source.enumerations == 3
+
+    # Explicit display-change notification
+    topology.notify_display_change()
+    topology.rightmost()
+    assert source.enumerations == 4
+    assert topology.get_stats()["refreshes"] == 4
+
+def test_fallbacks():
+    topology = MonitorTopology(FailingSource(), fallback=(800, 600, 0, 0))
+    assert topology.rightmost() == (800, 600, 0, 0)
+    assert topology.rightmost(fallback=lambda: (1, 2, 3, 4)) == (1, 2, 3, 4)
+    assert MonitorTopology(FakeMonitorSource([])).rightmost() == (1920, 1080, 0, 0)
+
+def test_shared_topology_is_injectable():
+    saved = dict(monitors._TOPOLOGIES)
+    try:
+        fake = MonitorTopology(FakeMonitorSource([(0, 0, 2560, 1440)]))
+        set_topology(fake)
+        assert get_topology() is fake
+        assert get_topology().rightmost() == (2560, 1440, 0, 0)
+
+        work = MonitorTopology(FakeMonitorSource([(0, 0, 2560, 1400)]))
+        set_topology(work, work_area=True)
+        assert get_topology(work_area=True).rightmost() == (2560, 1400, 0, 0)
+        assert get_topology() is fake
+    finally:
+        monitors._TOPOLOGIES.clear()
+        monitors._TOPOLOGIES.update(saved)
+
+def test_concurrent_readers_enumerate_once():
+    source = FakeMonitorSource()
+    topology = MonitorTopology(source)
+    results = []
+
+    def reader():
+        for _ in range(500):
+            results.append(topology.rightmost())
+
+    threads = [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert source.enumerations == 1
+    assert set(results) == {(1920, 1080, 0, 0)}
+    assert topology.hits + topology.refreshes == 4000
+
+if __name__ == "__main__":
+    test_cached_until_layout_change_or_ttl()
+    test_fallbacks()
+    test_shared_topology_is_injectable()
+    test_concurrent_readers_enumerate_once()
+    print("SUCCESS: Monitor topology checks passed.")
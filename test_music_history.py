@@ -0,0 +1,129 @@
+import json
+import os
+from datetime import datetime, timedelta
+from src.persistence import PersistenceService
+from src.skills.music_history import MusicHistory
+
+TEST_FILE = "test_music_history.json"
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+
+    def __call__(self):
+        self.now += timedelta(seconds=1)
+        return self.now
+
+def _cleanup():
+    for path in [TEST_FILE, TEST_FILE + ".journal", TEST_FILE + ".journal.old", TEST_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _open(persistence, **kwargs):
+    return MusicHistory(TEST_FILE, persistence=persistence, clock=FakeClock(), **kwargs)
+
+def test_dedupe_move_to_front_and_counts():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    try:
+        history = _open(persistence)
+        history.record_play("youtube", "a", "Song A")
+        history.record_play("youtube", "b", "Song B")
+        history.record_play("spotify", "c", "Song C")
+        history.record_play("youtube", "a", "Song A (Live)")
+        history.record_play("youtube", "a", "Song A (Live)")
+
+        assert [e["id"] for e in history.recent()] == ["a", "c", "b"] # No duplicates further down
+        assert history.get(1)["plays"] == 3 and history.get(1)["title"] == "Song A (Live)"
+        assert history.get(1)["timestamp"] > history.get(2)["timestamp"]
+        assert history.get(4) is None
+        assert [e["id"] for e in history.most_played(2)] == ["a", "c"] # Tie on plays: most recent wins
+
+        assert history.delete(2)["id"] == "c"
+        assert [e["id"] for e in history.recent()] == ["a", "b"]
+        history.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_capacity_evicts_least_recent():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    try:
+        history = _open(persistence, capacity=3)
+        for i in range(5):
+            history.record_play("youtube", str(i), f"Song {i}")
+        history.record_play("youtube", "2", "Song 2")
+        history.record_play("youtube", "5", "Song 5")
+        assert [e["id"] for e in history.recent()] == ["5", "2", "4"]
+        history.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_journal_replay_without_snapshot():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    try:
+        history = _open(persistence)
+        for i in range(10):
+            history.record_play("youtube", str(i % 4), f"Song {i % 4}")
+        history.delete(4)
+        before = history.recent()
+        # Every change is one appended line; nothing rewrote the snapshot
+        assert not os.path.exists(TEST_FILE)
+        with open(TEST_FILE + ".journal") as f:
+            assert len(f.readlines()) == 11
+        assert persistence.get_metrics()["writes"] == 0
+
+        # "Crash": reopen from the journal alone
+        reopened = _open(PersistenceService(debounce=60, max_delay=60))
+        assert reopened.recent() == before
+
+        reopened.clear()
+        assert len(_open(PersistenceService(debounce=60, max_delay=60))) == 0
+        history.journal.close()
+        reopened.journal.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_compaction_and_legacy_file():
+    _cleanup()
+    # Old format: newest first, no play counts, and a replayed song duplicated further down
+    legacy = [
+        {"type": "youtube", "id": "x", "title": "X", "timestamp": "2026-01-03T00:00:00"},
+        {"type": "spotify", "id": "y", "title": "Y", "timestamp": "2026-01-02T00:00:00"},
+        {"type": "youtube", "id": "x", "title": "X", "timestamp": "2026-01-01T00:00:00"},
+    ]
+    with open(TEST_FILE, "w") as f:
+        json.dump(legacy, f)
+
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        history = _open(persistence)
+        assert [(e["id"], e["plays"]) for e in history.recent()] == [("x", 2), ("y", 1)]
+        assert history.get(1)["timestamp"] == "2026-01-03T00:00:00"
+
+        history.journal.compact_min_bytes = 1024
+        for i in range(200):
+            history.record_play("youtube", f"id{i % 50}", f"Song {i % 50}")
+        expected = history.recent()
+        persistence.flush()
+        assert history.journal.rotations >= 1
+        assert not os.path.exists(TEST_FILE + ".journal.old")
+        history.close()
+
+        with open(TEST_FILE) as f:
+            snapshot = json.load(f)
+        assert snapshot[0]["id"] == expected[0]["id"] and "plays" in snapshot[0]
+        assert _open(PersistenceService(debounce=60, max_delay=60)).recent() == expected
+    finally:
+        persistence.stop()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_dedupe_move_to_front_and_counts()
+    test_capacity_evicts_least_recent()
+    test_journal_replay_without_snapshot()
+    test_compaction_and_legacy_file()
+    print("SUCCESS: Music history checks passed.")
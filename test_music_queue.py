@@ -0,0 +1,116 @@
+import atexit
+import shutil
+import tempfile
+import threading
+import time
+from src.persistence import PersistenceService
+from src.skills import music_player
+from src.skills.music_player import MusicSkill
+from src.skills.music_queue import MusicQueue, READY
+from src.skills.youtube_resolver import cache_key
+
+class StubResolver:
+    """
+    Resolves "<name>" to ("id-<name>", "<Name>") after `latency` seconds; "missing" finds nothing.
+    """
+    def __init__(self, latency):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = []
+        self.cache = {}
+
+    def cached(self, query):
+        return self.cache.get(cache_key(query))
+
+    def resolve(self, query):
+        with self.lock:
+            self.calls.append(query)
+        time.sleep(self.latency)
+        if "missing" in query:
+            return None, None
+        result = (f"id-{cache_key(query)}", query.title())
+        self.cache[cache_key(query)] = result
+        return result
+
+DATA_DIR = tempfile.mkdtemp(prefix="desktopai-music-") # History and metadata caches stay out of the repo
+atexit.register(shutil.rmtree, DATA_DIR, True)
+
+def _skill(resolver):
+    skill = MusicSkill(persistence=PersistenceService(debounce=60), resolver=resolver, data_dir=DATA_DIR)
+    skill.set_mode("YouTube")
+    return skill
+
+def _time_adds(skill, names):
+    start = time.perf_counter()
+    replies = [skill.add_to_queue(name) for name in names]
+    return (time.perf_counter() - start) * 1000 / len(names), replies
+
+def test_add_latency_is_independent_of_resolution():
+    opened = []
+    original_open = music_player.webbrowser.open
+    music_player.webbrowser.open = opened.append
+    try:
+        results = {}
+        for latency in (0.01, 0.5):
+            skill = _skill(StubResolver(latency))
+            per_add_ms, replies = _time_adds(skill, [f"song {i}" for i in range(5)])
+            assert all("looking it up" in r for r in replies)
+            results[latency] = per_add_ms
+            assert skill.start_loop(timeout=5).startswith("Starting loop of 5 songs")
+        print("m!add latency: " + ", ".join(f"{int(l * 1000)} ms resolver -> {ms:.2f} ms/add" for l, ms in results.items()))
+        assert results[0.5] < 20, results
+        assert len(opened) == 2
+        assert opened[-1].endswith("video_ids=id-song 0,id-song 1,id-song 2,id-song 3,id-song 4")
+    finally:
+        music_player.webbrowser.open = original_open
+
+def test_pending_queries_are_deduped():
+    resolver = StubResolver(0.2)
+    queue = MusicQueue(resolver)
+    for query in ["lofi beats", "Lofi Beats", " lofi   beats ", "jazz"]:
+        queue.add(query)
+    assert queue.wait(2)
+    assert sorted(resolver.calls) == ["jazz", "lofi beats"]
+    assert [e.title for e in queue.ready()] == ["Lofi Beats", "Lofi Beats", "Lofi Beats", "Jazz"]
+    assert queue.get_stats()["deduped"] == 2
+
+    # Resolved queries come from the cache without a background lookup
+    entry = queue.add("jazz")
+    assert entry.status == READY and entry.id == "id-jazz"
+    assert len(resolver.calls) == 2
+
+def test_loop_waits_with_timeout_and_reports_misses():
+    opened = []
+    original_open = music_player.webbrowser.open
+    music_player.webbrowser.open = opened.append
+    try:
+        skill = _skill(StubResolver(0.05))
+        skill.add_to_queue("fast one")
+        skill.add_to_queue("missing track")
+        assert skill.queue.wait(2)
+        assert len(skill.queue) == 2 # The miss stays until the loop reports it
+
+        skill.resolver.latency = 1.0
+        skill.add_to_queue("slow one")
+        start = time.perf_counter()
+        reply = skill.start_loop(timeout=0.1)
+        assert time.perf_counter() - start < 0.5
+        assert reply == ("Could not find music for: missing track\n"
+                         "Starting loop of 1 songs on YouTube. (1 still resolving, skipped)"), reply
+        assert "missing track" not in skill.start_loop(timeout=0.1) # Reported once
+
+        assert skill.clear_queue() == "Queue cleared (2 items removed)."
+        assert skill.start_loop() == "The music queue is empty. Add songs with 'm!add <name>'."
+
+        skill.add_to_queue("missing track")
+        assert skill.queue.wait(2)
+        assert skill.start_loop() == "Could not find music for: missing track\nNo YouTube songs in queue to loop."
+        assert len(skill.queue) == 0
+    finally:
+        music_player.webbrowser.open = original_open
+
+if __name__ == "__main__":
+    test_add_latency_is_independent_of_resolution()
+    test_pending_queries_are_deduped()
+    test_loop_waits_with_timeout_and_reports_misses()
+    print("SUCCESS: Music queue checks passed.")
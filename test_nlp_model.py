@@ -0,0 +1,99 @@
+import json
+import os
+import random
+from src import simple_nlp
+from src.simple_nlp import SimpleIntentClassifier
+
+def reference_predict(classifier, text):
+    # The original nearest-neighbour loop: re-vectorizes every phrase on every call
+    input_vec = classifier._get_vector(text)
+    best_intent = None
+    max_score = 0.0
+    for intent, phrases in classifier.intents.items():
+        for phrase in phrases:
+            score = classifier._cosine_similarity(input_vec, classifier._get_vector(phrase))
+            if score > max_score:
+                max_score = score
+                best_intent = intent
+    if max_score < 0.3:
+        return None, 0.0
+    return best_intent, max_score
+
+def random_utterances(classifier, count, seed=3):
+    rng = random.Random(seed)
+    words = sorted(classifier.vocabulary) + ["my", "the", "please", "now", "tokyo", "can't", "!!"]
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(0, 5))) for _ in range(count)]
+
+def test_scores_identical_to_reference():
+    threshold = simple_nlp.NUMPY_MIN_POSTINGS
+    try:
+        # 0 forces the NumPy path for every query
+        for use_numpy, simple_nlp.NUMPY_MIN_POSTINGS in ((True, 0), (True, threshold), (False, threshold)):
+            classifier = SimpleIntentClassifier(use_numpy=use_numpy)
+            for text in random_utterances(classifier, 3000) + ["shutdown", "too loud in here", "turn off my computer"]:
+                assert classifier.predict(text) == reference_predict(classifier, text), (use_numpy, text)
+    finally:
+        simple_nlp.NUMPY_MIN_POSTINGS = threshold
+
+def test_predict_many_matches_predict():
+    classifier = SimpleIntentClassifier()
+    texts = random_utterances(classifier, 2000, seed=11)
+    assert classifier.predict_many(texts) == [classifier.predict(t) for t in texts]
+
+def test_rebuild_picks_up_new_intents():
+    classifier = SimpleIntentClassifier()
+    assert classifier.predict("play some jazz")[0] is None
+    classifier.intents["music.play"] = ["play some music", "play jazz"]
+    classifier.rebuild()
+    intent, score = classifier.predict("play some jazz")
+    assert intent == "music.play"
+    assert (intent, score) == reference_predict(classifier, "play some jazz")
+
+def test_predict_topk():
+    classifier = SimpleIntentClassifier()
+    ranked = classifier.predict_topk("turn up the volume", k=3)
+    assert ranked[0][0] == classifier.predict("turn up the volume")[0] == "volume.up"
+    assert len(ranked) == 3
+    assert len({intent for intent, _ in ranked}) == 3
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+    assert classifier.predict_topk("completely unrelated words") == []
+
+def test_load_intents_from_file():
+    test_file = "test_intents_load.json"
+    rng = random.Random(1)
+    intents = {f"intent.{i}": [f"alpha{i} beta{rng.randint(0, 500)} gamma{rng.randint(0, 50)}" for _ in range(20)]
+               for i in range(1000)}
+    with open(test_file, "w") as f:
+        json.dump(intents, f)
+    try:
+        for use_numpy in (True, False):
+            classifier = SimpleIntentClassifier(use_numpy=use_numpy)
+            classifier.load_intents(test_file, replace=True)
+            assert len(classifier._phrase_intents) == 20000
+            assert classifier.predict("alpha42 please") == ("intent.42", reference_predict(classifier, "alpha42 please")[1])
+            for text in random_utterances(classifier, 8):
+                assert classifier.predict(text) == reference_predict(classifier, text)
+    finally:
+        if os.path.exists(test_file): os.remove(test_file)
+
+def test_words_of_is_a_safe_prefilter():
+    classifier = SimpleIntentClassifier()
+    actions = ("system.shutdown", "system.restart", "system.lock", "volume.up", "volume.down")
+    words = classifier.words_of(actions)
+    assert "reboot" in words and "weather" not in words
+    for text in random_utterances(classifier, 2000, seed=5):
+        if words.isdisjoint(classifier._tokenize(text)):
+            # Skipping the classifier never hides one of these intents
+            assert classifier.predict(text)[0] not in actions, text
+    classifier.intents["system.lock"].append("bye computer")
+    classifier.rebuild()
+    assert "bye" in classifier.words_of(actions)
+
+if __name__ == "__main__":
+    test_scores_identical_to_reference()
+    test_predict_many_matches_predict()
+    test_rebuild_picks_up_new_intents()
+    test_predict_topk()
+    test_load_intents_from_file()
+    test_words_of_is_a_safe_prefilter()
+    print("SUCCESS: Compiled intent model matches the reference classifier.")
@@ -0,0 +1,199 @@
+import json
+import os
+import shutil
+import time
+from src import persistence as persistence_module
+from src.persistence import PersistenceService
+from src.skills.productivity_store import JsonTaskStorage
+
+TEST_FILE = "test_persistence.json"
+
+def _cleanup():
+    for path in [TEST_FILE, TEST_FILE + ".journal", TEST_FILE + ".journal.old", TEST_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def test_burst_is_coalesced_into_one_write():
+    _cleanup()
+    service = PersistenceService(debounce=0.05)
+    try:
+        data = []
+        service.register("history", TEST_FILE, lambda: data)
+        for i in range(100):
+            data.append({"id": i})
+            service.mark_dirty("history")
+
+        assert _wait_for(lambda: service.get_metrics()["writes"] == 1)
+        time.sleep(0.1)
+        metrics = service.get_metrics()
+        assert metrics["writes"] == 1
+        assert metrics["writes_avoided"] == 99
+        assert metrics["bytes_written"] == os.path.getsize(TEST_FILE)
+
+        with open(TEST_FILE) as f:
+            text = f.read()
+        # Compact separators, no indentation
+        assert "\n" not in text and ": " not in text
+        assert json.loads(text) == data
+        assert not os.path.exists(TEST_FILE + ".tmp")
+    finally:
+        service.stop()
+        _cleanup()
+
+def test_flush_writes_immediately():
+    _cleanup()
+    service = PersistenceService(debounce=60, max_delay=60)
+    try:
+        data = {"value": 1}
+        service.register("settings", TEST_FILE, lambda: data)
+        service.mark_dirty("settings")
+        assert not os.path.exists(TEST_FILE)
+
+        service.flush()
+        with open(TEST_FILE) as f:
+            assert json.load(f) == data
+        metrics = service.get_metrics()
+        assert metrics["writes"] == 1
+        assert metrics["max_flush_ms"] >= metrics["avg_flush_ms"] > 0
+
+        # Nothing dirty: flushing again is free
+        service.flush()
+        assert service.get_metrics()["writes"] == 1
+
+        # unregister flushes pending changes
+        data["value"] = 2
+        service.mark_dirty("settings")
+        service.unregister("settings")
+        with open(TEST_FILE) as f:
+            assert json.load(f) == {"value": 2}
+    finally:
+        service.stop()
+        _cleanup()
+
+def test_failed_serialization_keeps_store_dirty():
+    _cleanup()
+    service = PersistenceService(debounce=60, max_delay=60)
+    try:
+        data = {"bad": object()}
+        service.register("broken", TEST_FILE, lambda: data)
+        service.mark_dirty("broken")
+        try:
+            service.flush()
+            assert False, "serialization should fail"
+        except TypeError:
+            pass
+        assert not os.path.exists(TEST_FILE)
+
+        data["bad"] = "fixed"
+        service.flush()
+        with open(TEST_FILE) as f:
+            assert json.load(f) == {"bad": "fixed"}
+    finally:
+        service.stop()
+        _cleanup()
+
+def test_failing_store_backs_off_in_background():
+    _cleanup()
+    original = persistence_module.RETRY_DELAY
+    persistence_module.RETRY_DELAY = 0.2
+    service = PersistenceService(debounce=0.01, max_delay=0.05)
+    calls = []
+    data = {"bad": object()}
+    try:
+        def get_data():
+            calls.append(time.monotonic())
+            return data
+        service.register("broken", TEST_FILE, get_data)
+        service.mark_dirty("broken")
+        time.sleep(0.5)
+        # First attempt, then retries after 0.2 s and 0.4 s: not a busy loop
+        assert 1 <= len(calls) <= 3, len(calls)
+        assert service.get_metrics()["write_errors"] == len(calls)
+
+        data["bad"] = "fixed"
+        assert _wait_for(lambda: os.path.exists(TEST_FILE), timeout=3)
+        with open(TEST_FILE) as f:
+            assert json.load(f) == {"bad": "fixed"}
+    finally:
+        persistence_module.RETRY_DELAY = original
+        service.stop()
+        _cleanup()
+
+def test_failed_io_keeps_change_for_retry():
+    folder = "test_persistence_missing_dir"
+    shutil.rmtree(folder, ignore_errors=True)
+    original = persistence_module.RETRY_DELAY
+    persistence_module.RETRY_DELAY = 0.1
+    service = PersistenceService(debounce=60, max_delay=60)
+    path = os.path.join(folder, "data.json")
+    try:
+        service.register("store", path, lambda: {"n": 1})
+        service.mark_dirty("store")
+        try:
+            service.flush()
+            assert False, "writing into a missing folder should fail"
+        except OSError:
+            pass
+        assert service._stores["store"].first_dirty is not None # Not dropped
+        assert service.get_metrics()["write_errors"] == 1
+
+        os.mkdir(folder)
+        service.debounce = service.max_delay = 0.01
+        service.mark_dirty("store") # Wakes the writer; the retry picks the change up
+        assert _wait_for(lambda: os.path.exists(path), timeout=3)
+        with open(path) as f:
+            assert json.load(f) == {"n": 1}
+    finally:
+        persistence_module.RETRY_DELAY = original
+        service.stop()
+        shutil.rmtree(folder, ignore_errors=True)
+
+def test_rotated_journal_survives_until_snapshot():
+    _cleanup()
+    # Snapshot never written in the background during the test
+    service = PersistenceService(debounce=60, max_delay=60)
+    try:
+        storage = JsonTaskStorage(TEST_FILE, persistence=service)
+        storage.journal.compact_min_bytes = 1024
+        for i in range(1, 101):
+            storage.add_task({"id": i, "title": f"Task {i}", "date": "2030-01-01", "time": None,
+                              "end_time": None, "reminder": False, "category": "Other", "completed": False})
+        assert storage.journal.rotations == 1
+        assert os.path.exists(TEST_FILE + ".journal.old")
+        assert not os.path.exists(TEST_FILE)
+
+        # A crash now: the rotated journal still holds everything the snapshot would have
+        other = PersistenceService(debounce=60, max_delay=60)
+        reloaded = JsonTaskStorage(TEST_FILE, persistence=other)
+        assert len(reloaded.all_tasks()) == 100
+        other.unregister(reloaded._name)
+        reloaded.journal.close()
+
+        service.flush()
+        assert os.path.exists(TEST_FILE)
+        assert not os.path.exists(TEST_FILE + ".journal.old")
+        assert service.get_metrics()["writes"] == 1
+        storage.close()
+
+        final = JsonTaskStorage(TEST_FILE, persistence=other)
+        assert sorted(t["id"] for t in final.all_tasks()) == list(range(1, 101))
+        final.close()
+    finally:
+        service.stop()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_burst_is_coalesced_into_one_write()
+    test_flush_writes_immediately()
+    test_failed_serialization_keeps_store_dirty()
+    test_failing_store_backs_off_in_background()
+    test_failed_io_keeps_change_for_retry()
+    test_rotated_journal_survives_until_snapshot()
+    print("SUCCESS: Persistence service checks passed.")
@@ -0,0 +1,105 @@
+import os
+from src.persistence import PersistenceService
+from src.skills.productivity import ProductivityManager
+
+JSON_FILE = "test_productivity_batch.json"
+DB_FILE = "test_productivity_batch.db"
+
+def _cleanup():
+    for path in [JSON_FILE, JSON_FILE + ".journal", JSON_FILE + ".journal.old", JSON_FILE + ".tmp",
+                 DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"]:
+        if os.path.exists(path): os.remove(path)
+
+def _managers():
+    yield ProductivityManager(JSON_FILE)
+    yield ProductivityManager(DB_FILE, backend="sqlite")
+
+def test_batch_applies_all_operations():
+    _cleanup()
+    try:
+        for pm in _managers():
+            a = pm.add_task("Alpha", "2030-01-01")
+            b = pm.add_task("Beta", "2030-01-01")
+            c = pm.add_task("Gamma", "2030-01-02")
+            results = pm.apply_batch([
+                {"op": "toggle", "id": a["id"]},
+                {"op": "toggle", "id": b["id"]},
+                {"op": "toggle", "id": b["id"]}, # Toggles see the earlier ones in the batch
+                {"op": "update", "id": c["id"], "fields": {"title": "Gamma 2", "date": "2030-01-01", "id": 1}},
+                {"op": "add", "title": "Delta", "date": "2030-01-01", "time": "09:00"},
+                {"op": "delete", "id": a["id"]},
+            ])
+            assert results[0]["completed"] is True
+            assert results[2]["completed"] is False
+            assert results[3]["title"] == "Gamma 2"
+            assert results[4]["title"] == "Delta" and results[4]["time"] == "09:00"
+            assert results[5] is None
+
+            titles = sorted(t["title"] for t in pm.get_tasks_for_date("2030-01-01"))
+            assert titles == ["Beta", "Delta", "Gamma 2"]
+            assert pm.get_tasks_for_date("2030-01-02") == []
+            pm.close()
+    finally:
+        _cleanup()
+
+def test_invalid_batch_changes_nothing():
+    _cleanup()
+    try:
+        for pm in _managers():
+            a = pm.add_task("Alpha", "2030-01-01")
+            before = pm.get_all_tasks()
+            for bad in ([{"op": "toggle", "id": a["id"]}, {"op": "toggle", "id": -1}],
+                        [{"op": "delete", "id": a["id"]}, {"op": "toggle", "id": a["id"]}],
+                        [{"op": "add", "title": ""}],
+                        [{"op": "toggle", "id": a["id"]}, {"op": "update", "id": a["id"], "fields": ["title"]}],
+                        [{"op": "update", "id": a["id"], "fields": "Beta"}],
+                        [{"op": "update", "id": a["id"], "fields": {"date": 20261020}}],
+                        [{"op": "toggle", "id": a["id"]}, {"op": "update", "id": a["id"], "fields": {"date": "20/10/2026"}}],
+                        [{"op": "update", "id": a["id"], "fields": {"time": "25:00"}}],
+                        [{"op": "update", "id": a["id"], "fields": {"completed": "yes"}}],
+                        [{"op": "update", "id": a["id"], "fields": {"title": None}}],
+                        [{"op": "add", "title": "Beta", "date": "tomorrow"}],
+                        [{"op": "add", "title": "Beta", "time": 14}],
+                        [{"op": "toggle", "id": [a["id"]]}],
+                        ["x"],
+                        None,
+                        [{"op": "explode"}]):
+                try:
+                    pm.apply_batch(bad)
+                    assert False, f"batch should be rejected: {bad}"
+                except ValueError:
+                    pass
+            assert pm.get_all_tasks() == before
+            assert pm.get_tasks_for_date("2030-01-01") == before # Indexes untouched too
+            pm.close()
+    finally:
+        _cleanup()
+
+def test_batch_is_one_journal_record():
+    _cleanup()
+    try:
+        service = PersistenceService(debounce=60, max_delay=60)
+        pm = ProductivityManager(JSON_FILE, persistence=service)
+        ids = [pm.add_task(f"Task {i}", "2030-01-01")["id"] for i in range(50)]
+        appends = service.get_metrics()["mutations"]
+        pm.apply_batch([{"op": "toggle", "id": i} for i in ids])
+        assert service.get_metrics()["mutations"] == appends + 1
+        pm.close()
+
+        # A torn batch (crash mid-append) is dropped as a whole
+        with open(JSON_FILE + ".journal") as f:
+            lines = f.readlines()
+        with open(JSON_FILE + ".journal", "w") as f:
+            f.writelines(lines[:-1])
+            f.write(lines[-1][:len(lines[-1]) // 2])
+        reloaded = ProductivityManager(JSON_FILE)
+        assert not any(t["completed"] for t in reloaded.get_all_tasks())
+        reloaded.close()
+    finally:
+        _cleanup()
+
+if __name__ == "__main__":
+    test_batch_applies_all_operations()
+    test_invalid_batch_changes_nothing()
+    test_batch_is_one_journal_record()
+    print("SUCCESS: Productivity batch checks passed.")
@@ -0,0 +1,141 @@
+import os
+import random
+from datetime import datetime, timedelta
+from src.skills import productivity
+from src.skills.productivity import ProductivityManager
+
+JSON_FILE = "test_productivity_delta.json"
+DB_FILE = "test_productivity_delta.db"
+
+def _cleanup():
+    for path in [JSON_FILE, JSON_FILE + ".journal", JSON_FILE + ".journal.old", JSON_FILE + ".tmp",
+                 DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"]:
+        if os.path.exists(path): os.remove(path)
+
+class DashboardClient:
+    """
+    Mirrors the delta handling in web/script.js.
+    """
+    def __init__(self, payload):
+        self.view_date = payload["view_date"]
+        self.revision = payload["revision"]
+        self.tasks = {t["id"]: dict(t) for t in payload["tasks"]}
+        self.upcoming = payload["upcoming"]
+        self.full_fetches = 1
+
+    def sync(self, pm):
+        delta = pm.get_dashboard_delta(self.revision, self.view_date)
+        if delta["full"]:
+            self.__init__(delta)
+            return delta
+        self.revision = delta["revision"]
+        self.upcoming = delta["upcoming"]
+        for task_id in delta["removed"]:
+            self.tasks.pop(task_id, None)
+        for task in delta["upserted"]:
+            self.tasks[task["id"]] = dict(task)
+        return delta
+
+    def payload(self):
+        return {"view_date": self.view_date, "revision": self.revision,
+                "tasks": sorted(self.tasks.values(), key=lambda t: t["id"]), "upcoming": self.upcoming}
+
+def _full(pm, date_str):
+    data = pm.get_dashboard_data(date_str)
+    return dict(data, tasks=sorted(data["tasks"], key=lambda t: t["id"]))
+
+def _random_mutation(pm, rng, dates):
+    ids = [t["id"] for t in pm.get_all_tasks()]
+    roll = rng.random()
+    if roll < 0.4 or not ids:
+        pm.add_task(f"Task {rng.random():.6f}", rng.choice(dates), rng.choice([None, "09:00"]))
+    elif roll < 0.6:
+        pm.toggle_task(rng.choice(ids))
+    elif roll < 0.75:
+        pm.delete_task(rng.choice(ids))
+    else:
+        ops = []
+        for task_id in rng.sample(ids, min(len(ids), rng.randint(1, 4))):
+            kind = rng.choice(["toggle", "update", "delete"])
+            if kind == "update":
+                ops.append({"op": "update", "id": task_id, "fields": {"date": rng.choice(dates), "title": "Moved"}})
+            else:
+                ops.append({"op": kind, "id": task_id})
+            if kind == "delete":
+                break # Later ops on a deleted id would (correctly) reject the batch
+        ops.append({"op": "add", "title": "Batch add", "date": rng.choice(dates)})
+        pm.apply_batch(ops)
+
+def test_random_deltas_reproduce_full_payload():
+    base = datetime.now()
+    dates = [(base + timedelta(days=d)).strftime("%Y-%m-%d") for d in range(-2, 5)]
+    for backend, path in (("json", JSON_FILE), ("sqlite", DB_FILE)):
+        for seed in range(4):
+            _cleanup()
+            try:
+                rng = random.Random(seed)
+                pm = ProductivityManager(path, backend=backend)
+                view = rng.choice(dates)
+                client = DashboardClient(pm.get_dashboard_data(view))
+                for step in range(300):
+                    _random_mutation(pm, rng, dates)
+                    if rng.random() < 0.3:
+                        delta = client.sync(pm)
+                        assert not delta["full"]
+                        assert client.payload() == _full(pm, view), (backend, seed, step)
+                client.sync(pm)
+                assert client.payload() == _full(pm, view)
+                assert client.full_fetches == 1
+                pm.close()
+            finally:
+                _cleanup()
+
+def test_delta_size_tracks_changes():
+    _cleanup()
+    try:
+        pm = ProductivityManager(JSON_FILE)
+        day = "2030-01-01"
+        ids = [pm.add_task(f"Task {i}", day)["id"] for i in range(1000)]
+        client = DashboardClient(pm.get_dashboard_data(day))
+
+        pm.toggle_task(ids[10])
+        pm.apply_batch([{"op": "update", "id": ids[20], "fields": {"date": "2030-01-02"}}])
+        delta = client.sync(pm)
+        assert [t["id"] for t in delta["upserted"]] == [ids[10]]
+        assert delta["removed"] == [ids[20]]
+        assert client.payload() == _full(pm, day)
+
+        # Nothing new: empty delta at the same revision
+        delta = client.sync(pm)
+        assert delta["upserted"] == [] and delta["removed"] == []
+        pm.close()
+    finally:
+        _cleanup()
+
+def test_stale_revision_gets_full_payload():
+    _cleanup()
+    old_size = productivity.CHANGE_LOG_SIZE
+    productivity.CHANGE_LOG_SIZE = 16
+    try:
+        pm = ProductivityManager(JSON_FILE)
+        day = "2030-01-01"
+        client = DashboardClient(pm.get_dashboard_data(day))
+        for i in range(40):
+            pm.add_task(f"Task {i}", day)
+        delta = client.sync(pm)
+        assert delta["full"]
+        assert client.payload() == _full(pm, day)
+
+        # A revision from a previous run is newer than anything this manager has seen
+        assert pm.get_dashboard_delta(pm.revision + 100, day)["full"]
+        assert pm.get_dashboard_delta(None, day)["full"]
+        pm.close()
+    finally:
+        productivity.CHANGE_LOG_SIZE = old_size
+        _cleanup()
+
+if __name__ == "__main__":
+    test_random_deltas_reproduce_full_payload()
+    test_delta_size_tracks_changes()
+    test_stale_revision_gets_full_payload()
+    print("SUCCESS: Dashboard delta checks passed.")
@@ -0,0 +1,127 @@
+import json
+import os
+import random
+from src.persistence import PersistenceService
+from src.skills.productivity_store import JsonTaskStorage
+
+TEST_FILE = "test_productivity_index.json"
+DATES = [f"2030-03-{d:02d}" for d in range(1, 21)]
+
+def _cleanup():
+    for path in [TEST_FILE, TEST_FILE + ".journal", TEST_FILE + ".journal.old", TEST_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+class NaiveTasks:
+    """The original list-scan implementation, used as the reference model."""
+    def __init__(self):
+        self.tasks = []
+
+    def add(self, task):
+        self.tasks.append(task)
+
+    def update(self, task_id, fields):
+        for task in self.tasks:
+            if task["id"] == task_id:
+                task.update(fields)
+
+    def delete(self, task_id):
+        self.tasks = [t for t in self.tasks if t["id"] != task_id]
+
+    def for_date(self, date_str):
+        return [t for t in self.tasks if t["date"] == date_str]
+
+    def upcoming(self, after_date, limit):
+        future = [t for t in self.tasks if t["date"] > after_date and not t["completed"]]
+        future.sort(key=lambda x: x["date"])
+        return future[:limit]
+
+def _check(storage, model, rng):
+    assert storage.all_tasks() == model.tasks
+    for date in DATES + ["2029-12-31", "2031-01-01"]:
+        assert storage.tasks_for_date(date) == model.for_date(date)
+    for _ in range(10):
+        after = rng.choice(DATES + ["2000-01-01"])
+        limit = rng.choice([0, 1, 3, 10, 1000])
+        assert storage.upcoming_tasks(after, limit) == model.upcoming(after, limit), (after, limit)
+
+def _random_ops(seed, steps):
+    rng = random.Random(seed)
+    storage = JsonTaskStorage(TEST_FILE)
+    storage.journal.compact_min_bytes = 4096 # Exercise compaction as well
+    model = NaiveTasks()
+    next_id = 1
+    for step in range(steps):
+        ids = [t["id"] for t in model.tasks]
+        action = rng.random()
+        if action < 0.4 or not ids:
+            task = {"id": next_id, "title": f"T{next_id}", "date": rng.choice(DATES), "time": None,
+                    "end_time": None, "reminder": False, "category": "Other", "completed": rng.random() < 0.2}
+            next_id += 1
+            storage.add_task(dict(task))
+            model.add(dict(task))
+        elif action < 0.7:
+            task_id = rng.choice(ids)
+            fields = {"completed": not storage.get_task(task_id)["completed"]}
+            storage.update_task(task_id, dict(fields))
+            model.update(task_id, fields)
+        elif action < 0.8:
+            task_id = rng.choice(ids)
+            fields = {"date": rng.choice(DATES)}
+            storage.update_task(task_id, dict(fields))
+            model.update(task_id, fields)
+        elif action < 0.85:
+            task_id = rng.choice(ids)
+            storage.update_task(task_id, {"title": f"Renamed {step}"})
+            model.update(task_id, {"title": f"Renamed {step}"})
+        else:
+            task_id = rng.choice(ids)
+            storage.delete_task(task_id)
+            model.delete(task_id)
+
+        if step % 25 == 0:
+            _check(storage, model, rng)
+    _check(storage, model, rng)
+    storage.close()
+    return model, rng
+
+def test_index_matches_list_scans():
+    for seed in range(8):
+        _cleanup()
+        try:
+            model, rng = _random_ops(seed, 600)
+            # The rebuilt index after a reload (snapshot + journal) must agree too
+            reloaded = JsonTaskStorage(TEST_FILE)
+            _check(reloaded, model, rng)
+            reloaded.close()
+        finally:
+            _cleanup()
+
+def test_duplicate_ids_in_old_files_are_kept():
+    _cleanup()
+    try:
+        tasks = [{"id": 5, "title": t, "date": "2030-03-01", "completed": False} for t in ("a", "b")]
+        with open(TEST_FILE, "w") as f:
+            json.dump({"tasks": tasks, "scratchpad": ""}, f)
+        storage = JsonTaskStorage(TEST_FILE)
+        assert [t["title"] for t in storage.tasks_for_date("2030-03-01")] == ["a", "b"]
+        assert len({t["id"] for t in storage.all_tasks()}) == 2
+        storage.close()
+
+        # The new id is on disk before anything is journaled: a restart without a flush keeps both
+        _cleanup()
+        with open(TEST_FILE, "w") as f:
+            json.dump({"tasks": tasks, "scratchpad": ""}, f)
+        storage = JsonTaskStorage(TEST_FILE, persistence=PersistenceService(debounce=60, max_delay=60))
+        storage.add_task({"id": storage.max_id() + 1, "title": "c", "date": "2030-03-01", "completed": False})
+        restarted = JsonTaskStorage(TEST_FILE, persistence=PersistenceService(debounce=60, max_delay=60))
+        assert [t["title"] for t in restarted.tasks_for_date("2030-03-01")] == ["a", "b", "c"]
+        assert len({t["id"] for t in restarted.all_tasks()}) == 3
+        storage.journal.close() # "Crashed": never flushed
+        restarted.close()
+    finally:
+        _cleanup()
+
+if __name__ == "__main__":
+    test_index_matches_list_scans()
+    test_duplicate_ids_in_old_files_are_kept()
+    print("SUCCESS: Task index is consistent with list scans.")
@@ -0,0 +1,108 @@
+import os
+from src.skills.productivity import ProductivityManager
+
+TEST_FILE = "test_productivity_journal.json"
+
+def _cleanup():
+    for path in [TEST_FILE, TEST_FILE + ".journal", TEST_FILE + ".journal.old", TEST_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _snapshot(pm):
+    return {"tasks": sorted(pm.get_all_tasks(), key=lambda t: t["id"]), "scratchpad": pm.get_scratchpad()}
+
+def test_mutations_survive_reload():
+    _cleanup()
+    try:
+        pm = ProductivityManager(TEST_FILE)
+        a = pm.add_task("Alpha", "2030-01-01")
+        b = pm.add_task("Beta", "2030-01-02", "10:00", "11:00", reminder=True, category="Event")
+        c = pm.add_task("Gamma", "2030-01-03")
+        pm.toggle_task(a["id"])
+        pm.toggle_task(b["id"])
+        pm.toggle_task(b["id"])
+        pm.delete_task(c["id"])
+        pm.save_scratchpad("remember the milk")
+        pm.close()
+
+        # Nothing was compacted yet: state lives in the journal only
+        assert not os.path.exists(TEST_FILE)
+        assert os.path.exists(TEST_FILE + ".journal")
+
+        reloaded = ProductivityManager(TEST_FILE)
+        assert _snapshot(reloaded) == _snapshot(pm)
+        assert reloaded.toggle_task(a["id"])["completed"] is False
+        assert len({t["id"] for t in reloaded.get_all_tasks()}) == 2
+        reloaded.close()
+    finally:
+        _cleanup()
+
+def test_torn_journal_tail_is_ignored():
+    _cleanup()
+    try:
+        pm = ProductivityManager(TEST_FILE)
+        pm.add_task("Kept", "2030-01-01")
+        pm.close()
+        with open(TEST_FILE + ".journal", "a") as f:
+            f.write('{"op":"add","task":{"id":1,"ti')
+
+        reloaded = ProductivityManager(TEST_FILE)
+        assert [t["title"] for t in reloaded.get_all_tasks()] == ["Kept"]
+        reloaded.close()
+    finally:
+        _cleanup()
+
+def test_compaction_and_idempotent_replay():
+    _cleanup()
+    try:
+        pm = ProductivityManager(TEST_FILE)
+        pm.storage.journal.compact_min_bytes = 2048
+        ids = [pm.add_task(f"Task {i}", "2030-01-01")["id"] for i in range(200)]
+        for task_id in ids[::3]:
+            pm.toggle_task(task_id)
+        for task_id in ids[::5]:
+            pm.delete_task(task_id)
+
+        # The journal outgrew the threshold and was handed over for a snapshot
+        assert pm.storage.journal.rotations >= 1
+        expected = _snapshot(pm)
+
+        # Simulate a crash after the snapshot rename but before the journals were removed:
+        # replaying the stale journals on top of the new snapshot must not change anything
+        stale_journal = ""
+        for path in [TEST_FILE + ".journal.old", TEST_FILE + ".journal"]:
+            if os.path.exists(path):
+                with open(path) as f:
+                    stale_journal += f.read()
+        assert stale_journal
+        pm.save_data()
+        assert os.path.exists(TEST_FILE)
+        assert not os.path.exists(TEST_FILE + ".journal")
+        assert not os.path.exists(TEST_FILE + ".journal.old")
+        pm.close()
+        with open(TEST_FILE + ".journal.old", "w") as f:
+            f.write(stale_journal)
+        reloaded = ProductivityManager(TEST_FILE)
+        assert _snapshot(reloaded) == expected
+        # The leftover journal is folded into the next snapshot
+        reloaded.save_data()
+        assert not os.path.exists(TEST_FILE + ".journal.old")
+        reloaded.close()
+    finally:
+        _cleanup()
+
+def test_burst_ids_are_unique():
+    _cleanup()
+    try:
+        pm = ProductivityManager(TEST_FILE)
+        ids = [pm.add_task("Burst", "2030-01-01")["id"] for _ in range(500)]
+        assert len(set(ids)) == 500
+        pm.close()
+    finally:
+        _cleanup()
+
+if __name__ == "__main__":
+    test_mutations_survive_reload()
+    test_torn_journal_tail_is_ignored()
+    test_compaction_and_idempotent_replay()
+    test_burst_ids_are_unique()
+    print("SUCCESS: Journaled productivity storage checks passed.")
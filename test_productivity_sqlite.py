@@ -0,0 +1,103 @@
+import os
+import random
+from src.skills.productivity import ProductivityManager
+from src.skills.productivity_store import JsonTaskStorage, SqliteTaskStorage
+
+JSON_FILE = "test_productivity_sqlite.json"
+DB_FILE = "test_productivity_sqlite.db"
+
+def _cleanup():
+    for path in [JSON_FILE, JSON_FILE + ".journal", JSON_FILE + ".journal.old", JSON_FILE + ".tmp", DB_FILE, DB_FILE + "-wal", DB_FILE + "-shm"]:
+        if os.path.exists(path): os.remove(path)
+
+def _normalize(tasks):
+    return [dict(t, reminder=bool(t["reminder"]), completed=bool(t["completed"])) for t in tasks]
+
+def test_backends_agree():
+    _cleanup()
+    try:
+        json_store = JsonTaskStorage(JSON_FILE)
+        sqlite_store = SqliteTaskStorage(DB_FILE)
+        rng = random.Random(42)
+        dates = [f"2030-01-{d:02d}" for d in range(1, 15)]
+        ids = []
+        for step in range(1500):
+            action = rng.random()
+            if action < 0.5 or not ids:
+                task = {"id": step + 1, "title": f"Task {step}", "date": rng.choice(dates),
+                        "time": rng.choice([None, "09:00", "14:30"]), "end_time": None,
+                        "reminder": rng.random() < 0.3, "category": "Other", "completed": False}
+                ids.append(task["id"])
+                json_store.add_task(dict(task))
+                sqlite_store.add_task(dict(task))
+            elif action < 0.85:
+                task_id = rng.choice(ids)
+                current = json_store.get_task(task_id)
+                if current:
+                    fields = {"completed": not current["completed"]}
+                    json_store.update_task(task_id, dict(fields))
+                    sqlite_store.update_task(task_id, dict(fields))
+            else:
+                task_id = rng.choice(ids)
+                json_store.delete_task(task_id)
+                sqlite_store.delete_task(task_id)
+
+        assert _normalize(json_store.all_tasks()) == sqlite_store.all_tasks()
+        for date in dates:
+            assert _normalize(json_store.tasks_for_date(date)) == sqlite_store.tasks_for_date(date)
+            assert _normalize(json_store.upcoming_tasks(date, 10)) == sqlite_store.upcoming_tasks(date, 10)
+        json_store.close()
+        sqlite_store.close()
+    finally:
+        _cleanup()
+
+def test_queries_use_indexes():
+    _cleanup()
+    try:
+        store = SqliteTaskStorage(DB_FILE)
+        day_plan = " ".join(r[3] for r in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE date = ? ORDER BY id", ("2030-01-01",)))
+        upcoming_plan = " ".join(r[3] for r in store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM tasks WHERE completed = 0 AND date > ? ORDER BY date, id LIMIT ?", ("2030-01-01", 10)))
+        print(day_plan, "|", upcoming_plan)
+        assert "idx_tasks_date" in day_plan
+        assert "idx_tasks_completed_date" in upcoming_plan
+        store.close()
+    finally:
+        _cleanup()
+
+def test_manager_migrates_json_once():
+    _cleanup()
+    try:
+        pm = ProductivityManager(JSON_FILE)
+        first = pm.add_task("Essay", "2030-02-01", "10:00", "11:00", reminder=True, category="Deadline")
+        pm.add_task("Groceries", "2030-02-02")
+        pm.toggle_task(first["id"])
+        pm.save_scratchpad("notes")
+        expected = pm.get_all_tasks()
+        pm.close()
+
+        sql_pm = ProductivityManager(JSON_FILE, backend="sqlite")
+        assert os.path.exists(DB_FILE)
+        assert sql_pm.get_all_tasks() == _normalize(expected)
+        assert sql_pm.get_scratchpad() == "notes"
+
+        # Changes now live in SQLite only; the JSON file is not imported again
+        sql_pm.delete_task(first["id"])
+        added = sql_pm.add_task("Gym", "2030-02-03")
+        assert added["id"] > first["id"]
+        assert sql_pm.toggle_task(added["id"])["completed"] is True
+        sql_pm.close()
+
+        reopened = ProductivityManager(JSON_FILE, backend="sqlite")
+        assert [t["title"] for t in reopened.get_all_tasks()] == ["Groceries", "Gym"]
+        assert [t["title"] for t in reopened.get_tasks_for_date("2030-02-02")] == ["Groceries"]
+        reopened.close()
+    finally:
+        _cleanup()
+
+if __name__ == "__main__":
+    test_backends_agree()
+    test_queries_use_indexes()
+    test_manager_migrates_json_once()
+    print("SUCCESS: SQLite productivity backend checks passed.")
@@ -0,0 +1,233 @@
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from src.persistence import PersistenceService
+from src.skills.productivity import ProductivityManager
+from src.skills.reminders import ReminderEngine, parse_time, reminder_times
+
+DATA_FILE = "test_reminders.json"
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.messages = []
+
+    def __call__(self, message):
+        with self.lock:
+            self.messages.append(message)
+
+def _cleanup():
+    for path in [DATA_FILE, DATA_FILE + ".journal", DATA_FILE + ".journal.old", DATA_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _wait_fired(engine, count, timeout=10):
+    deadline = time.monotonic() + timeout
+    while engine.get_stats()["fired"] < count:
+        assert time.monotonic() < deadline, (engine.get_stats(), count)
+        time.sleep(0.005)
+
+def _expected(tasks, now, lead):
+    times = {}
+    for task in tasks:
+        rt = reminder_times(task, lead)
+        if rt and rt[1] > now:
+            times[task["id"]] = rt[0]
+    return times
+
+def test_100k_tasks_incremental_and_bounded_wakeups():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    start = datetime(2026, 3, 1, 8, 0)
+    clock = FakeClock(start)
+    lead = timedelta(minutes=10)
+    rng = random.Random(11)
+    try:
+        pm = ProductivityManager(DATA_FILE, persistence=persistence)
+        for chunk in range(10):
+            pm.apply_batch([{"op": "add", "title": f"task {chunk * 10000 + i}",
+                             "date": (start + timedelta(days=rng.randint(-1, 29))).strftime("%Y-%m-%d"),
+                             "time": rng.choice([None, f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}"]),
+                             "reminder": rng.random() < 0.5} for i in range(10000)])
+
+        recorder = Recorder()
+        engine = ReminderEngine(pm, notifier=recorder, clock=clock, lead=lead, group_limit=10**9)
+        tasks = pm.storage.all_tasks()
+        stats = engine.get_stats()
+        # Reminders already inside their lead window go out right away
+        assert stats["pending"] + stats["fired"] == len(_expected(tasks, clock(), lead)) > 40000
+
+        # From here on the engine must work off change notifications alone
+        def no_rescan():
+            raise AssertionError("reminder engine rescanned all tasks")
+        pm.get_all_tasks = no_rescan
+        wakeups = engine.get_stats()["wakeups"]
+
+        ids = [t["id"] for t in tasks if t["date"] > "2026-03-01"] # Leave the ones that already fired alone
+        rng.shuffle(ids)
+        for task_id in ids[:500]:
+            pm.toggle_task(task_id)
+        for task_id in ids[500:1000]:
+            pm.delete_task(task_id)
+        for i in range(500):
+            pm.add_task(f"late {i}", (start + timedelta(days=rng.randint(0, 29))).strftime("%Y-%m-%d"),
+                        f"{rng.randint(0, 23):02d}:00", reminder=True)
+        pm.apply_batch([{"op": "update", "id": task_id, "fields": {"time": "12:34"}}
+                        for task_id in ids[1000:1500]])
+        pm.add_task("soon", "2026-03-01", "08:05", reminder=True) # Earliest: wakes the scheduler
+
+        expected = _expected(pm.storage.all_tasks(), clock(), lead)
+        _wait_fired(engine, stats["fired"] + 1) # "soon" is due at once
+        stats = engine.get_stats()
+        assert stats["pending"] + stats["fired"] == len(expected)
+        assert stats["wakeups"] - wakeups <= 20, stats
+
+        # Walk the clock through the next 30 days in 12-hour steps
+        already = len(recorder.messages)
+        steps = 0
+        while clock.now < start + timedelta(days=30):
+            clock.now += timedelta(hours=12)
+            steps += 1
+            engine.wake()
+            _wait_fired(engine, sum(1 for at in expected.values() if at <= clock.now))
+
+        titles = {t["title"]: expected[t["id"]] for t in pm.storage.all_tasks() if t["id"] in expected}
+        fired = [m[len("Reminder: "):m.rindex(" at ")] for m in recorder.messages]
+        assert sorted(fired) == sorted(titles)
+        walked = fired[already:]
+        assert all(titles[a] <= titles[b] for a, b in zip(walked, walked[1:])) # Earliest first
+
+        stats = engine.get_stats()
+        assert stats["pending"] == 0 and stats["fired"] == len(expected)
+        assert stats["wakeups"] <= 3 * steps + 20, stats
+        print(f"reminders: {len(expected)} fired over {steps} clock steps with {stats['wakeups']} wake-ups "
+              f"({stats['updates']} incremental updates)")
+        engine.close()
+        pm.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_updates_and_grouping():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    clock = FakeClock(datetime(2026, 3, 1, 8, 0))
+    try:
+        pm = ProductivityManager(DATA_FILE, persistence=persistence)
+        recorder = Recorder()
+        engine = ReminderEngine(pm, notifier=recorder, clock=clock, group_limit=3)
+
+        lecture = pm.add_task("lecture", "2026-03-01", "14:00", reminder=True)
+        pm.add_task("no reminder", "2026-03-01", "14:00")
+        pm.add_task("already started", "2026-03-01", "07:30", reminder=True)
+        pm.add_task("all day", "2026-03-02", None, reminder=True)
+        assert [(r["title"], r["remind_at"]) for r in engine.upcoming()] == [
+            ("lecture", "2026-03-01T13:50"), ("all day", "2026-03-02T08:50")]
+
+        pm.toggle_task(lecture["id"]) # Completed: no reminder
+        assert [r["title"] for r in engine.upcoming()] == ["all day"]
+        pm.toggle_task(lecture["id"])
+        pm.apply_batch([{"op": "update", "id": lecture["id"], "fields": {"title": "Lecture (room 5)"}}])
+        assert engine.upcoming()[0]["title"] == "Lecture (room 5)"
+
+        clock.now = datetime(2026, 3, 1, 13, 55)
+        engine.wake()
+        _wait_fired(engine, 1)
+        assert recorder.messages == ["Reminder: Lecture (room 5) at 14:00"]
+
+        for i in range(5):
+            pm.add_task(f"standup {i}", "2026-03-02", "10:00", reminder=True)
+        clock.now = datetime(2026, 3, 2, 9, 55)
+        engine.wake()
+        _wait_fired(engine, 7)
+        time.sleep(0.05)
+        assert recorder.messages[1:] == ["6 reminders: all day, standup 0, standup 1, ..."]
+        assert engine.get_stats()["notifications"] == 2
+        engine.close()
+        pm.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_sleeps_until_due_on_the_real_clock():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    try:
+        pm = ProductivityManager(DATA_FILE, persistence=persistence)
+        recorder = Recorder()
+        now = datetime.now()
+        start = (now + timedelta(minutes=2)).replace(second=0, microsecond=0)
+        # Lead chosen so the reminder comes due 0.3 s from now
+        engine = ReminderEngine(pm, notifier=recorder, lead=start - now - timedelta(seconds=0.3))
+        pm.add_task("tea", start.strftime("%Y-%m-%d"), start.strftime("%H:%M"), reminder=True)
+        assert recorder.messages == []
+        _wait_fired(engine, 1, timeout=3)
+        assert recorder.messages == [f"Reminder: tea at {start.strftime('%H:%M')}"]
+        assert engine.get_stats()["wakeups"] <= 3
+        engine.close()
+        pm.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_engine_style_times():
+    assert [str(parse_time(t)) for t in ["2pm", "9", "2:30pm", "12am", "12:15 PM", "18:30"]] == [
+        "14:00:00", "09:00:00", "14:30:00", "00:00:00", "12:15:00", "18:30:00"]
+    # A bare hour means what "at 3" means in conversation; padded UI times stay 24-hour
+    assert [str(parse_time(t)) for t in ["3", "3:30", "7", "8", "12", "0", "15", "03:00", "3am"]] == [
+        "15:00:00", "15:30:00", "19:00:00", "08:00:00", "12:00:00", "00:00:00", "15:00:00", "03:00:00", "03:00:00"]
+    assert [parse_time(t) for t in ["13pm", "24", "9:75", "noon"]] == [None] * 4
+
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    clock = FakeClock(datetime(2026, 3, 1, 8, 0))
+    try:
+        pm = ProductivityManager(DATA_FILE, persistence=persistence)
+        engine = ReminderEngine(pm, notifier=Recorder(), clock=clock)
+        # The times SINGLE_TIME_RE / TIME_RANGE_RE capture are stored as typed
+        for title, at in [("seminar", "2pm"), ("gym", "9"), ("call", "2:30pm"), ("dinner", "18:30"), ("tea", "4")]:
+            pm.add_task(title, "2026-03-01", at, reminder=True)
+        assert [(r["title"], r["starts_at"]) for r in engine.upcoming()] == [
+            ("gym", "2026-03-01T09:00"), ("seminar", "2026-03-01T14:00"),
+            ("call", "2026-03-01T14:30"), ("tea", "2026-03-01T16:00"), ("dinner", "2026-03-01T18:30")]
+        engine.close()
+
+        # End to end through the engine's "schedule ... at 2pm"
+        from src.engine import AIEngine
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        engine = ReminderEngine(pm, notifier=Recorder(), clock=FakeClock(today))
+        AIEngine(pm).process_input("schedule lecture tomorrow at 2pm")
+        AIEngine(pm).process_input("schedule review tomorrow at 3")
+        starts = {r["title"]: r["starts_at"] for r in engine.upcoming()}
+        assert starts["lecture"] == (today + timedelta(days=1, hours=14)).isoformat(timespec="minutes")
+        assert starts["review"] == (today + timedelta(days=1, hours=15)).isoformat(timespec="minutes"), starts
+        engine.close()
+        pm.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_importing_reminders_leaves_plyer_unloaded():
+    # The UI builds the reminder engine at startup; plyer loads with the first notification
+    code = "import sys, src.skills.reminders; print('plyer' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "False"
+
+if __name__ == "__main__":
+    test_100k_tasks_incremental_and_bounded_wakeups()
+    test_updates_and_grouping()
+    test_sleeps_until_due_on_the_real_clock()
+    test_engine_style_times()
+    test_importing_reminders_leaves_plyer_unloaded()
+    print("SUCCESS: Reminder engine checks passed.")
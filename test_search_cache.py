@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+from src.persistence import PersistenceService
+from src.skills.web_skills import SearchService
+
+CACHE_FILE = "test_search_cache.json"
+LATENCY = 0.1 # Simulated search round trip
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class StubProvider:
+    """
+    Answers any query after `latency` seconds; queries containing "broken" fail.
+    """
+    def __init__(self, latency=LATENCY):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = []
+
+    def _answer(self, kind, query, max_results):
+        with self.lock:
+            self.calls.append((kind, query))
+        time.sleep(self.latency)
+        if "broken" in query:
+            raise RuntimeError("202 Ratelimit")
+        return [{"title": f"{kind} {query} {i}", "body": "...", "href": f"https://example.com/{i}",
+                 "source": "Example", "url": f"https://example.com/{i}"} for i in range(max_results)]
+
+    def web(self, query, max_results):
+        return self._answer("web", query, max_results)
+
+    def news(self, query, max_results):
+        return self._answer("news", query, max_results)
+
+def _cleanup():
+    for path in [CACHE_FILE, CACHE_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+def test_normalized_cache_and_separate_ttls():
+    provider, clock = StubProvider(), FakeClock()
+    service = SearchService(provider, web_ttl=3600, news_ttl=60, clock=clock)
+
+    first, miss_ms = _timed(service.search, "What is Python")
+    again, hit_ms = _timed(service.search, "  what IS   python ")
+    assert again == first and len(provider.calls) == 1
+    print(f"search latency: miss {miss_ms:.1f} ms, hit {hit_ms:.3f} ms")
+    assert hit_ms < 5
+
+    service.search("python", "news")
+    clock.now += 120 # News expired, web still fresh
+    service.search("python", "news")
+    service.search("what is python")
+    assert provider.calls == [("web", "What is Python"), ("news", "python"), ("news", "python")]
+
+    try:
+        service.search("broken query")
+        assert False, "provider error should propagate"
+    except RuntimeError:
+        pass
+    service.search_many(["broken query"]) # Errors are not cached
+    assert provider.calls.count(("web", "broken query")) == 2
+
+    stats = service.get_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 5 and stats["errors"] == 2
+    print(f"hit ratio: {stats['hit_ratio']:.2f}")
+
+def test_lru_bound():
+    service = SearchService(StubProvider(latency=0), max_entries=3)
+    for q in ["a", "b", "c", "a", "d"]:
+        service.search(q)
+    assert [key[2] for key in service.entries] == ["c", "a", "d"]
+
+def test_concurrent_identical_queries_share_one_fetch():
+    provider = StubProvider()
+    service = SearchService(provider)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(service.search("Who is Ada Lovelace")))
+               for _ in range(8)]
+    start = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = (time.perf_counter() - start) * 1000
+
+    assert len(provider.calls) == 1
+    assert len(results) == 8 and all(r == results[0] for r in results)
+    stats = service.get_stats()
+    assert stats["misses"] == 1 and stats["hits"] + stats["shared"] == 7
+    print(f"8 concurrent identical searches: 1 fetch in {elapsed:.0f} ms, hit ratio {stats['hit_ratio']:.2f}")
+
+def test_search_many_fans_out():
+    provider = StubProvider()
+    service = SearchService(provider, workers=4)
+    queries = [f"topic {i}" for i in range(8)] + ["Topic 3", "broken one"]
+
+    results, elapsed = _timed(service.search_many, queries)
+    assert results[3] == results[8] and results[0][0]["title"] == "web topic 0 0"
+    assert results[9] is None
+    assert len(provider.calls) == 9 # "Topic 3" was folded into "topic 3"
+    # 9 lookups at 100 ms over 4 workers: ~0.3 s instead of 0.9 s
+    assert elapsed < 600, elapsed
+
+    repeat, cached_ms = _timed(service.search_many, queries[:9])
+    assert repeat == results[:9] and cached_ms < 50
+    print(f"search_many: {len(queries)} queries in {elapsed:.0f} ms, cached repeat in {cached_ms:.1f} ms, "
+          f"hit ratio {service.get_stats()['hit_ratio']:.2f}")
+    service.close()
+
+def test_disk_cache_survives_restart():
+    _cleanup()
+    persistence = PersistenceService(debounce=0.01)
+    clock = FakeClock()
+    try:
+        provider = StubProvider(latency=0)
+        service = SearchService(provider, news_ttl=60, cache_file=CACHE_FILE, persistence=persistence, clock=clock)
+        service.search("rust")
+        service.search("rust", "news")
+        service.close()
+        with open(CACHE_FILE) as f:
+            assert len(json.load(f)) == 2
+
+        clock.now += 120 # The news entry expired while the app was closed
+        restarted = SearchService(provider, news_ttl=60, cache_file=CACHE_FILE, persistence=persistence, clock=clock)
+        assert list(restarted.entries) == [("web", 3, "rust")]
+        restarted.search("Rust")
+        assert len(provider.calls) == 2
+        restarted.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_normalized_cache_and_separate_ttls()
+    test_lru_bound()
+    test_concurrent_identical_queries_share_one_fetch()
+    test_search_many_fans_out()
+    test_disk_cache_survives_restart()
+    print("SUCCESS: Search cache checks passed.")
@@ -0,0 +1,93 @@
+import subprocess
+import sys
+import threading
+import time
+from src.skill_registry import SkillRegistry, SkillUnavailable
+
+HEAVY_MODULES = ["yt_dlp", "bs4", "requests", "numpy", "comtypes", "pycaw", "AppOpener",
+                 "screen_brightness_control", "plyer", "ddgs", "duckduckgo_search"]
+
+def test_engine_startup_imports_no_skills():
+    code = ("import sys, src.engine; eng = src.engine.AIEngine(); "
+            "print(','.join(sorted(m for m in sys.modules if m.startswith('src.skills.') or m == 'src.simple_nlp'))); "
+            f"print(','.join(sorted(m for m in sys.modules if m.split('.')[0] in {HEAVY_MODULES!r})))")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    skills, heavy = result.stdout.splitlines()
+    assert skills == "" and heavy == "", result.stdout
+
+def test_loads_once_and_isolates_failures():
+    calls = []
+    registry = SkillRegistry()
+    registry.register("json", "json", factory=lambda module: calls.append(1) or module.dumps)
+    registry.register("broken", "no_such_module_for_desktopai")
+    assert not registry.is_loaded("json")
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("json"))) for _ in range(8)]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert len(calls) == 1 and len(set(map(id, results))) == 1
+    assert registry.get("json")([1]) == "[1]"
+
+    for _ in range(2): # The failure is remembered, not retried
+        try:
+            registry.get("broken")
+            assert False, "expected SkillUnavailable"
+        except SkillUnavailable as e:
+            assert e.name == "broken" and isinstance(e.error, ImportError)
+
+    rows = {row["name"]: row for row in registry.report()}
+    assert rows["json"]["loaded"] and rows["json"]["error"] is None
+    assert not rows["broken"]["loaded"] and "no_such_module_for_desktopai" in rows["broken"]["error"]
+
+    registry.provide("broken", "stand-in")
+    assert registry.get("broken") == "stand-in"
+
+def test_slow_skill_does_not_block_others():
+    release = threading.Event()
+    registry = SkillRegistry()
+    registry.register("slow", "json", factory=lambda module: release.wait(10) and module)
+    registry.register("fast", "csv")
+    registry.register("outer", "json", factory=lambda module: registry.get("fast").reader)
+
+    results = []
+    loader = threading.Thread(target=lambda: results.append(registry.get("slow")))
+    loader.start()
+    try:
+        time.sleep(0.05) # The loader is inside the slow factory now
+        start = time.perf_counter()
+        assert registry.get("fast").__name__ == "csv"
+        assert registry.get("outer") is registry.get("fast").reader # Nested get from a factory
+        assert time.perf_counter() - start < 1.0
+        assert not registry.is_loaded("slow") and registry.report()[1]["loaded"]
+    finally:
+        release.set()
+        loader.join(timeout=10)
+    assert results and results[0].__name__ == "json" and registry.is_loaded("slow")
+
+def test_warm_up_in_background():
+    registry = SkillRegistry()
+    registry.register("json", "json")
+    registry.register("csv", "csv")
+    registry.register("broken", "no_such_module_for_desktopai")
+    thread = registry.warm_up()
+    thread.join(timeout=10)
+    assert registry.is_loaded("json") and registry.is_loaded("csv") and not registry.is_loaded("broken")
+    assert registry.warm_up(["json"], background=False) is None
+
+def test_unavailable_skill_degrades_gracefully():
+    from src.engine import AIEngine
+    eng = AIEngine()
+    eng.skills._specs["volume_control"] = (".skills.no_such_skill", None) # As if pycaw were missing
+    reply = eng.process_input("volume 30")
+    assert reply.startswith("Sorry, volume control is not available"), reply
+    assert "not available" not in eng.process_input("hello") # Other skills are unaffected
+
+if __name__ == "__main__":
+    test_engine_startup_imports_no_skills()
+    test_loads_once_and_isolates_failures()
+    test_slow_skill_does_not_block_others()
+    test_warm_up_in_background()
+    test_unavailable_skill_degrades_gracefully()
+    print("SUCCESS: Skill registry checks passed.")
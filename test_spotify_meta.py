@@ -0,0 +1,152 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from src.net import HttpClient
+from src.persistence import PersistenceService
+from src.skills.spotify_meta import SpotifyMetadataCache, HeadMetaParser, normalize_spotify_url
+
+CACHE_FILE = "test_spotify_metadata.json"
+BODY_SIZE = 2 * 1024 * 1024 # Spotify pages carry megabytes of inline scripts after the head
+
+TRACK_HEAD = ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Bad Apple!! | Spotify</title>'
+              '<meta property="og:title" content="Bad Apple!!"/>'
+              '<meta property="og:description" content="Alstroemeria Records · Lovelight · Song · 2008"/>'
+              '</head>')
+PLAIN_HEAD = '<html><head><title>Café del Mar | Spotify</title></head>'
+
+class FixtureServer(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    paths = []
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        FixtureServer.paths.append(self.path)
+        if path.startswith("/track/"):
+            head = TRACK_HEAD
+        elif path.startswith("/playlist/"):
+            head = PLAIN_HEAD
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = (head + "<body><script>" + "x" * BODY_SIZE + "</script></body></html>").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html") # No charset, like many CDNs
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for i in range(0, len(body), 64 * 1024):
+                self.wfile.write(body[i:i + 64 * 1024])
+        except (BrokenPipeError, ConnectionResetError):
+            pass # Client stopped after the head
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass # Client closed a streamed response early
+
+    def log_message(self, *args):
+        pass
+
+def _cleanup():
+    for path in [CACHE_FILE, CACHE_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _serve():
+    FixtureServer.paths = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def test_normalize():
+    base = "https://open.spotify.com/track/2Yv0FavwiRO1mzaIThDAiM"
+    assert normalize_spotify_url(base + "?si=cd89997c7ef5497f") == base
+    assert normalize_spotify_url("https://OPEN.spotify.com/intl-de/track/2Yv0FavwiRO1mzaIThDAiM/?si=x#t=1") == base
+    assert normalize_spotify_url(base) == base
+
+def test_parser_stops_at_head():
+    parser = HeadMetaParser()
+    parser.feed(TRACK_HEAD[:70])
+    assert not parser.done
+    parser.feed(TRACK_HEAD[70:])
+    assert parser.done
+    assert parser.result() == "Bad Apple!! - Alstroemeria Records"
+
+def test_cache_and_streaming_fetch():
+    _cleanup()
+    server, base = _serve()
+    persistence = PersistenceService(debounce=0.01)
+    client = HttpClient(retries=0)
+    try:
+        cache = SpotifyMetadataCache(CACHE_FILE, client=client, persistence=persistence)
+        url = base + "/track/2Yv0FavwiRO1mzaIThDAiM"
+
+        start = time.perf_counter()
+        assert cache.get_title(url + "?si=first") == "Bad Apple!! - Alstroemeria Records"
+        cold_ms = (time.perf_counter() - start) * 1000
+        stats = cache.get_stats()
+        # Only the head (first chunk or two) was read, not the 2 MB page
+        assert stats["fetches"] == 1 and stats["bytes_read"] < 16 * 1024, stats
+
+        start = time.perf_counter()
+        assert cache.get_title(url + "?si=second") == "Bad Apple!! - Alstroemeria Records"
+        warm_ms = (time.perf_counter() - start) * 1000
+        assert len(FixtureServer.paths) == 1
+        print(f"spotify metadata: cold {cold_ms:.1f} ms ({stats['bytes_read']} bytes), warm {warm_ms:.3f} ms")
+
+        # <title> fallback (UTF-8 without a declared charset), and failures are not cached
+        assert cache.get_title(base + "/playlist/abc") == "Café del Mar"
+        assert cache.get_title(base + "/album/missing") == "Spotify Album"
+        assert cache.get_title(base + "/album/missing") == "Spotify Album"
+        assert len(FixtureServer.paths) == 4
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 4 and stats["entries"] == 2
+        cache.close()
+
+        with open(CACHE_FILE) as f:
+            assert json.load(f)["https://127.0.0.1:%d/track/2Yv0FavwiRO1mzaIThDAiM" % server.server_port]
+        restarted = SpotifyMetadataCache(CACHE_FILE, client=client, persistence=persistence)
+        assert restarted.get_title(url) == "Bad Apple!! - Alstroemeria Records"
+        assert len(FixtureServer.paths) == 4
+        restarted.close()
+    finally:
+        persistence.stop()
+        client.close()
+        server.shutdown()
+        server.server_close()
+        _cleanup()
+
+def test_seeded_from_history():
+    _cleanup()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        cache = SpotifyMetadataCache(CACHE_FILE, client=HttpClient(timeout=0.01, retries=0), persistence=persistence)
+        cache.seed([
+            {"type": "spotify", "id": "https://open.spotify.com/track/2Yv0FavwiRO1mzaIThDAiM?si=cd89997c7ef5497f",
+             "title": "Bad Apple!! - Alstroemeria Records"},
+            {"type": "spotify", "id": "https://open.spotify.com/album/xyz", "title": "Spotify Album"},
+            {"type": "spotify", "id": "spotify:search:lofi", "title": "Lofi"},
+            {"type": "youtube", "id": "dQw4w9WgXcQ", "title": "Video"},
+        ])
+        assert cache.get_title("https://open.spotify.com/track/2Yv0FavwiRO1mzaIThDAiM?si=other") == \
+            "Bad Apple!! - Alstroemeria Records"
+        assert cache.get_stats()["fetches"] == 0
+        assert cache.get_stats()["entries"] == 1
+        cache.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_normalize()
+    test_parser_stops_at_head()
+    test_cache_and_streaming_fetch()
+    test_seeded_from_history()
+    print("SUCCESS: Spotify metadata cache checks passed.")
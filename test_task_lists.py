@@ -0,0 +1,139 @@
+import random
+from src.task_lists import KeyedList, VirtualList
+
+class Screen:
+    """
+    Stands in for a Tk container managed with pack: show() appends, hide() removes.
+    """
+    def __init__(self):
+        self.packed = []
+        self.created = 0
+
+    def card(self):
+        self.created += 1
+        return FakeCard(self)
+
+class FakeCard:
+    def __init__(self, screen):
+        self.screen = screen
+        self.task = None
+        self.destroyed = False
+
+    def update(self, task):
+        assert not self.destroyed
+        self.task = dict(task)
+
+    def show(self):
+        assert self not in self.screen.packed and not self.destroyed
+        self.screen.packed.append(self)
+
+    def hide(self):
+        self.screen.packed.remove(self)
+
+    def destroy(self):
+        if self in self.screen.packed:
+            self.screen.packed.remove(self)
+        self.destroyed = True
+
+def _shown(screen):
+    return [c.task for c in screen.packed if isinstance(c, FakeCard) and c.task is not None]
+
+def _task(i, **fields):
+    return dict({"id": i, "title": f"Task {i}", "date": "2030-01-01", "time": None, "completed": False}, **fields)
+
+def test_keyed_list_matches_random_renders():
+    rng = random.Random(7)
+    screen = Screen()
+    view = KeyedList(screen.card)
+    tasks = [_task(i) for i in range(50)]
+    next_id = 50
+    for _ in range(300):
+        roll = rng.random()
+        if roll < 0.3:
+            tasks.insert(rng.randint(0, len(tasks)), _task(next_id))
+            next_id += 1
+        elif roll < 0.5 and tasks:
+            tasks.pop(rng.randrange(len(tasks)))
+        elif roll < 0.8 and tasks:
+            t = rng.choice(tasks)
+            t["completed"] = not t["completed"]
+        elif tasks:
+            rng.shuffle(tasks)
+        view.render(tasks)
+        assert _shown(screen) == tasks
+        assert len(view.cards) == len(screen.packed) == len(tasks)
+
+def test_keyed_list_only_touches_changes():
+    screen = Screen()
+    view = KeyedList(screen.card)
+    tasks = [_task(i) for i in range(1000)]
+    view.render(tasks)
+    assert view.stats["created"] == 1000
+
+    # Toggling one task in place (live dict, as the JSON backend returns) updates one card
+    tasks[500]["completed"] = True
+    view.render(tasks)
+    assert view.stats == {"created": 1000, "updated": 1, "destroyed": 0, "moved": 0}
+    assert screen.packed[500].task["completed"] is True
+
+    # Appending and deleting never re-packs the untouched cards
+    view.render(tasks[1:] + [_task(1000)])
+    assert view.stats["created"] == 1001 and view.stats["destroyed"] == 1 and view.stats["moved"] == 0
+
+    view.render(tasks[1:] + [_task(1000)])
+    assert view.stats["updated"] == 1
+
+def test_keyed_list_placeholder():
+    screen = Screen()
+    view = KeyedList(screen.card, lambda: Placeholder(screen))
+    view.render([])
+    assert len(screen.packed) == 1 and isinstance(screen.packed[0], Placeholder)
+    view.render([_task(1)])
+    assert _shown(screen) == [_task(1)] and len(screen.packed) == 1
+    view.render([])
+    assert isinstance(screen.packed[0], Placeholder)
+
+class Placeholder:
+    def __init__(self, screen):
+        self.screen = screen
+    def show(self):
+        self.screen.packed.append(self)
+    def destroy(self):
+        self.screen.packed.remove(self)
+
+def test_virtual_list_materializes_visible_rows_only():
+    screen = Screen()
+    view = VirtualList(screen.card, visible_rows=20)
+    tasks = [_task(i) for i in range(10000)]
+    view.set_items(tasks)
+    assert screen.created == 20
+    assert _shown(screen) == tasks[:20]
+
+    view.scroll_to(5000)
+    assert _shown(screen) == tasks[5000:5020]
+    view.scroll_by(10 ** 6) # Clamped to the end
+    assert _shown(screen) == tasks[-20:]
+    assert view.fraction() == (9980 / 10000, 1.0)
+
+    view.set_visible_rows(25)
+    assert _shown(screen) == tasks[-25:]
+    assert screen.created == 25
+
+    # Shrinking the list hides the surplus rows and brings them back in order
+    view.set_items(tasks[:3])
+    assert _shown(screen) == tasks[:3]
+    view.set_items(tasks[:30])
+    assert _shown(screen) == tasks[:25]
+    assert screen.created == 25
+
+    # Refreshing with unchanged tasks does not touch any widget
+    updated = view.stats["updated"]
+    view.set_items([dict(t) for t in tasks[:30]])
+    assert view.stats["updated"] == updated
+
+if __name__ == "__main__":
+    test_keyed_list_matches_random_renders()
+    test_keyed_list_only_touches_changes()
+    test_keyed_list_placeholder()
+    test_virtual_list_materializes_visible_rows_only()
+    print("SUCCESS: Task list reconciliation checks passed.")
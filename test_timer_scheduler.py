@@ -0,0 +1,145 @@
+import os
+import random
+import threading
+import time
+from src.persistence import PersistenceService
+from src.skills.timer import TimerSkill
+
+STATE_FILE = "test_timers.json"
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+class Recorder:
+    def __init__(self):
+        self.messages = []
+        self.cond = threading.Condition()
+
+    def __call__(self, message):
+        with self.cond:
+            self.messages.append(message)
+            self.cond.notify_all()
+
+    def wait_for(self, count, timeout=10):
+        with self.cond:
+            return self.cond.wait_for(lambda: len(self.messages) >= count, timeout)
+
+def _cleanup():
+    for path in [STATE_FILE, STATE_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _skill(persistence, recorder, clock, wall):
+    return TimerSkill(state_file=STATE_FILE, persistence=persistence, notifier=recorder,
+                      clock=clock, wall_clock=wall)
+
+def _advance(skill, clocks, seconds):
+    for clock in clocks:
+        clock.now += seconds
+    skill.wake()
+
+def test_10k_timers_one_thread_in_order():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    clock, wall = FakeClock(100.0), FakeClock(1_700_000_000.0)
+    recorder = Recorder()
+    baseline = threading.active_count()
+    try:
+        skill = _skill(persistence, recorder, clock, wall)
+        rng = random.Random(7)
+        durations = [rng.randint(1, 5000) for _ in range(10000)]
+        for i, seconds in enumerate(durations):
+            skill.add_timer(seconds, name=f"t{i}")
+
+        timer_threads = [t for t in threading.enumerate() if t.name == "timer-scheduler"]
+        assert len(timer_threads) == 1
+        # The scheduler, plus at most the persistence writer
+        assert threading.active_count() - baseline <= 2
+
+        cancelled = {f"t{i}" for i in range(0, 10000, 10)}
+        for i in range(0, 10000, 10):
+            skill.cancel_timer(str(i + 1)) # Ids start at 1
+        assert skill.get_stats()["pending"] == 9000
+
+        _advance(skill, (clock, wall), 2500)
+        expected_early = sum(1 for i, s in enumerate(durations) if s <= 2500 and f"t{i}" not in cancelled)
+        assert recorder.wait_for(expected_early)
+        time.sleep(0.05)
+        assert len(recorder.messages) == expected_early # Nothing later fired early
+
+        _advance(skill, (clock, wall), 2500)
+        assert recorder.wait_for(9000)
+
+        fired = [m.split("'")[1] for m in recorder.messages]
+        order = sorted((s, i) for i, s in enumerate(durations) if f"t{i}" not in cancelled)
+        assert fired == [f"t{i}" for _, i in order] # Deadline order, ties by creation
+        assert skill.get_stats()["fired"] == 9000 and skill.get_stats()["pending"] == 0
+        skill.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_list_cancel_and_names():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    clock, wall = FakeClock(0.0), FakeClock(1_700_000_000.0)
+    recorder = Recorder()
+    try:
+        skill = _skill(persistence, recorder, clock, wall)
+        assert skill.list_timers() == "No timers running."
+        assert skill.set_timer("set timer for 10 minutes called Tea") == "Timer 'Tea' set for 0:10:00. (#1)"
+        assert skill.set_timer("set alarm for 1 hour 30 sec") == "Timer set for 1:00:30. (#2)"
+        assert skill.set_timer("set timer for later").startswith("I couldn't understand")
+
+        listing = skill.list_timers().splitlines()
+        assert listing[1].startswith("#1 Tea: 0:10:00 left") and listing[2].startswith("#2 Timer: 1:00:30 left")
+
+        assert skill.cancel_timer().startswith("Several timers are running")
+        assert skill.cancel_timer("coffee") == "No timer 'coffee' found."
+        assert skill.cancel_timer("tea") == "Cancelled timer 'Tea' (#1)."
+        assert skill.cancel_timer() == "Cancelled timer (#2)."
+        assert skill.cancel_timer("all") == "No timers running."
+
+        _advance(skill, (clock, wall), 7200)
+        time.sleep(0.05)
+        assert recorder.messages == [] # Cancelled timers never fire
+        skill.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_pending_timers_survive_restart():
+    _cleanup()
+    persistence = PersistenceService(debounce=60, max_delay=60)
+    clock, wall = FakeClock(50.0), FakeClock(1_700_000_000.0)
+    recorder = Recorder()
+    try:
+        skill = _skill(persistence, recorder, clock, wall)
+        skill.add_timer(60, name="short")
+        skill.add_timer(600, name="long")
+        skill.close() # Flushes timers.json
+
+        # Restart 5 minutes later: a new monotonic epoch, wall clock moved on
+        clock, wall = FakeClock(10.0), FakeClock(wall.now + 300)
+        restarted = _skill(persistence, recorder, clock, wall)
+        assert recorder.wait_for(1) and recorder.messages == ["Your timer 'short' has finished!"]
+        [long_timer] = restarted.get_timers()
+        assert long_timer["name"] == "long" and long_timer["remaining"] == 300
+
+        restarted.set_timer("set timer for 1 min") # Ids continue after the restored ones
+        assert [t["id"] for t in restarted.get_timers()] == [3, 2]
+        _advance(restarted, (clock, wall), 300)
+        assert recorder.wait_for(3)
+        restarted.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_10k_timers_one_thread_in_order()
+    test_list_cancel_and_names()
+    test_pending_timers_survive_restart()
+    print("SUCCESS: Timer scheduler checks passed.")
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+from src.persistence import PersistenceService
+from src.skills.translator import TranslatorSkill, split_sentences
+
+MEMORY_FILE = "test_translation_memory.json"
+
+class StubProvider:
+    """
+    Stands in for Google: prefixes every line with the target code.
+    """
+    def __init__(self, keep_lines=True):
+        self.lock = threading.Lock()
+        self.queries = []
+        self.keep_lines = keep_lines
+
+    def translate(self, text, target_code, source_code="auto"):
+        with self.lock:
+            self.queries.append(text)
+        lines = [f"[{target_code}] {line}" for line in text.split("\n")]
+        # Some backends flatten line breaks; the skill must cope
+        return "\n".join(lines) if self.keep_lines else " ".join(lines)
+
+def _cleanup():
+    for path in [MEMORY_FILE, MEMORY_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _skill(provider, persistence, **kwargs):
+    return TranslatorSkill(provider=provider, memory_file=MEMORY_FILE, persistence=persistence, **kwargs)
+
+def test_memory_hits_and_persistence():
+    _cleanup()
+    provider = StubProvider()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        skill = _skill(provider, persistence)
+        assert skill.translate("good morning", "chinese") == "Translated to chinese: [zh-CN] good morning"
+        assert skill.translate("  good   morning ", "Chinese Simplified") == "Translated to Chinese Simplified: [zh-CN] good morning"
+        assert skill.translate("good morning", "english") == "Translated to english: [en] good morning" # Other target
+        assert skill.translate("hi", "klingon").startswith("Unsupported language")
+        assert len(provider.queries) == 2
+
+        stats = skill.get_stats()
+        assert stats["hits"] == 1 and stats["misses"] == 2 and stats["requests"] == 2
+        assert stats["calls"] == 3 and stats["max_ms"] >= stats["avg_ms"] > 0
+        print(f"translate: avg {stats['avg_ms']:.2f} ms/call, max {stats['max_ms']:.2f} ms")
+        skill.close()
+
+        with open(MEMORY_FILE) as f:
+            assert [row[0] for row in json.load(f)] == ["zh-CN", "en"]
+        restarted = _skill(provider, persistence)
+        assert restarted.translate("good morning", "english").endswith("[en] good morning")
+        assert len(provider.queries) == 2 # Answered from the persisted memory
+        restarted.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_translate_many_batches_and_evicts():
+    _cleanup()
+    provider = StubProvider()
+    persistence = PersistenceService(debounce=60)
+    try:
+        skill = _skill(provider, persistence, chunk_chars=40, max_entries=6)
+        texts = ["one", "two", "three", "two ", "four", "five"]
+        assert skill.translate_many(texts, "zh-CN") == [f"[zh-CN] {t.strip()}" for t in texts]
+        # Five distinct texts packed into chunks of at most 40 characters
+        assert all(len(q) <= 40 for q in provider.queries)
+        assert len(provider.queries) == 1
+
+        assert skill.translate_many(["one", "six", "five"], "chinese")[1] == "[zh-CN] six"
+        assert len(provider.queries) == 2 and provider.queries[-1] == "six"
+
+        skill.translate_many(["seven"], "zh-CN") # Memory holds 6: the oldest ("two") goes
+        assert ("zh-CN", "two") not in skill.memory and ("zh-CN", "one") in skill.memory
+        assert skill.get_stats()["entries"] == 6
+
+        provider.keep_lines = False
+        assert skill.translate_many(["eight", "nine"], "en") == ["[en] eight", "[en] nine"]
+        assert provider.queries[-3:] == ["eight\nnine", "eight", "nine"] # Fell back per line
+        skill.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+def test_long_text_split_at_sentences():
+    long_text = "The first sentence is here. The second one follows! Is this the third? Yes."
+    pieces = split_sentences(long_text, 30)
+    assert pieces == ["The first sentence is here.", "The second one follows!", "Is this the third?", "Yes."]
+    assert split_sentences("短句。第二句！", 4) == ["短句。", "第二句！"]
+    assert split_sentences("a" * 25, 10) == ["a" * 10, "a" * 10, "a" * 5]
+    assert split_sentences("short", 30) == ["short"]
+
+    _cleanup()
+    provider = StubProvider()
+    persistence = PersistenceService(debounce=60)
+    try:
+        skill = _skill(provider, persistence, chunk_chars=30)
+        result = skill.translate_many([long_text], "en")[0]
+        assert result == " ".join(f"[en] {p}" for p in pieces)
+        assert all(len(q) <= 30 for q in provider.queries)
+        skill.close()
+    finally:
+        persistence.stop()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_memory_hits_and_persistence()
+    test_translate_many_batches_and_evicts()
+    test_long_text_split_at_sentences()
+    print("SUCCESS: Translation memory checks passed.")
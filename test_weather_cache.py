@@ -0,0 +1,164 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from src.net import HttpClient
+from src.persistence import PersistenceService
+from src.skills.weather_skill import WeatherService
+
+GEOCODE_FILE = "test_weather_geocode.json"
+LATENCY = 0.05 # Simulated round trip per request
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class StubOpenMeteo(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1" # Keep-alive, so connection reuse is observable
+    calls = []
+    client_ports = set()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        StubOpenMeteo.calls.append((url.path, query))
+        StubOpenMeteo.client_ports.add(self.client_address[1])
+        time.sleep(LATENCY)
+        if url.path == "/geocode":
+            if query["name"].lower() == "atlantis":
+                body = {"generationtime_ms": 0.1}
+            else:
+                body = {"results": [{"name": query["name"].title(), "country": "Testland",
+                                     "latitude": 35.6895, "longitude": 139.6917}]}
+        else:
+            body = {"current": {"temperature_2m": 21.5, "wind_speed_10m": 7.2, "weather_code": 3},
+                    "current_units": {"temperature_2m": "°C"}}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except BrokenPipeError:
+            pass # Client gave up (timeout test)
+
+    def log_message(self, *args):
+        pass
+
+def _cleanup():
+    for path in [GEOCODE_FILE, GEOCODE_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _serve():
+    StubOpenMeteo.calls = []
+    StubOpenMeteo.client_ports = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubOpenMeteo)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def _service(base, clock, persistence, **kwargs):
+    kwargs.setdefault("client", HttpClient(retries=0))
+    return WeatherService(geocode_file=GEOCODE_FILE, geocode_url=base + "/geocode", forecast_url=base + "/forecast",
+                          persistence=persistence, clock=clock, **kwargs)
+
+def test_cold_and_warm_lookups():
+    _cleanup()
+    server, base = _serve()
+    clock = FakeClock()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        weather = _service(base, clock, persistence, forecast_ttl=600)
+
+        start = time.perf_counter()
+        cold = weather.get_weather("Tokyo")
+        cold_ms = (time.perf_counter() - start) * 1000
+        assert "Weather in Tokyo, Testland" in cold and "21.5°C" in cold and "Cloudy" in cold
+        assert len(StubOpenMeteo.calls) == 2
+
+        start = time.perf_counter()
+        for city in ["Tokyo", "tokyo", "  TOKYO "]:
+            assert weather.get_weather(city) == cold
+        warm_ms = (time.perf_counter() - start) * 1000 / 3
+        assert len(StubOpenMeteo.calls) == 2 # Nothing left the process
+        assert warm_ms < cold_ms / 10, (warm_ms, cold_ms)
+        print(f"weather: cold {cold_ms:.1f} ms, warm {warm_ms:.3f} ms")
+
+        # Forecast expires, geocode does not
+        clock.now = 601
+        weather.get_weather("Tokyo")
+        assert [path for path, _ in StubOpenMeteo.calls] == ["/geocode", "/forecast", "/forecast"]
+        assert len(StubOpenMeteo.client_ports) == 1 # One kept-alive connection for all requests
+        assert weather.client.get_stats()["connections"] == 1
+
+        # Unknown places are remembered for the session
+        assert "couldn't find" in weather.get_weather("Atlantis")
+        assert "couldn't find" in weather.get_weather("atlantis")
+        assert len(StubOpenMeteo.calls) == 4
+
+        stats = weather.get_stats()
+        assert stats["requests"] == 4 and stats["geocode_misses"] == 2 and stats["forecast_hits"] == 3
+        weather.close()
+
+        # Geocodes survive a restart
+        with open(GEOCODE_FILE) as f:
+            assert json.load(f)["tokyo"]["latitude"] == 35.6895
+        restarted = _service(base, clock, persistence, client=weather.client)
+        restarted.get_weather("Tokyo")
+        assert [path for path, _ in StubOpenMeteo.calls[4:]] == ["/forecast"]
+        restarted.close()
+    finally:
+        persistence.stop()
+        server.shutdown()
+        server.server_close()
+        _cleanup()
+
+def test_forecast_lru_and_params():
+    _cleanup()
+    server, base = _serve()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        weather = _service(base, FakeClock(), persistence, max_forecasts=2)
+        for lat in (1.0, 2.0, 3.0):
+            weather.forecast(lat, 0.0)
+        weather.forecast(3.0, 0.0) # Hit
+        weather.forecast(1.0, 0.0) # Evicted, fetched again
+        assert len(StubOpenMeteo.calls) == 4
+        assert weather.get_stats()["forecasts"] == 2
+
+        # City names are URL-encoded rather than pasted into the query string
+        weather.geocode("São Paulo & Co")
+        assert StubOpenMeteo.calls[-1][1]["name"] == "São Paulo & Co"
+        weather.close()
+    finally:
+        persistence.stop()
+        server.shutdown()
+        server.server_close()
+        _cleanup()
+
+def test_timeout_is_reported():
+    _cleanup()
+    server, base = _serve()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        weather = _service(base, FakeClock(), persistence, timeout=0.01)
+        start = time.perf_counter()
+        assert weather.get_weather("Tokyo").startswith("Error checking weather")
+        assert time.perf_counter() - start < LATENCY + 0.5
+        weather.close()
+    finally:
+        persistence.stop()
+        server.shutdown()
+        server.server_close()
+        _cleanup()
+
+if __name__ == "__main__":
+    test_cold_and_warm_lookups()
+    test_forecast_lru_and_params()
+    test_timeout_is_reported()
+    print("SUCCESS: Weather cache checks passed.")
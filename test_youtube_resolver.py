@@ -0,0 +1,151 @@
+import json
+import os
+import threading
+import time
+from src.persistence import PersistenceService
+from src.skills.youtube_resolver import YoutubeResolver
+
+CACHE_FILE = "test_youtube_cache.json"
+LATENCY = 0.1 # Simulated yt-dlp search round trip
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+class StubYoutubeDL:
+    """
+    Stands in for yt_dlp.YoutubeDL; construction and extraction are counted.
+    """
+    lock = threading.Lock()
+    constructions = 0
+    extractions = []
+    active = 0
+    peak = 0
+
+    def __init__(self, opts):
+        assert opts["extract_flat"]
+        with StubYoutubeDL.lock:
+            StubYoutubeDL.constructions += 1
+        time.sleep(0.02) # Building an extractor is not free
+        self.busy = False
+
+    def extract_info(self, target, download=False):
+        assert not self.busy, "extractor shared between threads"
+        self.busy = True
+        with StubYoutubeDL.lock:
+            StubYoutubeDL.extractions.append(target)
+            StubYoutubeDL.active += 1
+            StubYoutubeDL.peak = max(StubYoutubeDL.peak, StubYoutubeDL.active)
+        try:
+            time.sleep(LATENCY)
+            if "nothing" in target:
+                return {"entries": []}
+            if "broken" in target:
+                raise RuntimeError("HTTP Error 429")
+            if target.startswith("http"):
+                return {"id": target[-11:], "title": "Linked video"}
+            name = target.split(":", 1)[1]
+            return {"entries": [{"id": f"id-{name}"[:11], "title": name.title()}]}
+        finally:
+            with StubYoutubeDL.lock:
+                StubYoutubeDL.active -= 1
+            self.busy = False
+
+def _reset():
+    StubYoutubeDL.constructions, StubYoutubeDL.extractions = 0, []
+    StubYoutubeDL.active = StubYoutubeDL.peak = 0
+    for path in [CACHE_FILE, CACHE_FILE + ".tmp"]:
+        if os.path.exists(path): os.remove(path)
+
+def _resolver(persistence, clock=None, **kwargs):
+    return YoutubeResolver(cache_file=CACHE_FILE, persistence=persistence, factory=StubYoutubeDL,
+                           clock=clock or FakeClock(), **kwargs)
+
+def test_extractor_reuse_and_cache():
+    _reset()
+    persistence = PersistenceService(debounce=0.01)
+    clock = FakeClock()
+    try:
+        resolver = _resolver(persistence, clock, ttl=3600)
+        assert resolver.resolve("lofi beats") == ("id-lofi bea", "Lofi Beats")
+        assert resolver.resolve("  LOFI   beats ") == ("id-lofi bea", "Lofi Beats") # Normalized hit
+        for i in range(5):
+            resolver.resolve(f"song {i}")
+        assert StubYoutubeDL.constructions == 1 # Sequential lookups share one extractor
+        assert len(StubYoutubeDL.extractions) == 6
+
+        assert resolver.resolve("https://youtu.be/dQw4w9WgXcQ") == ("dQw4w9WgXcQ", "Linked video")
+        assert resolver.resolve("nothing here") == (None, None)
+        assert resolver.resolve("broken one") == (None, None)
+        assert resolver.resolve("broken one") == (None, None) # Failures are not cached
+        assert len(StubYoutubeDL.extractions) == 10
+
+        clock.now += 3601 # TTL expired
+        resolver.resolve("lofi beats")
+        assert len(StubYoutubeDL.extractions) == 11
+
+        stats = resolver.get_stats()
+        assert stats["constructions"] == 1 and stats["errors"] == 2 and stats["hits"] == 1
+        resolver.close()
+
+        # Persisted in LRU order; a restart answers without extracting
+        with open(CACHE_FILE) as f:
+            assert json.load(f)[-1][0] == "lofi beats"
+        restarted = _resolver(persistence, clock)
+        assert restarted.resolve("song 3") == ("id-song 3", "Song 3")
+        assert len(StubYoutubeDL.extractions) == 11
+        restarted.close()
+    finally:
+        persistence.stop()
+        _reset()
+
+def test_lru_bound():
+    _reset()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        resolver = _resolver(persistence, max_entries=3)
+        for name in ["a", "b", "c"]:
+            resolver.resolve(name)
+        resolver.resolve("a")   # Refresh a
+        resolver.resolve("d")   # Evicts b
+        assert list(resolver.entries) == ["c", "a", "d"]
+        resolver.close()
+    finally:
+        persistence.stop()
+        _reset()
+
+def test_resolve_many_in_parallel():
+    _reset()
+    persistence = PersistenceService(debounce=0.01)
+    try:
+        resolver = _resolver(persistence, pool_size=4)
+        queries = [f"track {i}" for i in range(12)] + ["track 3", "Track 3 "]
+
+        start = time.perf_counter()
+        results = resolver.resolve_many(queries)
+        elapsed = time.perf_counter() - start
+        assert results[:12] == [(f"id-track {i}"[:11], f"Track {i}") for i in range(12)]
+        assert results[12] == results[13] == results[3]
+        assert len(StubYoutubeDL.extractions) == 12 # Duplicates looked up once
+        assert StubYoutubeDL.constructions <= 4 and StubYoutubeDL.peak <= 4
+        # 12 lookups at 100 ms over 4 extractors: ~0.3 s instead of 1.2 s
+        assert elapsed < 0.7, elapsed
+        print(f"resolve_many: 12 queries in {elapsed * 1000:.0f} ms "
+              f"({len(queries) / elapsed:.1f} queries/s, {StubYoutubeDL.constructions} extractors)")
+
+        start = time.perf_counter()
+        assert resolver.resolve_many(queries) == results
+        assert time.perf_counter() - start < 0.05 # All cached
+        resolver.close()
+    finally:
+        persistence.stop()
+        _reset()
+
+if __name__ == "__main__":
+    test_extractor_reuse_and_cache()
+    test_lru_bound()
+    test_resolve_many_in_parallel()
+    print("SUCCESS: YouTube resolver checks passed.")